@@ -3,16 +3,309 @@
 
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
 import os
+from data_loader_en import AnalysisWindow
+from run_instrumentation import profile_stage
+
+CORRELATION_FILENAME = "correlation_learning_patterns.png"
+ROLLING_CORRELATION_FILENAME = "rolling_correlation_trends.png"
+DAYS_ORDER = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+
+# 시간 창 상관관계 기본값 - 변수, 창 길이, 창 이동 간격
+ROLLING_COLUMNS = ['word_count', 'question_depth', 'complexity_ma']
+ROLLING_WINDOW = '7D'
+ROLLING_STEP = '1D'
+
+# 변수 쌍별 충분통계량 이름 (개수, 평균, 편차 제곱합, 편차 곱합)
+MOMENT_NAMES = ['count', 'mean_x', 'mean_y', 'ssx', 'ssy', 'sxy']
+
+
+def grouped_moments(df, columns, by):
+    """그룹별 변수 쌍 충분통계량 계산 (상관관계 계산/병합용)
+
+    그룹 코드 배열에 np.bincount를 적용해 모든 그룹의 (개수, 평균, 편차 제곱합, 편차 곱합)을
+    동시에 구하므로 그룹 수와 관계없이 O(n)이다. 결측치는 DataFrame.corr()처럼 변수 쌍별로 제외한다.
+
+    by: 그룹 기준 컬럼명 또는 df와 길이가 같은 배열 (시간대, 요일, 토픽, 월 등)
+    반환: (그룹 키 리스트, 그룹별 행 수, 통계량 dict) - 통계량은 (그룹, 변수, 변수) 모양 배열
+          count/mean_x/mean_y/ssx/ssy/sxy (mean_x[g, i, j]는 쌍 (i, j)가 모두 있는 행의 i 평균)
+    """
+    group_values = df[by] if isinstance(by, str) else by
+    codes, keys = pd.factorize(group_values, sort=True)
+    n_groups = len(keys)
+    in_group = codes >= 0
+    sizes = np.bincount(codes[in_group], minlength=n_groups)
+
+    values = df[columns].to_numpy(dtype=float)
+    notna = ~np.isnan(values)
+    k = len(columns)
+    moments = {name: np.zeros((n_groups, k, k)) for name in MOMENT_NAMES}
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        for i in range(k):
+            for j in range(i + 1):
+                pair_mask = notna[:, i] & notna[:, j] & in_group
+                g = codes[pair_mask]
+                x = values[pair_mask, i]
+                y = values[pair_mask, j]
+
+                # 1차: 그룹별 개수와 평균
+                count = np.bincount(g, minlength=n_groups)
+                mean_x = np.nan_to_num(np.bincount(g, weights=x, minlength=n_groups) / count)
+                mean_y = np.nan_to_num(np.bincount(g, weights=y, minlength=n_groups) / count)
+
+                # 2차: 그룹 평균 기준 편차 제곱합/곱합 (수치 안정성)
+                dx = x - mean_x[g]
+                dy = y - mean_y[g]
+                pair_stats = {
+                    'count': count,
+                    'mean_x': mean_x,
+                    'mean_y': mean_y,
+                    'ssx': np.bincount(g, weights=dx * dx, minlength=n_groups),
+                    'ssy': np.bincount(g, weights=dy * dy, minlength=n_groups),
+                    'sxy': np.bincount(g, weights=dx * dy, minlength=n_groups),
+                }
+                # (j, i) 칸은 x/y 역할이 바뀐 값으로 채움
+                transposed = {'mean_x': 'mean_y', 'mean_y': 'mean_x', 'ssx': 'ssy', 'ssy': 'ssx'}
+                for name, value in pair_stats.items():
+                    moments[name][:, i, j] = value
+                    moments[transposed.get(name, name)][:, j, i] = value
+
+    return keys.tolist(), sizes, moments
+
+
+def correlations_from_moments(moments):
+    """충분통계량에서 (그룹, 변수, 변수) 상관관계 배열 계산 (분산이 0인 쌍은 NaN)"""
+    with np.errstate(invalid='ignore', divide='ignore'):
+        divisor = np.sqrt(moments['ssx'] * moments['ssy'])
+        corr = np.clip(moments['sxy'] / divisor, -1, 1)
+    corr[divisor == 0] = np.nan
+    return corr
+
+
+def correlations_from_comoments(comoment):
+    """(그룹, 변수, 변수) 편차 곱합 배열에서 상관관계 배열 계산 (분산이 0인 변수의 쌍과 대각선은 NaN, 나머지 대각선은 1)"""
+    variance = np.diagonal(comoment, axis1=1, axis2=2)
+    corr = correlations_from_moments({'ssx': np.broadcast_to(variance[:, :, None], comoment.shape),
+                                      'ssy': np.broadcast_to(variance[:, None, :], comoment.shape),
+                                      'sxy': comoment})
+    idx = np.arange(comoment.shape[1])
+    corr[:, idx, idx] = np.where(variance > 0, 1.0, np.nan)
+    return corr
+
+
+def merge_cell_moments(codes, n_groups, rows, means, within):
+    """칸별 (행 수, 평균, 칸 평균 기준 편차 곱합)을 그룹별로 합침 - 병렬 분산 공식을 여러 칸에 한 번에 적용
+
+    그룹 편차 곱합 = 칸 안 편차 곱합의 합 + 행 수 × (칸 평균 - 그룹 평균) 곱의 합이라서
+    원시 합(ss - s·s/n)과 달리 값이 커도 상쇄 오차가 없다. 행이 없는 칸은 평균이 무엇이든 기여하지 않는다.
+    codes: (칸,) 그룹 번호, rows: (칸,), means: (칸, 변수), within: (칸, 변수, 변수)
+    반환: (그룹별 행 수, (그룹, 변수, 변수) 편차 곱합)
+    """
+    k = means.shape[1]
+    means = np.where(rows[:, None] > 0, means, 0.0)
+
+    def group_sum(weights):
+        return np.bincount(codes, weights=weights, minlength=n_groups)
+
+    n = group_sum(rows)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        group_means = np.stack([group_sum(rows * means[:, i]) for i in range(k)], axis=1) / n[:, None]
+    offsets = np.nan_to_num(means - group_means[codes])
+    comoment = np.empty((n_groups, k, k))
+    for i in range(k):
+        for j in range(i + 1):
+            comoment[:, i, j] = comoment[:, j, i] = group_sum(within[:, i, j] + rows * offsets[:, i] * offsets[:, j])
+    return n, comoment
+
+
+def correlations_from_sums(n, s, ss):
+    """원시 합(행 수 n, 변수 합 s, 변수 곱합 ss)에서 (그룹, 변수, 변수) 상관관계 배열 계산
+
+    n: (그룹,), s: (그룹, 변수), ss: (그룹, 변수, 변수). 분산이 0인 변수의 쌍과 대각선은 NaN, 나머지 대각선은 1.
+    """
+    with np.errstate(invalid='ignore', divide='ignore'):
+        # 편차 제곱합/곱합 = 원시 곱합 - 합 × 합 / n
+        centered = ss - s[:, :, None] * s[:, None, :] / n[:, None, None]
+        variance = np.clip(np.diagonal(centered, axis1=1, axis2=2), 0, None)
+        divisor = np.sqrt(variance[:, :, None] * variance[:, None, :])
+        corr = np.clip(centered / divisor, -1, 1)
+    corr[divisor == 0] = np.nan
+    idx = np.arange(s.shape[1])
+    corr[:, idx, idx] = np.where(variance > 0, 1.0, np.nan)
+    return corr
+
+
+def _rank_columns(values):
+    """열마다 평균 순위 (동점은 같은 순위의 평균, Series.rank()와 같은 값)"""
+    n, k = values.shape
+    ranks = np.empty((n, k))
+    for j in range(k):
+        order = np.argsort(values[:, j], kind='stable')
+        sorted_values = values[order, j]
+        # 동점 구간마다 (첫 순위 + 마지막 순위) / 2
+        starts = np.flatnonzero(np.r_[True, sorted_values[1:] != sorted_values[:-1]])
+        ends = np.r_[starts[1:], n]
+        ranks[order, j] = np.repeat((starts + ends + 1) / 2, ends - starts)
+    return ranks
+
+
+def rolling_correlations(df, columns, window=ROLLING_WINDOW, step=ROLLING_STEP, min_rows=11, method='pearson',
+                         time_column='timestamp'):
+    """시간 창별 상관관계 행렬 - step 간격 창 끝마다 [끝 - window, 끝) 구간의 행으로 계산
+
+    columns가 모두 있는 행을 시간순으로 정렬한 뒤 창 경계를 searchsorted로 찾는다.
+    - pearson: 창 경계(창 시작과 끝)로 나뉜 구간마다 구간 평균 기준 편차 곱합을 두 단계로 한 번에 구하고,
+      창마다 그 창을 이루는 구간들을 merge_cell_moments로 합친다. 행은 한 번만 훑으므로
+      O(n + 창 수 × (window / step) × 변수²)이고, 누적합의 원시 합과 달리 계열 길이나 값 크기에 따른 오차가 없다.
+    - spearman: 창 안의 평균 순위로 편차 곱합을 구해 같은 방식으로 상관계수를 계산 (두꺼운 꼬리 분포인
+      word_count의 극단값 영향을 받지 않음). 순위는 창마다 달라서 min_rows 이상인 창마다 다시 정렬해 매기므로
+      O(n)이 아니라 O(창 수 × 창 행 수 × log 창 행 수 × 변수) - 창이 step보다 길수록 같은 행을 여러 번 정렬한다.
+      (전체 순위를 한 번 매겨 구간 경로를 쓰면 O(n)이지만 창 안 순위와 달라 스피어만 값이 아니게 됨)
+    행 수가 min_rows 미만인 창은 NaN.
+    창 끝은 첫 행이 속한 step 구간의 끝부터 마지막 행이 속한 step 구간의 끝까지 (끝 시각 자체는 창에 포함되지 않음).
+    반환: (창 끝 DatetimeIndex, 창별 행 수 배열, (창, 변수, 변수) 상관관계 배열)
+    """
+    if method not in ('pearson', 'spearman'):
+        raise ValueError(f"Unknown correlation method: {method} (choose from pearson, spearman)")
+    window, step = pd.Timedelta(window), pd.Timedelta(step)
+
+    frame = df[[time_column] + columns].dropna().sort_values(time_column, kind='stable')
+    times = frame[time_column].to_numpy(dtype='datetime64[ns]')
+    values = frame[columns].to_numpy(dtype=float)
+    k = len(columns)
+    if len(times) == 0:
+        return pd.DatetimeIndex([]), np.zeros(0, dtype=np.int64), np.zeros((0, k, k))
+
+    window_ends = pd.date_range(pd.Timestamp(times[0]).floor(step), pd.Timestamp(times[-1]).floor(step), freq=step) + step
+    ends = window_ends.to_numpy(dtype='datetime64[ns]')
+    lo = np.searchsorted(times, ends - np.timedelta64(window), side='left')
+    hi = np.searchsorted(times, ends, side='left')
+    n = (hi - lo).astype(float)
+
+    if method == 'pearson':
+        # 모든 창 시작/끝 시각으로 시간축을 구간으로 나누면 각 창은 연속한 구간들의 합집합
+        starts = ends - np.timedelta64(window)
+        boundaries = np.unique(np.concatenate([starts, ends]))
+        segment = np.searchsorted(boundaries, times, side='right') - 1
+        inside = (segment >= 0) & (segment < len(boundaries) - 1)
+        segment, segment_values = segment[inside], values[inside]
+        n_segments = len(boundaries) - 1
+
+        # 구간별 행 수/평균 (1차), 구간 평균 기준 편차 곱합 (2차)
+        segment_rows = np.bincount(segment, minlength=n_segments).astype(float)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            segment_means = np.stack([np.bincount(segment, weights=segment_values[:, i], minlength=n_segments)
+                                      for i in range(k)], axis=1) / segment_rows[:, None]
+        deviations = segment_values - segment_means[segment]
+        within = np.empty((n_segments, k, k))
+        for i in range(k):
+            for j in range(i + 1):
+                within[:, i, j] = within[:, j, i] = np.bincount(segment, weights=deviations[:, i] * deviations[:, j],
+                                                                minlength=n_segments)
+
+        # (창, 구간) 쌍 - 창 w는 구간 first[w] .. last[w] - 1
+        first = np.searchsorted(boundaries, starts)
+        last = np.searchsorted(boundaries, ends)
+        spans = last - first
+        window_ids = np.repeat(np.arange(len(ends)), spans)
+        segment_ids = np.arange(spans.sum()) - np.repeat(np.cumsum(spans) - spans, spans) + np.repeat(first, spans)
+        _, comoment = merge_cell_moments(window_ids, len(ends), segment_rows[segment_ids],
+                                         segment_means[segment_ids], within[segment_ids])
+    else:
+        comoment = np.zeros((len(ends), k, k))
+        for w in np.flatnonzero(n >= min_rows):
+            ranks = _rank_columns(values[lo[w]:hi[w]])
+            ranks -= ranks.mean(axis=0)
+            comoment[w] = ranks.T @ ranks
+
+    corr = correlations_from_comoments(comoment)
+    corr[n < min_rows] = np.nan
+    return window_ends.rename('window_end'), (hi - lo), corr
+
+
+def grouped_correlations(df, columns, by, min_rows=11):
+    """그룹별 피어슨 상관관계 행렬을 충분통계량으로 한 번에 계산
+
+    행 수가 min_rows 미만인 그룹은 결과에서 뺀다.
+    반환: {그룹 키: 상관관계 행렬 DataFrame} (그룹 키 오름차순)
+    """
+    keys, sizes, moments = grouped_moments(df, columns, by)
+    corr = correlations_from_moments(moments)
+    return {
+        key: pd.DataFrame(corr[g], index=columns, columns=columns)
+        for g, key in enumerate(keys)
+        if sizes[g] >= min_rows
+    }
+
+
+def correlation_insights(corr_matrix, significance=None, alpha=0.05):
+    """상관관계 행렬에서 가장 강한 변수 쌍과 변수별 평균 상관관계(절대값) 추출
+
+    significance(calculate_significance() 결과)를 주면 가장 강한 쌍에 부트스트랩 신뢰구간/순열검정 p값과
+    유의 여부(p < alpha)를 붙이고, 시간대/요일별 표현 길이 ↔ 질문 깊이 상관 중 유의한 그룹을 함께 반환한다.
+    """
+    insights = {}
+
+    # 전체 상관관계 분석
+    if not corr_matrix.empty:
+        # 가장 강한 상관관계 찾기 (대각선은 0으로 - 원본 행렬은 수정하지 않도록 복사본 사용)
+        abs_values = corr_matrix.abs().to_numpy(copy=True)
+        np.fill_diagonal(abs_values, 0)
+        abs_corr = pd.DataFrame(abs_values, index=corr_matrix.index, columns=corr_matrix.columns)
+
+        max_corr_idx = abs_corr.stack().idxmax()
+        max_corr_value = abs_corr.stack().max()
+
+        insights['strongest_correlation'] = {
+            'variables': max_corr_idx,
+            'correlation': max_corr_value,
+            'strength': 'Strong' if max_corr_value >= 0.7 else ('Moderate' if max_corr_value >= 0.3 else 'Weak')
+        }
+
+        # 변수별 평균 상관관계
+        insights['average_correlations'] = {}
+        for col in corr_matrix.columns:
+            avg_corr = corr_matrix[col].drop(col).abs().mean()
+            insights['average_correlations'][col] = avg_corr
+
+        if significance is not None and 'overall' in significance:
+            x, y = max_corr_idx
+            overall = significance['overall']
+            p_value = overall['p_value'].loc[x, y]
+            insights['strongest_correlation'].update({
+                'ci_low': overall['ci_low'].loc[x, y],
+                'ci_high': overall['ci_high'].loc[x, y],
+                'p_value': p_value,
+                'significant': bool(p_value < alpha),
+            })
+
+    # 작은 그룹(시간대/요일)의 상관은 우연일 수 있으므로 유의한 그룹만 패턴으로 보고
+    if significance is not None:
+        insights['significant_patterns'] = {
+            name: [key for key in (DAYS_ORDER if name == 'day' else sorted(significance[name]))
+                   if key in significance[name]
+                   and significance[name][key]['p_value'].loc['word_count', 'question_depth'] < alpha]
+            for name in ['hourly', 'day']
+            if name in significance
+        }
+
+    return insights
+
 
 class AdvancedCorrelationAnalyzer:
     """상관관계 기반 고급 분석 모듈"""
 
-    def __init__(self, data_path):
+    def __init__(self, data_path, window=None):
         self.data_path = data_path
         self.df = None
+        self.window = window if window is not None else AnalysisWindow()  # 분석 조건
+        self.profiler = None  # RunProfiler (있으면 상관관계 계산 단계 계측)
+        self.sample = None  # StratifiedSample (있으면 미리보기 - 상관계수별 신뢰구간 계산)
+        self.cube = None  # AggregationCube (있으면 메시지 대신 큐브 롤업으로 상관관계 계산)
+        # 부트스트랩/순열검정 반복 수 (None이면 유의성 계산 안 함)와 그룹별 계산 프로세스 수
+        self.significance_replicates = None
+        self.significance_workers = 1
         self.portfolio_dir = "."
         os.makedirs(self.portfolio_dir, exist_ok=True)
 
@@ -20,9 +313,9 @@ class AdvancedCorrelationAnalyzer:
         """데이터 로드"""
         try:
             from data_loader_en import DataLoader
-            loader = DataLoader(self.data_path)
+            loader = DataLoader(self.data_path, window=self.window)
             if loader.load_data():
-                self.df = loader.data.copy()
+                self.df = loader.data  # 로더의 프레임을 그대로 공유 (분석 중 수정하지 않음)
                 print("✅ 데이터 로드 성공")
                 return True
             else:
@@ -47,16 +340,10 @@ class AdvancedCorrelationAnalyzer:
             print("❌ 상관관계 분석에 충분한 수치 데이터가 없습니다.")
             return None
 
-        # 상관관계 행렬 계산
-        correlation_matrix = self.df[available_cols].corr()
-
-        # 시간대별 상관관계 분석
-        hourly_correlations = {}
-        for hour in range(24):
-            hour_data = self.df[self.df['hour'] == hour]
-            if len(hour_data) > 10:  # 충분한 데이터가 있는 경우만
-                if len(available_cols) >= 2:
-                    hourly_correlations[hour] = hour_data[available_cols].corr()
+        with profile_stage(self.profiler, 'correlation_matrix', rows_in=len(self.df)):
+            # 상관관계 행렬과 시간대별 상관관계 (충분한 데이터가 있는 시간대만, 한 번의 그룹 집계로 계산)
+            correlation_matrix = self._cube_correlations(available_cols)
+            hourly_correlations = self._cube_correlations(available_cols, by='hour')
 
         print("✅ 상관관계 분석 완료")
         return {
@@ -64,170 +351,367 @@ class AdvancedCorrelationAnalyzer:
             'hourly': hourly_correlations
         }
 
-    def create_correlation_dashboard(self):
-        """상관관계 기반 개인화 학습 패턴 분석 대시보드 생성"""
+    def _cube_correlations(self, columns, by=None):
+        """집계 큐브로 상관관계 계산 (큐브가 없거나, 미리보기거나, 결측 등으로 큐브가 None을 주면 행 단위로 계산)"""
+        if self.cube is not None and self.sample is None:
+            result = self.cube.correlations(columns, by=by)
+            if result is not None:
+                return result
+        if by is None:
+            return self.df[columns].corr()
+        return grouped_correlations(self.df, columns, by)
+
+    def compute_correlation_dashboard_data(self):
+        """상관관계 대시보드 4개 차트에 필요한 집계값 계산 (렌더링과 분리)"""
         correlations = self.calculate_correlations()
         if correlations is None:
-            return False
-
-        # Figure 1: 학습 패턴 상관관계 분석
-        fig1, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(16, 12))
-        fig1.suptitle("Learning Pattern Correlation Deep Analysis (April-August 2025)", fontsize=16, fontweight="bold")
+            return None
 
-        # 1. 학습 변수 간 상관관계 히트맵
-        corr_matrix = correlations['overall']
-        if not corr_matrix.empty:
-            # Column name mapping for better readability
-            display_names = {
-                'complexity_ma': 'Learning Complexity',
-                'word_count': 'Expression Length',
-                'question_depth': 'Question Depth',
-                'hour': 'Hour'
-            }
-            display_matrix = corr_matrix.rename(columns=display_names, index=display_names)
-
-            sns.heatmap(display_matrix, annot=True, cmap='RdYlBu_r', center=0,
-                       square=True, ax=ax1, cbar_kws={'shrink': 0.8})
-            ax1.set_title("Learning Variables Correlation Matrix", fontweight="bold", fontsize=12)
-
-        # 2. 시간대별 학습 패턴 상관관계 변화
-        if correlations['hourly']:
-            hours = []
-            complexity_word_corr = []
-            complexity_question_corr = []
-
-            for hour, corr_df in correlations['hourly'].items():
-                if 'word_count' in corr_df.columns and 'question_depth' in corr_df.columns:
-                    corr_value = corr_df.loc['word_count', 'question_depth']
-                    if not pd.isna(corr_value):
-                        hours.append(hour)
-                        complexity_word_corr.append(corr_value)
-                        complexity_question_corr.append(corr_value)
-
-            if hours and complexity_word_corr:
-                ax2.plot(hours, complexity_word_corr, 'o-', linewidth=3, markersize=8,
-                        color="#2E86AB", markerfacecolor='white', markeredgewidth=2,
-                        label='Expression ↔ Question Depth')
-
-                ax2.axhline(y=0, color='black', linestyle='--', linewidth=2, alpha=0.5)
-                ax2.fill_between(hours, complexity_word_corr, 0,
-                               where=(np.array(complexity_word_corr) >= 0),
-                               color="#2E86AB", alpha=0.2)
-                ax2.fill_between(hours, complexity_word_corr, 0,
-                               where=(np.array(complexity_word_corr) < 0),
-                               color="#F24236", alpha=0.2)
-
-                ax2.set_title("Hourly Learning Pattern Correlation Changes", fontweight="bold", fontsize=12)
-                ax2.set_xlabel("Hour")
-                ax2.set_ylabel("Correlation Coefficient")
-                ax2.set_xticks(range(0, 24, 2))
-                ax2.legend()
-                ax2.grid(True, alpha=0.3)
+        # 2. 시간대별 표현 길이 ↔ 질문 깊이 상관관계
+        hours = []
+        hourly_values = []
+        for hour, corr_df in correlations['hourly'].items():
+            if 'word_count' in corr_df.columns and 'question_depth' in corr_df.columns:
+                corr_value = corr_df.loc['word_count', 'question_depth']
+                if not pd.isna(corr_value):
+                    hours.append(hour)
+                    hourly_values.append(corr_value)
 
         # 3. 요일별 학습 스타일 상관관계
+        day_correlations = {}
         if 'day_of_week' in self.df.columns:
-            day_correlations = {}
-            days_order = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
-
-            for day in days_order:
-                day_data = self.df[self.df['day_of_week'] == day]
-                if len(day_data) > 10:
-                    available_cols = [col for col in ['word_count', 'question_depth']
-                                    if col in day_data.columns]
-                    if len(available_cols) >= 2:
-                        day_corr = day_data[available_cols].corr()
-                        if 'word_count' in day_corr.columns and 'question_depth' in day_corr.columns:
-                            day_correlations[day] = day_corr.loc['word_count', 'question_depth']
-
-            if day_correlations:
-                days = list(day_correlations.keys())
-                day_corr_values = list(day_correlations.values())
-
-                colors = ['#FF6B6B' if v >= 0.3 else '#FFD93D' if v >= 0 else '#6BCF7F' if v >= -0.3 else '#4ECDC4' for v in day_corr_values]
-                bars = ax3.bar(range(len(days)), day_corr_values, color=colors, alpha=0.8, edgecolor='black')
-
-                ax3.axhline(y=0.3, color='red', linestyle='--', linewidth=2, alpha=0.7, label='Strong Positive Correlation')
-                ax3.axhline(y=-0.3, color='blue', linestyle='--', linewidth=2, alpha=0.7, label='Strong Negative Correlation')
-                ax3.axhline(y=0, color='black', linestyle='-', linewidth=1, alpha=0.5, label='No Correlation')
-
-                ax3.set_title("Daily Learning Style Correlation", fontweight="bold", fontsize=12)
-                ax3.set_xlabel("Day of Week")
-                ax3.set_ylabel("Correlation Coefficient")
-                ax3.set_xticks(range(len(days)))
-                ax3.set_xticklabels([day[:3] for day in days], rotation=45, ha='right')
-                ax3.legend()
-                ax3.grid(True, alpha=0.3)
-
-                # 각 바 위에 값 표시
-                for i, v in enumerate(day_corr_values):
-                    ax3.text(i, v + 0.02 if v >= 0 else v - 0.08, f'{v:.2f}', ha='center',
-                           va='bottom' if v >= 0 else 'top', fontweight='bold')
-
-        # 4. 상관관계 강도 및 의미 분석
+            available_cols = [col for col in ['word_count', 'question_depth'] if col in self.df.columns]
+            if len(available_cols) >= 2:
+                day_corr = self._cube_correlations(available_cols, by='day_of_week')
+                for day in DAYS_ORDER:
+                    if day in day_corr:
+                        day_correlations[day] = day_corr[day].loc['word_count', 'question_depth']
+
+        # 4. 상관관계 강도별 분포 (자기상관 제외한 절대값 기준)
+        strength_counts = None
         corr_matrix = correlations['overall']
         if not corr_matrix.empty:
-            # 상관관계 계수의 절대값 분포
             abs_corr_values = corr_matrix.abs().values
             abs_corr_values = abs_corr_values[abs_corr_values != 1.0]  # 자기상관 제외
-
             if len(abs_corr_values) > 0:
-                # 상관관계 강도별 분포
                 weak_corr = len(abs_corr_values[(abs_corr_values >= 0) & (abs_corr_values < 0.3)])
                 moderate_corr = len(abs_corr_values[(abs_corr_values >= 0.3) & (abs_corr_values < 0.7)])
                 strong_corr = len(abs_corr_values[abs_corr_values >= 0.7])
+                strength_counts = [weak_corr, moderate_corr, strong_corr]
+
+        data = {
+            'overall': corr_matrix,
+            'hours': hours,
+            'hourly_values': hourly_values,
+            'day_correlations': day_correlations,
+            'strength_counts': strength_counts,
+            'period_label': self.window.label(),
+        }
+        if self.sample is not None:
+            data['intervals'] = self._correlation_intervals(corr_matrix, hours, hourly_values, day_correlations)
+            data['preview'] = self.sample.describe()
+        elif self.significance_replicates:
+            significance = self.calculate_significance(list(corr_matrix.columns))
+            data['significance'] = significance
+            data['intervals'] = self._significance_intervals(significance, hours, day_correlations)
+        return data
+
+    def calculate_significance(self, columns=None, replicates=None, workers=None, seed=0):
+        """전체/시간대별/요일별 상관관계 행렬의 부트스트랩 신뢰구간과 순열검정 p값
+
+        반환: {'overall': 표, 'hourly': {시간: 표}, 'day': {요일: 표}} - 표는 matrix_significance() 결과
+        (estimate/ci_low/ci_high/p_value 행렬과 rows). 그룹은 프로세스 풀에서 동시에 계산할 수 있다.
+        """
+        from correlation_significance import correlation_significance
+        if columns is None:
+            columns = [col for col in ['complexity_ma', 'word_count', 'question_depth', 'hour'] if col in self.df.columns]
+        replicates = replicates or self.significance_replicates or 1000
+        workers = workers if workers is not None else self.significance_workers
+        options = {'n_boot': replicates, 'n_perm': replicates, 'seed': seed}
+
+        with profile_stage(self.profiler, 'correlation_significance', rows_in=len(self.df)):
+            significance = {'overall': correlation_significance(self.df, columns, **options)}
+            for name, by in [('hourly', 'hour'), ('day', 'day_of_week')]:
+                pair = [col for col in ['word_count', 'question_depth'] if col in self.df.columns]
+                if by in self.df.columns and len(pair) == 2:
+                    # 시간대 행렬은 전체와 같은 변수, 요일 행렬은 요일 차트와 같은 두 변수
+                    group_columns = [col for col in columns if col != by] if name == 'hourly' else pair
+                    significance[name] = correlation_significance(self.df, group_columns, by=by,
+                                                                  workers=workers, **options)
+        print("✅ 상관관계 유의성 검정 완료")
+        return significance
+
+    @staticmethod
+    def _significance_intervals(significance, hours, day_correlations):
+        """시간대/요일 차트용 부트스트랩 신뢰구간 표 (미리보기 intervals와 같은 형태)"""
+        intervals = {}
+        for name, keys, by in [('hourly', hours, 'hour'), ('day', list(day_correlations), 'day_of_week')]:
+            results = significance.get(name, {})
+            rows = []
+            for key in keys:
+                result = results.get(key)
+                if result is None:
+                    rows.append([np.nan] * 4 + [0])
+                    continue
+                rows.append([result[table].loc['word_count', 'question_depth']
+                             for table in ['estimate', 'ci_low', 'ci_high', 'p_value']] + [result['rows']])
+            intervals[name] = pd.DataFrame(rows, columns=['estimate', 'ci_low', 'ci_high', 'p_value', 'sample_rows'],
+                                           index=pd.Index(keys, name=by))
+        return intervals
+
+    def _correlation_intervals(self, corr_matrix, hours, hourly_values, day_correlations):
+        """미리보기 표본 상관계수의 Fisher z 신뢰구간 (쌍별로 값이 모두 있는 표본 행 수 기준)
+
+        층화 표본은 층마다 거의 같은 비율로 뽑으므로 상관계수는 표본에서 그대로 계산하고,
+        구간은 단순 무작위 표본 근사로 구한다.
+        """
+        from preview_sampling import correlation_interval
+        confidence = self.sample.confidence
+
+        notna = self.df[list(corr_matrix.columns)].notna().to_numpy(dtype=float)
+        overall_low, overall_high = correlation_interval(corr_matrix.to_numpy(), notna.T @ notna, confidence)
+        intervals = {
+            'overall_low': pd.DataFrame(overall_low, index=corr_matrix.index, columns=corr_matrix.columns),
+            'overall_high': pd.DataFrame(overall_high, index=corr_matrix.index, columns=corr_matrix.columns),
+        }
+
+        # 시간대/요일별 표현 길이 ↔ 질문 깊이 상관계수
+        if 'word_count' in self.df.columns and 'question_depth' in self.df.columns:
+            pair_rows = self.df[['word_count', 'question_depth']].notna().all(axis=1)
+            groups = [('hourly', 'hour', dict(zip(hours, hourly_values))), ('day', 'day_of_week', day_correlations)]
+            for name, by, values in groups:
+                if by not in self.df.columns:
+                    continue
+                keys = list(values.keys())
+                r = np.array(list(values.values()), dtype=float)
+                counts = pair_rows.groupby(self.df[by], observed=True).sum().reindex(keys).fillna(0).to_numpy()
+                low, high = correlation_interval(r, counts, confidence)
+                intervals[name] = pd.DataFrame({'estimate': r, 'ci_low': low, 'ci_high': high,
+                                                'sample_rows': counts.astype(int)}, index=pd.Index(keys, name=by))
+        return intervals
 
-                categories = ['Weak Correlation\n(0-0.3)', 'Moderate Correlation\n(0.3-0.7)', 'Strong Correlation\n(0.7+)']
-                counts = [weak_corr, moderate_corr, strong_corr]
-                colors = ['#90EE90', '#FFD700', '#FF6347']
+    def create_correlation_dashboard(self):
+        """상관관계 기반 개인화 학습 패턴 분석 대시보드 생성"""
+        data = self.compute_correlation_dashboard_data()
+        if data is None:
+            return False
 
-                bars = ax4.bar(categories, counts, color=colors, alpha=0.8, edgecolor='black')
-                ax4.set_title("Correlation Strength Distribution & Learning Pattern Analysis", fontweight="bold", fontsize=12)
-                ax4.set_ylabel("Number of Correlation Pairs")
-                ax4.grid(True, alpha=0.3)
+        chart_path = os.path.join(self.portfolio_dir, CORRELATION_FILENAME)
+        render_correlation_dashboard(data, chart_path)
 
-                # 각 바 위에 값 표시
-                for i, v in enumerate(counts):
-                    ax4.text(i, v + max(counts) * 0.02, str(v), ha='center', va='bottom', fontweight='bold')
+        print("✅ 개인화된 상관관계 분석 대시보드 생성 완료")
+        print(f"   📊 저장 위치: {chart_path}")
 
+        return True
 
-        plt.tight_layout()
-        plt.savefig(os.path.join(self.portfolio_dir, "correlation_learning_patterns.png"), dpi=300, bbox_inches='tight')
-        plt.close()
+    def calculate_rolling_correlations(self, window=ROLLING_WINDOW, step=ROLLING_STEP, columns=None, min_rows=11):
+        """시간 창(window 길이, step 간격)별 피어슨/스피어만 상관관계
 
+        반환: {'pearson', 'spearman': 창 끝(window_end, 미포함) × 변수 쌍('a ↔ b') DataFrame, 'rows': 창별 행 수 Series}
+        """
+        if self.df is None or 'timestamp' not in self.df.columns:
+            return None
+        if columns is None:
+            columns = [col for col in ROLLING_COLUMNS if col in self.df.columns]
+        if len(columns) < 2:
+            print("❌ 상관관계 분석에 충분한 수치 데이터가 없습니다.")
+            return None
 
-        print("✅ 개인화된 상관관계 분석 대시보드 생성 완료")
-        print(f"   📊 저장 위치: {os.path.join(self.portfolio_dir, 'correlation_learning_patterns.png')}")
+        pairs = [(i, j) for i in range(len(columns)) for j in range(i + 1, len(columns))]
+        pair_names = [f"{columns[i]} ↔ {columns[j]}" for i, j in pairs]
+        result = {}
+        with profile_stage(self.profiler, 'rolling_correlation', rows_in=len(self.df)):
+            for method in ['pearson', 'spearman']:
+                window_ends, rows, corr = rolling_correlations(self.df, columns, window=window, step=step,
+                                                          min_rows=min_rows, method=method)
+                result[method] = pd.DataFrame({name: corr[:, i, j] for name, (i, j) in zip(pair_names, pairs)},
+                                              index=window_ends)
+            result['rows'] = pd.Series(rows, index=window_ends, name='rows')
+
+        print("✅ 시간 창 상관관계 분석 완료")
+        return result
+
+    def compute_rolling_correlation_data(self, window=ROLLING_WINDOW, step=ROLLING_STEP):
+        """시간 창 상관관계 추이 차트에 필요한 집계값 계산 (렌더링과 분리)"""
+        rolling = self.calculate_rolling_correlations(window=window, step=step)
+        if rolling is None:
+            return None
+        return {**rolling, 'window': window, 'step': step, 'period_label': self.window.label()}
+
+    def create_rolling_correlation_chart(self, window=ROLLING_WINDOW, step=ROLLING_STEP):
+        """시간 창 피어슨/스피어만 상관관계 추이 차트 생성"""
+        data = self.compute_rolling_correlation_data(window=window, step=step)
+        if data is None:
+            return False
+
+        chart_path = os.path.join(self.portfolio_dir, ROLLING_CORRELATION_FILENAME)
+        render_rolling_correlation_chart(data, chart_path)
 
+        print("✅ 시간 창 상관관계 추이 차트 생성 완료")
+        print(f"   📊 저장 위치: {chart_path}")
         return True
 
-    def get_correlation_insights(self):
-        """상관관계 기반 인사이트 추출"""
+    def get_correlation_insights(self, significance=False):
+        """상관관계 기반 인사이트 추출 (significance=True면 신뢰구간/p값과 유의한 패턴 포함)"""
         correlations = self.calculate_correlations()
         if correlations is None:
             return {}
 
-        insights = {}
-
-        # 전체 상관관계 분석
-        corr_matrix = correlations['overall']
-        if not corr_matrix.empty:
-            # 가장 강한 상관관계 찾기
-            abs_corr = corr_matrix.abs()
-            np.fill_diagonal(abs_corr.values, 0)  # 대각선 0으로 설정
-
-            max_corr_idx = abs_corr.stack().idxmax()
-            max_corr_value = abs_corr.stack().max()
-
-            insights['strongest_correlation'] = {
-                'variables': max_corr_idx,
-                'correlation': max_corr_value,
-                'strength': 'Strong' if max_corr_value >= 0.7 else ('Moderate' if max_corr_value >= 0.3 else 'Weak')
-            }
-
-            # 변수별 평균 상관관계
-            insights['average_correlations'] = {}
-            for col in corr_matrix.columns:
-                avg_corr = corr_matrix[col].drop(col).abs().mean()
-                insights['average_correlations'][col] = avg_corr
-
-        return insights
+        tests = self.calculate_significance(list(correlations['overall'].columns)) if significance else None
+        return correlation_insights(correlations['overall'], tests)
+
+
+def render_correlation_dashboard(data, chart_path):
+    """compute_correlation_dashboard_data() 결과로 상관관계 대시보드 PNG 저장 (프로세스 풀에서도 호출 가능)"""
+    # 플로팅 라이브러리는 차트를 실제로 그릴 때만 import
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    # 미리보기 결과면 제목에 근사 표시를 붙이고 상관계수에 신뢰구간을 함께 그림
+    intervals = data.get('intervals')
+
+    # Figure 1: 학습 패턴 상관관계 분석
+    fig1, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(16, 12))
+    title = f"Learning Pattern Correlation Deep Analysis ({data['period_label']})"
+    if 'preview' in data:
+        from preview_sampling import preview_caption
+        title += "\n" + preview_caption(data['preview'])
+    fig1.suptitle(title, fontsize=16, fontweight="bold")
+
+    # 1. 학습 변수 간 상관관계 히트맵
+    corr_matrix = data['overall']
+    if not corr_matrix.empty:
+        # Column name mapping for better readability
+        display_names = {
+            'complexity_ma': 'Learning Complexity',
+            'word_count': 'Expression Length',
+            'question_depth': 'Question Depth',
+            'hour': 'Hour'
+        }
+        display_matrix = corr_matrix.rename(columns=display_names, index=display_names)
+
+        sns.heatmap(display_matrix, annot=True, cmap='RdYlBu_r', center=0,
+                   square=True, ax=ax1, cbar_kws={'shrink': 0.8})
+        ax1.set_title("Learning Variables Correlation Matrix", fontweight="bold", fontsize=12)
+
+    # 2. 시간대별 학습 패턴 상관관계 변화
+    hours = data['hours']
+    complexity_word_corr = data['hourly_values']
+    if hours and complexity_word_corr:
+        ax2.plot(hours, complexity_word_corr, 'o-', linewidth=3, markersize=8,
+                color="#2E86AB", markerfacecolor='white', markeredgewidth=2,
+                label='Expression ↔ Question Depth')
+        if intervals is not None and 'hourly' in intervals:
+            ax2.fill_between(hours, intervals['hourly']['ci_low'], intervals['hourly']['ci_high'],
+                             color="#2E86AB", alpha=0.15, label='Confidence Interval')
+
+        ax2.axhline(y=0, color='black', linestyle='--', linewidth=2, alpha=0.5)
+        ax2.fill_between(hours, complexity_word_corr, 0,
+                       where=(np.array(complexity_word_corr) >= 0),
+                       color="#2E86AB", alpha=0.2)
+        ax2.fill_between(hours, complexity_word_corr, 0,
+                       where=(np.array(complexity_word_corr) < 0),
+                       color="#F24236", alpha=0.2)
+
+        ax2.set_title("Hourly Learning Pattern Correlation Changes", fontweight="bold", fontsize=12)
+        ax2.set_xlabel("Hour")
+        ax2.set_ylabel("Correlation Coefficient")
+        ax2.set_xticks(range(0, 24, 2))
+        ax2.legend()
+        ax2.grid(True, alpha=0.3)
+
+    # 3. 요일별 학습 스타일 상관관계
+    day_correlations = data['day_correlations']
+    if day_correlations:
+        days = list(day_correlations.keys())
+        day_corr_values = list(day_correlations.values())
+
+        colors = ['#FF6B6B' if v >= 0.3 else '#FFD93D' if v >= 0 else '#6BCF7F' if v >= -0.3 else '#4ECDC4' for v in day_corr_values]
+        day_err = None
+        if intervals is not None and 'day' in intervals:
+            day_ci = intervals['day']
+            day_err = [(day_ci['estimate'] - day_ci['ci_low']).fillna(0), (day_ci['ci_high'] - day_ci['estimate']).fillna(0)]
+        ax3.bar(range(len(days)), day_corr_values, color=colors, alpha=0.8, edgecolor='black', yerr=day_err, capsize=4)
+
+        ax3.axhline(y=0.3, color='red', linestyle='--', linewidth=2, alpha=0.7, label='Strong Positive Correlation')
+        ax3.axhline(y=-0.3, color='blue', linestyle='--', linewidth=2, alpha=0.7, label='Strong Negative Correlation')
+        ax3.axhline(y=0, color='black', linestyle='-', linewidth=1, alpha=0.5, label='No Correlation')
+
+        ax3.set_title("Daily Learning Style Correlation", fontweight="bold", fontsize=12)
+        ax3.set_xlabel("Day of Week")
+        ax3.set_ylabel("Correlation Coefficient")
+        ax3.set_xticks(range(len(days)))
+        ax3.set_xticklabels([day[:3] for day in days], rotation=45, ha='right')
+        ax3.legend()
+        ax3.grid(True, alpha=0.3)
+
+        # 각 바 위에 값 표시
+        for i, v in enumerate(day_corr_values):
+            ax3.text(i, v + 0.02 if v >= 0 else v - 0.08, f'{v:.2f}', ha='center',
+                   va='bottom' if v >= 0 else 'top', fontweight='bold')
+
+    # 4. 상관관계 강도 및 의미 분석
+    counts = data['strength_counts']
+    if counts is not None:
+        categories = ['Weak Correlation\n(0-0.3)', 'Moderate Correlation\n(0.3-0.7)', 'Strong Correlation\n(0.7+)']
+        colors = ['#90EE90', '#FFD700', '#FF6347']
+
+        ax4.bar(categories, counts, color=colors, alpha=0.8, edgecolor='black')
+        ax4.set_title("Correlation Strength Distribution & Learning Pattern Analysis", fontweight="bold", fontsize=12)
+        ax4.set_ylabel("Number of Correlation Pairs")
+        ax4.grid(True, alpha=0.3)
+
+        # 각 바 위에 값 표시
+        for i, v in enumerate(counts):
+            ax4.text(i, v + max(counts) * 0.02, str(v), ha='center', va='bottom', fontweight='bold')
+
+    plt.tight_layout()
+    plt.savefig(chart_path, dpi=300, bbox_inches='tight')
+    plt.close()
+    return chart_path
+
+
+def render_rolling_correlation_chart(data, chart_path):
+    """compute_rolling_correlation_data() 결과로 시간 창 상관관계 추이 PNG 저장 (프로세스 풀에서도 호출 가능)"""
+    import matplotlib.pyplot as plt
+
+    display_names = {
+        'complexity_ma': 'Learning Complexity',
+        'word_count': 'Expression Length',
+        'question_depth': 'Question Depth',
+    }
+    colors = ["#2E86AB", "#F24236", "#F6AE2D", "#6BCF7F", "#8E7DBE", "#4ECDC4"]
+
+    fig, (ax1, ax2, ax3) = plt.subplots(3, 1, figsize=(16, 14), sharex=True,
+                                        gridspec_kw={'height_ratios': [3, 3, 1]})
+    fig.suptitle(f"Rolling Learning Pattern Correlation ({data['window']} window, {data['period_label']})",
+                 fontsize=16, fontweight="bold")
+
+    # 1~2. 변수 쌍별 피어슨/스피어만 상관계수 추이
+    for ax, method, title in [(ax1, 'pearson', "Pearson Correlation"),
+                              (ax2, 'spearman', "Spearman Rank Correlation")]:
+        frame = data[method]
+        for color, pair in zip(colors, frame.columns):
+            a, b = pair.split(' ↔ ')
+            label = f"{display_names.get(a, a)} ↔ {display_names.get(b, b)}"
+            ax.plot(frame.index, frame[pair], '-', linewidth=2, color=color, label=label)
+        ax.axhline(y=0, color='black', linestyle='--', linewidth=1, alpha=0.5)
+        ax.set_title(title, fontweight="bold", fontsize=12)
+        ax.set_ylabel("Correlation Coefficient")
+        ax.set_ylim(-1.05, 1.05)
+        ax.legend(loc='lower left')
+        ax.grid(True, alpha=0.3)
+
+    # 3. 창별 메시지 수 (상관계수의 신뢰도 참고)
+    rows = data['rows']
+    ax3.bar(rows.index, rows.values, width=pd.Timedelta(data['step']) / pd.Timedelta('1D') * 0.8, color="#A0A0A0", alpha=0.8)
+    ax3.set_title("Messages per Window", fontweight="bold", fontsize=12)
+    ax3.set_xlabel("Window End (exclusive)")
+    ax3.set_ylabel("Messages")
+    ax3.grid(True, alpha=0.3)
+    fig.autofmt_xdate()
+
+    plt.tight_layout()
+    plt.savefig(chart_path, dpi=300, bbox_inches='tight')
+    plt.close()
+    return chart_path
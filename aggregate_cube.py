@@ -0,0 +1,188 @@
+# aggregate_cube.py
+# 집계 큐브 - (날짜, 시간대, 요일, 토픽, 질문 수준, 학습 관련 여부) 칸별 개수/합/편차 제곱합을 로드마다 한 번 만들고,
+# 대시보드/질문 수준/상관관계 집계를 메시지를 다시 스캔하지 않고 큐브 롤업으로 계산
+
+import os
+
+import numpy as np
+import pandas as pd
+
+from advanced_correlation_analyzer import correlations_from_comoments, merge_cell_moments
+from frame_view import as_view
+from question_level_analyzer_en import QUESTION_CATEGORY_BINS, QUESTION_CATEGORY_LABELS
+
+# 저장 형식/칸 정의가 바뀌면 올림 (캐시 파일 이름에 포함)
+CUBE_VERSION = 2
+
+# 칸 키 (요일은 날짜로 정해지지만 요일별 롤업을 바로 하도록 키에 둠)
+CUBE_KEYS = ['date', 'hour', 'day_of_week', 'primary_topic', 'question_category', 'is_learning_related']
+
+# 칸마다 개수/합/편차 제곱합을 저장하는 값 컬럼과, 상관관계 롤업용으로 편차 곱합을 저장하는 변수 쌍
+CUBE_MEASURES = ['word_count', 'question_depth', 'complexity_ma']
+CUBE_PAIRS = [(a, b) for i, a in enumerate(CUBE_MEASURES) for b in CUBE_MEASURES[i + 1:]]
+
+# 큐브를 만들 때 데이터에 있어야 하는 컬럼 (question_category는 question_depth로 계산)
+CUBE_INPUT_COLUMNS = [key for key in CUBE_KEYS if key != 'question_category'] + CUBE_MEASURES
+
+
+def _pair_column(a, b):
+    return f"{a}*{b}_comoment"
+
+
+class AggregationCube:
+    """칸별 충분통계량 표 - 그룹 평균/개수/피어슨 상관관계를 칸 합산(롤업)으로 계산
+
+    칸마다 rows(행 수), first_row(칸의 첫 행 위치), 값 컬럼별 count/sum/m2(결측 제외, 칸 평균 기준 편차 제곱합),
+    변수 쌍별 칸 평균 기준 편차 곱합을 저장한다. 평균은 sum / count라서 groupby().mean()처럼 결측을 건너뛰고,
+    토픽 개수 순위의 동점은 value_counts()처럼 먼저 나온 토픽이 앞에 온다.
+    상관관계는 칸별 편차 합을 병렬 분산 공식(merge_moments와 같은 식)으로 합치므로 값이 큰 컬럼에서도
+    원시 합의 상쇄 오차가 없다. 값 컬럼에 결측이 있으면 쌍별 제외를 할 수 없어 None을 반환한다
+    (호출한 쪽이 행 단위 계산으로 돌아간다).
+    """
+
+    def __init__(self, cells):
+        self.cells = cells  # 칸 표 (CUBE_KEYS + 통계량 컬럼, 키 오름차순)
+        self.total_rows = int(cells['rows'].sum()) if len(cells) else 0
+
+    def __repr__(self):
+        return f"AggregationCube({len(self.cells)} cells, {self.total_rows} rows)"
+
+    def __len__(self):
+        return len(self.cells)
+
+    @classmethod
+    def build(cls, data):
+        """데이터(DataFrame 또는 FrameView)를 한 번 스캔해서 큐브 생성"""
+        view = as_view(data)
+        missing = [col for col in CUBE_INPUT_COLUMNS if col not in view]
+        if missing:
+            raise ValueError(f"Aggregation cube requires missing columns: {missing}")
+
+        frame = view.frame(CUBE_INPUT_COLUMNS).reset_index(drop=True)
+        frame['question_category'] = pd.cut(frame['question_depth'], bins=QUESTION_CATEGORY_BINS,
+                                            labels=QUESTION_CATEGORY_LABELS)
+        values = {col: frame[col].to_numpy(dtype=float, na_value=np.nan) for col in CUBE_MEASURES}
+        stats = {'rows': np.ones(len(frame), dtype=np.int64), 'first_row': np.arange(len(frame))}
+        for col, x in values.items():
+            stats[f"{col}_count"] = (~np.isnan(x)).astype(np.int64)
+            stats[f"{col}_sum"] = x
+
+        grouped = frame[CUBE_KEYS].assign(**stats).groupby(CUBE_KEYS, dropna=False, observed=True, sort=True)
+        aggregations = {name: ('min' if name == 'first_row' else 'sum') for name in stats}
+        cells = grouped.agg(aggregations).reset_index()
+
+        # 2차: 칸 평균 기준 편차 제곱합/곱합 (grouped_moments와 같은 두 단계 계산, 결측은 0으로 더함)
+        codes = grouped.ngroup().to_numpy()
+        deviations = {}
+        with np.errstate(invalid='ignore', divide='ignore'):
+            for col, x in values.items():
+                cell_mean = cells[f"{col}_sum"].to_numpy() / cells[f"{col}_count"].to_numpy()
+                deviations[col] = x - cell_mean[codes]
+        moments = {f"{col}_m2": np.nan_to_num(dx * dx) for col, dx in deviations.items()}
+        for a, b in CUBE_PAIRS:
+            moments[_pair_column(a, b)] = np.nan_to_num(deviations[a] * deviations[b])
+        for name, weights in moments.items():
+            cells[name] = np.bincount(codes, weights=weights, minlength=len(cells))
+        return cls(cells)
+
+    # ---- 저장/불러오기 ----
+
+    def save(self, path):
+        """칸 표를 Feather로 저장"""
+        import pyarrow.feather as feather
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        feather.write_feather(self.cells, path + '.tmp', compression='uncompressed')
+        os.replace(path + '.tmp', path)
+        return path
+
+    @classmethod
+    def load(cls, path):
+        """저장된 큐브 불러오기"""
+        import pyarrow.feather as feather
+        return cls(feather.read_table(path).to_pandas())
+
+    # ---- 롤업 ----
+
+    def _cells(self, learning_only=False):
+        if learning_only:
+            return self.cells[self.cells['is_learning_related'].to_numpy(dtype=bool)]
+        return self.cells
+
+    def count(self, by=None, learning_only=False):
+        """by 그룹별 행 수 (by가 None이면 전체 행 수)
+
+        by: 칸 키 이름, 또는 칸 표와 같은 인덱스의 Series/Series 리스트 (주 라벨 등 키에서 만든 그룹)
+        """
+        cells = self._cells(learning_only)
+        if by is None:
+            return int(cells['rows'].sum())
+        return cells.groupby(self._by(cells, by), observed=True, sort=True)['rows'].sum()
+
+    def mean(self, column, by, learning_only=False):
+        """by 그룹별 column 평균 (groupby(by)[column].mean()과 같은 값)"""
+        cells = self._cells(learning_only)
+        sums = cells.groupby(self._by(cells, by), observed=True, sort=True)[[f"{column}_sum", f"{column}_count"]].sum()
+        return (sums[f"{column}_sum"] / sums[f"{column}_count"]).rename(column)
+
+    def value_counts(self, key, learning_only=False):
+        """키 값별 행 수 (Series.value_counts()처럼 많은 순, 동점이면 먼저 나온 값 먼저)"""
+        cells = self._cells(learning_only)
+        grouped = cells.groupby(key, observed=True).agg(count=('rows', 'sum'), first_row=('first_row', 'min'))
+        counts = grouped.sort_values('first_row', kind='stable')['count']
+        return counts.sort_values(ascending=False, kind='stable')
+
+    def correlations(self, columns, by=None, min_rows=11, learning_only=False):
+        """columns(값 컬럼과 hour) 사이의 피어슨 상관관계 행렬
+
+        by가 None이면 DataFrame 하나, 아니면 {그룹 키: DataFrame} (행 수가 min_rows 미만인 그룹 제외,
+        그룹 키 오름차순). 결측 때문에 정확한 값을 낼 수 없으면 None.
+        """
+        cells = self._cells(learning_only)
+        rows = cells['rows'].to_numpy(dtype=float)
+        if any((cells[f"{col}_count"].to_numpy() != rows).any() for col in columns if col in CUBE_MEASURES):
+            return None
+
+        # 칸별 평균과 칸 안 편차 곱합을 병렬 분산 공식으로 그룹별로 합침
+        # (키 컬럼(hour)은 칸 안에서 상수라서 칸 안 편차가 0)
+        keyed = {col: cells[col].to_numpy(dtype=float, na_value=np.nan) for col in columns if col not in CUBE_MEASURES}
+        if any(np.isnan(x).any() for x in keyed.values()):
+            return None
+        with np.errstate(invalid='ignore', divide='ignore'):
+            cell_means = np.stack([keyed[col] if col in keyed else cells[f"{col}_sum"].to_numpy() / rows
+                                   for col in columns], axis=1)
+
+        within = np.zeros((len(cells), len(columns), len(columns)))
+        for i, a in enumerate(columns):
+            for j, b in enumerate(columns[:i + 1]):
+                if a in keyed or b in keyed:
+                    continue
+                if a == b:
+                    values = cells[f"{a}_m2"].to_numpy()
+                else:
+                    values = cells[_pair_column(a, b) if (a, b) in CUBE_PAIRS else _pair_column(b, a)].to_numpy()
+                within[:, i, j] = within[:, j, i] = values
+
+        if by is None:
+            codes, keys = np.zeros(len(cells), dtype=np.int64), [None]
+        else:
+            codes, keys = pd.factorize(cells[by], sort=True)
+            keys = keys.tolist()
+        in_group = codes >= 0  # 그룹 키가 결측인 칸 제외
+        n, comoment = merge_cell_moments(codes[in_group], len(keys), rows[in_group], cell_means[in_group],
+                                         within[in_group])
+        corr = correlations_from_comoments(comoment)
+
+        if by is None:
+            return pd.DataFrame(corr[0], index=columns, columns=columns)
+        return {
+            key: pd.DataFrame(corr[g], index=columns, columns=columns)
+            for g, key in enumerate(keys)
+            if n[g] >= min_rows
+        }
+
+    @staticmethod
+    def _by(cells, by):
+        """그룹 기준을 (부분집합일 수 있는) 칸 표의 행에 맞춘 Series로"""
+        keys = [cells[key] if isinstance(key, str) else key.loc[cells.index]
+                for key in (by if isinstance(by, (list, tuple)) else [by])]
+        return keys if isinstance(by, (list, tuple)) else keys[0]
@@ -0,0 +1,364 @@
+# analytics_service.py
+# 로컬 분석 서비스 - 데이터를 한 번 로드해 메모리에 유지하고, 집계값/차트를 로컬 HTTP(또는 Unix 소켓) API로 제공
+#
+# 원본 파일이 바뀌면 자동으로 다시 로드하고, 응답 본문은 메모리 상한이 있는 LRU 캐시에 둔다.
+# 사용 예:
+#   python analytics_service.py ../../conversations_parsed.jsonl --port 8765
+#   curl localhost:8765/stats
+#   curl localhost:8765/question_level/weekly_depth
+#   curl localhost:8765/charts/dashboard.png -o dashboard.png
+#   python analytics_service.py ../../conversations_parsed.jsonl --socket /tmp/analytics.sock
+#   curl --unix-socket /tmp/analytics.sock localhost/correlation_insights
+
+import argparse
+import json
+import os
+import socketserver
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote, urlparse
+
+import pandas as pd
+
+from headless_api import _plain_key, to_plain
+
+SERVICE_HOST = '127.0.0.1'
+SERVICE_PORT = 8765
+
+# 응답 캐시 메모리 상한 (바이트)과 원본 파일 변경 확인 주기 (초)
+SERVICE_CACHE_BYTES = 64 * 1024 * 1024
+SERVICE_RELOAD_INTERVAL = 2.0
+
+# /charts/<이름>.png -> (렌더 함수 모듈, 렌더 함수 이름, 집계값 섹션)
+SERVICE_CHARTS = {
+    'dashboard': ('dashboard_creator_en', 'render_dashboard', 'dashboard'),
+    'question_level': ('question_level_analyzer_en', 'render_question_level_chart', 'question_level'),
+    'correlation': ('advanced_correlation_analyzer', 'render_correlation_dashboard', 'correlation'),
+}
+
+
+class ResultCache:
+    """응답 본문 LRU 캐시 - 저장한 바이트 합이 max_bytes를 넘으면 가장 오래 쓰지 않은 항목부터 제거"""
+
+    def __init__(self, max_bytes=SERVICE_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()  # 키 -> (content type, 본문 bytes)
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def __repr__(self):
+        return f"ResultCache({len(self.entries)} entries, {self.size} of {self.max_bytes} bytes)"
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key, content_type, body):
+        """본문 저장 (상한보다 큰 본문은 저장하지 않음)"""
+        if len(body) > self.max_bytes:
+            return
+        with self.lock:
+            old = self.entries.pop(key, None)
+            if old is not None:
+                self.size -= len(old[1])
+            self.entries[key] = (content_type, body)
+            self.size += len(body)
+            while self.size > self.max_bytes:
+                _, (_, evicted) = self.entries.popitem(last=False)
+                self.size -= len(evicted)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.size = 0
+
+    def stats(self):
+        with self.lock:
+            return {'entries': len(self.entries), 'bytes': self.size, 'max_bytes': self.max_bytes,
+                    'hits': self.hits, 'misses': self.misses}
+
+
+class AnalyticsService:
+    """데이터셋 하나를 메모리에 유지하면서 집계/차트 질의에 응답
+
+    MainExecutor 파이프라인(로드 → 파생 → 큐브 → 분석 단계)을 한 번 실행해 결과를 메모이즈해 두고,
+    직렬화한 응답은 데이터 세대(generation)를 키에 포함해 ResultCache에 저장한다.
+    감시 스레드가 원본 파일(디렉터리/glob이면 포함된 파일 목록)의 크기/수정시각을 확인해서 바뀌면
+    새 실행기로 다시 로드한 뒤 교체하므로, 다시 로드하는 동안에도 이전 데이터로 계속 응답한다.
+    """
+
+    def __init__(self, data_path, cache_bytes=SERVICE_CACHE_BYTES, reload_interval=SERVICE_RELOAD_INTERVAL,
+                 **executor_options):
+        self.data_path = data_path
+        # MainExecutor 옵션 (window, cache_dir, compact, csv_schema 등) - 다시 로드할 때도 같은 옵션 사용
+        self.executor_options = executor_options
+        self.cache = ResultCache(cache_bytes)
+        self.reload_interval = reload_interval
+        self.executor = None
+        self.aggregates = None  # 현재 세대의 compute_aggregates() 결과 (pandas 객체 그대로)
+        self.generation = 0
+        self._current = (0, None)  # (세대, 집계값) - 요청 처리 중 교체돼도 한 쌍으로 읽음
+        self.loaded_at = None
+        self.source_stamp = None
+        self.chart_dir = tempfile.mkdtemp(prefix='analytics_charts_')
+        self.reload_lock = threading.Lock()
+        self.render_lock = threading.Lock()  # pyplot은 스레드 안전하지 않으므로 차트는 한 번에 하나씩
+        self._stop = threading.Event()
+        self._watcher = None
+
+    def __repr__(self):
+        return f"AnalyticsService({self.data_path!r}, generation={self.generation})"
+
+    def _source_stamp(self):
+        """원본 파일들의 (경로, 크기, 수정시각) - 바뀌면 다시 로드"""
+        from data_loader_en import resolve_source_files
+        stamp = []
+        for path in resolve_source_files(self.data_path):
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            stamp.append((path, stat.st_size, stat.st_mtime_ns))
+        return tuple(stamp)
+
+    def load(self):
+        """원본을 로드하고 모든 집계값을 미리 계산한 뒤 현재 데이터로 교체"""
+        from main_executor_en import MainExecutor
+        with self.reload_lock:
+            stamp = self._source_stamp()
+            start = time.perf_counter()
+            executor = MainExecutor(self.data_path, **self.executor_options)
+            aggregates = executor.compute_aggregates()
+
+            self.executor, self.aggregates = executor, aggregates
+            self.source_stamp = stamp
+            self.generation += 1
+            self._current = (self.generation, aggregates)
+            self.loaded_at = datetime.now().isoformat(timespec='seconds')
+            self.cache.clear()
+        print(f"🔌 Analytics data ready (generation {self.generation}, "
+              f"{aggregates['stats'].get('total_messages', 0)} messages, {time.perf_counter() - start:.2f}s)")
+        return self
+
+    def check_reload(self):
+        """원본이 바뀌었으면 다시 로드 (다시 로드했으면 True)"""
+        if self._source_stamp() == self.source_stamp:
+            return False
+        print(f"🔄 Source changed, reloading: {self.data_path}")
+        self.load()
+        return True
+
+    def _watch(self):
+        while not self._stop.wait(self.reload_interval):
+            try:
+                self.check_reload()
+            except Exception as e:
+                # 쓰는 중인 파일 등으로 실패하면 이전 데이터를 유지하고 다음 주기에 다시 시도
+                print(f"⚠️ Reload failed, keeping generation {self.generation}: {e}")
+
+    def start_watching(self):
+        if self.reload_interval and self._watcher is None:
+            self._watcher = threading.Thread(target=self._watch, name='analytics-reload', daemon=True)
+            self._watcher.start()
+
+    def stop(self):
+        self._stop.set()
+
+    # ---- 질의 ----
+
+    def health(self, current=None):
+        generation, aggregates = current or self._current
+        return {
+            'status': 'ok',
+            'data_path': self.data_path,
+            'generation': generation,
+            'loaded_at': self.loaded_at,
+            'total_messages': aggregates['stats'].get('total_messages', 0) if aggregates else 0,
+            'cache': self.cache.stats(),
+        }
+
+    def _resolve(self, parts, aggregates):
+        """경로를 (차트 이름 또는 None, 응답할 값)으로 변환 (없는 경로면 KeyError/TypeError/IndexError)"""
+        if parts[:1] == ['charts'] and len(parts) == 2 and parts[1].endswith('.png'):
+            name = parts[1][:-len('.png')]
+            data = aggregates[SERVICE_CHARTS[name][2]]
+            if data is None:
+                raise KeyError(name)
+            return name, data
+        value = aggregates
+        for part in parts:
+            value = _lookup(value, part)
+        return None, value
+
+    def _render_chart(self, name, data):
+        """현재 세대 집계값으로 차트 하나를 그려 PNG bytes 반환"""
+        import importlib
+        from chart_renderer import _init_render_worker
+        module_name, func_name, _ = SERVICE_CHARTS[name]
+        render = getattr(importlib.import_module(module_name), func_name)
+        chart_path = os.path.join(self.chart_dir, f"{name}.png")
+        with self.render_lock:
+            _init_render_worker()
+            render(data, chart_path)
+            with open(chart_path, 'rb') as f:
+                return f.read()
+
+    def query(self, path):
+        """경로 하나에 응답 -> (HTTP 상태, content type, 본문 bytes, 캐시 적중 여부, 응답한 데이터 세대)
+
+        /health, /charts/<이름>.png, 그리고 compute_aggregates() 결과의 섹션 경로
+        (/stats, /dashboard/hourly_eff, /question_level/weekly_depth, /correlation_insights 등)를 지원한다.
+        세대는 응답에 쓴 (세대, 집계값) 묶음에서 읽으므로 처리 중에 다시 로드되어도 본문과 어긋나지 않는다.
+        """
+        parts = [unquote(part) for part in urlparse(path).path.strip('/').split('/') if part]
+        current = self._current
+        generation, aggregates = current
+        if parts == ['health']:
+            return 200, 'application/json', json.dumps(self.health(current)).encode('utf-8'), False, generation
+
+        key = (generation, tuple(parts))
+        cached = self.cache.get(key)
+        if cached is not None:
+            return 200, cached[0], cached[1], True, generation
+
+        # 경로 조회 실패만 404 - 렌더링/직렬화 중 오류(렌더러 내부 KeyError 포함)는 500으로 응답
+        try:
+            chart, value = self._resolve(parts, aggregates)
+        except (KeyError, TypeError, IndexError):
+            return 404, 'application/json', _error_body(f"Unknown path: /{'/'.join(parts)}"), False, generation
+        try:
+            if chart is not None:
+                content_type, body = 'image/png', self._render_chart(chart, value)
+            else:
+                content_type = 'application/json'
+                body = json.dumps(to_plain(value), ensure_ascii=False).encode('utf-8')
+        except Exception as e:
+            print(f"⚠️ Failed to answer /{'/'.join(parts)}: {e!r}")
+            return 500, 'application/json', _error_body(f"Failed to answer /{'/'.join(parts)}: {e}"), False, generation
+
+        self.cache.put(key, content_type, body)
+        return 200, content_type, body, False, generation
+
+
+def _lookup(value, part):
+    """경로 한 단계 조회 - 응답에 쓰는 키 문자열(_plain_key)로 비교하므로 정수/날짜 키도 경로로 조회 가능"""
+    if isinstance(value, pd.DataFrame):
+        keys, getter = value.columns, value.__getitem__
+    elif isinstance(value, pd.Series):
+        keys, getter = value.index, value.loc.__getitem__
+    elif isinstance(value, dict):
+        if part in value:
+            return value[part]
+        keys, getter = value.keys(), value.__getitem__
+    else:
+        raise TypeError(f"Cannot look up {part!r} in {type(value).__name__}")
+    for key in keys:
+        if _plain_key(key) == part:
+            return getter(key)
+    raise KeyError(part)
+
+
+def _error_body(message):
+    return json.dumps({'error': message}, ensure_ascii=False).encode('utf-8')
+
+
+class _ServiceHandler(BaseHTTPRequestHandler):
+    """GET 요청을 server.service.query()로 처리"""
+
+    def do_GET(self):
+        status, content_type, body, hit, generation = self.server.service.query(self.path)
+        self.send_response(status)
+        self.send_header('Content-Type', content_type if content_type != 'application/json'
+                         else 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('X-Cache', 'hit' if hit else 'miss')
+        self.send_header('X-Data-Generation', str(generation))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class _UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def get_request(self):
+        # Unix 소켓 연결은 클라이언트 주소가 없으므로 로그용 주소를 채움
+        request, _ = super().get_request()
+        return request, ('local', 0)
+
+
+def make_server(service, host=SERVICE_HOST, port=SERVICE_PORT, socket_path=None, verbose=False):
+    """서비스를 제공하는 HTTP 서버 생성 (socket_path를 주면 TCP 대신 Unix 소켓)"""
+    if socket_path:
+        if os.path.exists(socket_path):
+            os.remove(socket_path)
+        server = _UnixHTTPServer(socket_path, _ServiceHandler)
+    else:
+        server = ThreadingHTTPServer((host, port), _ServiceHandler)
+    server.service = service
+    server.verbose = verbose
+    return server
+
+
+def serve(data_path, host=SERVICE_HOST, port=SERVICE_PORT, socket_path=None, verbose=False, **service_options):
+    """데이터를 로드하고 종료(Ctrl+C)할 때까지 요청 처리 (처음 로드에 실패하면 None)"""
+    try:
+        service = AnalyticsService(data_path, **service_options).load()
+    except RuntimeError as e:
+        print(f"❌ {e}")
+        return None
+    service.start_watching()
+    server = make_server(service, host=host, port=port, socket_path=socket_path, verbose=verbose)
+    where = socket_path if socket_path else f"http://{host}:{server.server_address[1]}"
+    print(f"🚀 Analytics service listening on {where}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 Analytics service stopped")
+    finally:
+        service.stop()
+        server.server_close()
+        if socket_path and os.path.exists(socket_path):
+            os.remove(socket_path)
+    return service
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve learning analytics aggregates and charts from memory")
+    parser.add_argument('data_path', help="conversation export (.csv, .json, .jsonl, directory or glob)")
+    parser.add_argument('--host', default=SERVICE_HOST)
+    parser.add_argument('--port', type=int, default=SERVICE_PORT)
+    parser.add_argument('--socket', default=None, metavar='PATH', help="listen on a Unix socket instead of TCP")
+    parser.add_argument('--cache-mb', type=float, default=SERVICE_CACHE_BYTES / (1024 * 1024),
+                        help="memory ceiling of the response cache")
+    parser.add_argument('--reload-interval', type=float, default=SERVICE_RELOAD_INTERVAL,
+                        help="seconds between source change checks (0 disables hot reload)")
+    parser.add_argument('--no-cache', action='store_true', help="always parse the source file on (re)load")
+    parser.add_argument('--verbose', action='store_true', help="log every request")
+    args = parser.parse_args(argv)
+
+    options = {'cache_dir': None} if args.no_cache else {}
+    service = serve(args.data_path, host=args.host, port=args.port, socket_path=args.socket, verbose=args.verbose,
+                    cache_bytes=int(args.cache_mb * 1024 * 1024), reload_interval=args.reload_interval, **options)
+    if service is None:
+        raise SystemExit(1)
+    return service
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,273 @@
+# benchmark_suite.py
+# 벤치마크 모듈 - 합성 대화 데이터 생성 및 단계별 시간/메모리 측정
+#
+# 사용 예:
+#   python benchmark_suite.py --sizes 10000 100000 --formats jsonl csv --out bench_results.json
+
+import argparse
+import csv
+import json
+import os
+import platform
+import random
+import time
+import tracemalloc
+from datetime import datetime
+
+import numpy as np
+
+from run_instrumentation import peak_rss_mb, rss_metrics
+
+# 토픽별 (대화 제목 후보, 본문 키워드) - 분석 모듈의 분류 규칙이 실제로 걸리도록 구성
+SYNTHETIC_TOPICS = {
+    'AI/ML': (['LLM fine-tuning 질문', 'GPT prompt 설계', 'neural network 학습', 'langchain agent'],
+              ['model', 'training', 'neural', 'network', 'transformer', 'embedding', 'token', 'inference']),
+    'Development': (['파이썬 코드 오류', 'python 설치 문제', 'javascript 개발', '코드 리뷰'],
+                    ['code', 'python', 'function', 'class', 'debug', 'error', 'api', 'library']),
+    'Cloud/Infra': (['aws 람다 설정', '클라우드 비용', 'docker compose', 'kubernetes 배포'],
+                    ['docker', 'server', 'deploy', 'linux', 'shell', 'build', 'cli']),
+    'Design': (['앱 디자인 피드백', 'UI 컴포넌트', 'ux 리서치', '그래픽 작업'],
+               ['figma', 'layout', 'color', 'font', 'prototype', 'mobile', 'interface']),
+    'Business': (['프로젝트 기획', '서비스 네이밍', '마케팅 전략', 'OTT 시장'],
+                 ['market', 'plan', 'customer', 'revenue', 'strategy']),
+    'Education': (['학습 계획', '교육 과정 설계', 'course 추천', 'tutorial 정리'],
+                  ['learn', 'study', 'explain', 'concept', 'tutorial', 'course']),
+    'Data': (['데이터 분석 방법', 'data pipeline', 'analytics 대시보드', '온톨로지 구조'],
+             ['data', 'pandas', 'analysis', 'statistics', 'plot', 'csv', 'correlation']),
+    'General': (['오늘의 잡담', '여행 일정', '레시피 추천', '영화 이야기'],
+                ['today', 'weather', 'trip', 'food', 'movie', 'music']),
+}
+TOPIC_WEIGHTS = [0.18, 0.07, 0.017, 0.013, 0.037, 0.046, 0.073, 0.564]  # 실제 데이터 토픽 비율 근사
+FILLER_WORDS = ['the', 'a', 'to', 'of', 'and', 'is', 'in', 'it', 'for', 'this', 'that', 'with', 'can', 'you', 'please']
+QUESTION_WORDS = ['what', 'how', 'why', 'when', 'where']
+
+SUPPORTED_FORMATS = ['jsonl', 'csv', 'json']
+DEFAULT_START = '2024-01-01'
+DEFAULT_END = '2025-12-31'
+
+
+def generate_messages(n_messages, seed=0, start=DEFAULT_START, end=DEFAULT_END, chunk_size=100000):
+    """합성 메시지 레코드를 청크 단위로 생성 (10M 건도 메모리에 한꺼번에 올리지 않음)
+
+    대화(conversation)마다 제목과 토픽을 정하고, 메시지 길이는 로그정규 분포(긴 꼬리),
+    시간대는 낮 시간 위주로 분포시킨다. 레코드 dict 리스트를 청크마다 yield한다.
+    """
+    rng = np.random.default_rng(seed)
+    word_rng = random.Random(seed)  # 메시지별 단어 뽑기는 파이썬 random이 더 빠름
+    start_s = datetime.fromisoformat(start).timestamp()
+    end_s = datetime.fromisoformat(end).timestamp()
+    topics = list(SYNTHETIC_TOPICS)
+    # 시간대 가중치: 새벽은 적고 오후/저녁이 많음
+    hour_weights = np.array([1, 1, 1, 1, 1, 1, 2, 3, 4, 5, 6, 6, 5, 6, 7, 7, 6, 5, 5, 5, 4, 3, 2, 2], dtype=float)
+    hour_weights /= hour_weights.sum()
+
+    message_id = 0
+    conversation_id = 0
+    while message_id < n_messages:
+        size = min(chunk_size, n_messages - message_id)
+
+        # 대화 단위 속성 (평균 8개 메시지)
+        n_conversations = max(1, size // 8)
+        conv_topic = rng.choice(len(topics), size=n_conversations, p=TOPIC_WEIGHTS)
+        conv_title_idx = rng.integers(0, 4, size=n_conversations)
+        conv_day = rng.uniform(start_s, end_s, size=n_conversations) // 86400 * 86400
+        conv_hour = rng.choice(24, size=n_conversations, p=hour_weights)
+        conv_of_message = np.sort(rng.integers(0, n_conversations, size=size))
+
+        offsets = rng.exponential(120, size=size).cumsum() % 3600
+        create_time = (conv_day[conv_of_message] + conv_hour[conv_of_message] * 3600 + offsets).round(3)
+        n_words = np.clip(rng.lognormal(mean=3.0, sigma=1.0, size=size), 1, 2000).astype(int)
+        topic_share = rng.uniform(0.05, 0.4, size=size)
+        is_question = rng.random(size) < 0.35
+
+        records = []
+        for i in range(size):
+            conv = conv_of_message[i]
+            topic = topics[conv_topic[conv]]
+            titles, keywords = SYNTHETIC_TOPICS[topic]
+            n_topic_words = int(n_words[i] * topic_share[i])
+            words = word_rng.choices(FILLER_WORDS, k=n_words[i] - n_topic_words)
+            words += word_rng.choices(keywords, k=n_topic_words)
+            word_rng.shuffle(words)
+            if is_question[i]:
+                words.insert(0, QUESTION_WORDS[i % len(QUESTION_WORDS)])
+                words[-1] = words[-1] + '?'
+            records.append({
+                'id': f"msg-{message_id + i}",
+                'conversation_id': f"conv-{conversation_id + conv}",
+                'conversation_title': titles[conv_title_idx[conv]],
+                'create_time': float(create_time[i]),
+                'content': ' '.join(words),
+            })
+
+        yield records
+        message_id += size
+        conversation_id += n_conversations
+
+
+def write_synthetic_export(path, n_messages, fmt=None, seed=0, start=DEFAULT_START, end=DEFAULT_END):
+    """합성 대화 데이터를 CSV/JSON/JSONL 파일로 저장하고 경로 반환"""
+    fmt = fmt or os.path.splitext(path)[1].lstrip('.').lower()
+    if fmt not in SUPPORTED_FORMATS:
+        raise ValueError(f"Unsupported format: {fmt}")
+
+    fields = ['id', 'conversation_id', 'conversation_title', 'create_time', 'content']
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        if fmt == 'csv':
+            writer = csv.DictWriter(f, fieldnames=fields)
+            writer.writeheader()
+        elif fmt == 'json':
+            f.write('[\n')
+
+        first = True
+        for records in generate_messages(n_messages, seed=seed, start=start, end=end):
+            if fmt == 'csv':
+                writer.writerows(records)
+            elif fmt == 'jsonl':
+                f.writelines(json.dumps(record, ensure_ascii=False) + '\n' for record in records)
+            else:
+                for record in records:
+                    f.write(('' if first else ',\n') + json.dumps(record, ensure_ascii=False))
+                    first = False
+
+        if fmt == 'json':
+            f.write('\n]\n')
+    return path
+
+
+def measure_stage(name, func, rows_in=None, trace_memory=True):
+    """func 실행의 wall/CPU 시간, tracemalloc 최대 증가량, 최대 RSS 증가량을 측정해서 (결과, 측정값) 반환"""
+    if trace_memory:
+        tracemalloc.start()
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    rss_before = peak_rss_mb()
+    result = func()
+    cpu = time.process_time() - cpu_start
+    wall = time.perf_counter() - wall_start
+    peak_alloc = None
+    if trace_memory:
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        peak_alloc = round(peak / (1024 * 1024), 3)
+
+    rows_out = len(result) if hasattr(result, '__len__') and not isinstance(result, (dict, tuple, bool)) else None
+    return result, {
+        'stage': name,
+        'wall_s': round(wall, 4),
+        'cpu_s': round(cpu, 4),
+        'tracemalloc_peak_mb': peak_alloc,
+        **rss_metrics(rss_before),
+        'rows_in': rows_in,
+        'rows_out': rows_out,
+    }
+
+
+def run_benchmark(data_path, output_dir, trace_memory=True, compact=False, csv_schema=None):
+    """데이터 파일 하나에 대해 분석 단계들을 순서대로 실행하며 측정값 목록 반환"""
+    import matplotlib
+    matplotlib.use('Agg')
+    from data_loader_en import DataLoader
+    from dashboard_creator_en import DashboardCreator
+    from question_level_analyzer_en import QuestionLevelAnalyzer
+    from advanced_correlation_analyzer import AdvancedCorrelationAnalyzer
+
+    results = []
+
+    loader = DataLoader(data_path, compact=compact, csv_schema=csv_schema)
+    loaded, m = measure_stage('load_data', loader.load_data, trace_memory=trace_memory)
+    if not loaded:
+        raise RuntimeError(f"Failed to load {data_path}")
+    m['rows_out'] = len(loader.data)
+    results.append(m)
+    df = loader.data
+    n_rows = len(df)
+
+    creator = DashboardCreator("", window=loader.window)
+    creator.df = df
+    creator.portfolio_dir = output_dir
+    _, m = measure_stage('create_comprehensive_dashboard', creator.create_comprehensive_dashboard,
+                         rows_in=n_rows, trace_memory=trace_memory)
+    results.append(m)
+
+    analyzer = QuestionLevelAnalyzer("")
+    analyzer.df = df
+    analyzer.portfolio_dir = output_dir
+    learning_data, m = measure_stage('filter_learning_related_conversations',
+                                     analyzer.filter_learning_related_conversations,
+                                     rows_in=n_rows, trace_memory=trace_memory)
+    results.append(m)
+
+    _, m = measure_stage('analyze_question_level_trends',
+                         lambda: analyzer.analyze_question_level_trends(learning_data),
+                         rows_in=len(learning_data), trace_memory=trace_memory)
+    results.append(m)
+
+    _, m = measure_stage('create_question_level_chart', analyzer.create_question_level_chart,
+                         rows_in=n_rows, trace_memory=trace_memory)
+    results.append(m)
+
+    correlation = AdvancedCorrelationAnalyzer("")
+    correlation.df = df
+    correlation.portfolio_dir = output_dir
+    _, m = measure_stage('calculate_correlations', correlation.calculate_correlations,
+                         rows_in=n_rows, trace_memory=trace_memory)
+    results.append(m)
+
+    _, m = measure_stage('create_correlation_dashboard', correlation.create_correlation_dashboard,
+                         rows_in=n_rows, trace_memory=trace_memory)
+    results.append(m)
+
+    return results
+
+
+def main(argv=None):
+    from data_loader_en import CSV_SCHEMA
+    parser = argparse.ArgumentParser(description="Synthetic-data benchmark for the learning analytics pipeline")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000],
+                        help="message counts to generate (e.g. 10000 1000000 10000000)")
+    parser.add_argument('--formats', nargs='+', default=['jsonl'], choices=SUPPORTED_FORMATS)
+    parser.add_argument('--workdir', default='bench_data', help="folder for generated exports and charts")
+    parser.add_argument('--out', default='bench_results.json', help="machine-readable result file (JSON)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--no-tracemalloc', action='store_true', help="skip tracemalloc (faster, RSS only)")
+    parser.add_argument('--reuse', action='store_true', help="reuse previously generated exports")
+    parser.add_argument('--compact', action='store_true', help="load with DataLoader compact dtypes")
+    parser.add_argument('--csv-schema', action='store_true', help="read CSV exports with the declared CSV_SCHEMA")
+    args = parser.parse_args(argv)
+
+    os.makedirs(args.workdir, exist_ok=True)
+    runs = []
+    for size in args.sizes:
+        for fmt in args.formats:
+            data_path = os.path.join(args.workdir, f"synthetic_{size}.{fmt}")
+            if not (args.reuse and os.path.exists(data_path)):
+                print(f"🧪 Generating {size} messages -> {data_path}")
+                write_synthetic_export(data_path, size, fmt=fmt, seed=args.seed)
+
+            print(f"⏱️ Benchmarking {data_path}")
+            stages = run_benchmark(data_path, args.workdir, trace_memory=not args.no_tracemalloc,
+                                   compact=args.compact, csv_schema=CSV_SCHEMA if args.csv_schema else None)
+            runs.append({
+                'size': size,
+                'format': fmt,
+                'file_bytes': os.path.getsize(data_path),
+                'stages': stages,
+            })
+            for stage in stages:
+                print(f"   {stage['stage']:<40} {stage['wall_s']:>9.3f}s  peak {stage['tracemalloc_peak_mb']} MB")
+
+    report = {
+        'generated_at': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'runs': runs,
+    }
+    with open(args.out, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"✅ Benchmark results saved: {args.out}")
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+# chart_renderer.py
+# 차트 렌더링 모듈 - 미리 계산된 집계값으로 여러 차트를 프로세스 풀에서 동시에 렌더링
+
+import hashlib
+import inspect
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from importlib import metadata
+
+import numpy as np
+import pandas as pd
+
+from run_instrumentation import peak_rss_mb, rss_metrics
+
+# 렌더 캐시 매니페스트 파일명 (차트 경로별 입력 해시/생성 정보 기록)
+RENDER_MANIFEST_FILENAME = "render_manifest.json"
+
+# 해시 구성 방식이 바뀌면 올려서 기존 매니페스트를 무효화
+RENDER_CACHE_VERSION = 2
+
+
+def _use_agg_backend():
+    """화면 없이 Agg 백엔드로만 렌더링 (풀 워커와 현재 프로세스 렌더링 모두 같은 백엔드여야 PNG가 동일)"""
+    import matplotlib
+    matplotlib.use('Agg')
+
+
+def _init_render_worker():
+    """워커 프로세스 초기화 - 첫 렌더링 전에 Agg 백엔드 지정"""
+    _use_agg_backend()
+
+
+def _update_digest(digest, value):
+    """집계 데이터(DataFrame/Series/dict/list/스칼라)를 내용 기준으로 해시에 반영"""
+    if isinstance(value, pd.DataFrame):
+        digest.update(repr(('frame', list(value.columns), [str(t) for t in value.dtypes],
+                            str(value.index.dtype))).encode('utf-8'))
+        digest.update(pd.util.hash_pandas_object(value, index=True).to_numpy().tobytes())
+    elif isinstance(value, pd.Series):
+        digest.update(repr(('series', value.name, str(value.dtype), str(value.index.dtype))).encode('utf-8'))
+        digest.update(pd.util.hash_pandas_object(value, index=True).to_numpy().tobytes())
+    elif isinstance(value, np.ndarray):
+        digest.update(repr(('array', str(value.dtype), value.shape)).encode('utf-8'))
+        digest.update(np.ascontiguousarray(value).tobytes())
+    elif isinstance(value, dict):
+        digest.update(f"dict:{len(value)}".encode('utf-8'))
+        for key in sorted(value, key=repr):
+            digest.update(repr(key).encode('utf-8'))
+            _update_digest(digest, value[key])
+    elif isinstance(value, (list, tuple)):
+        digest.update(f"{type(value).__name__}:{len(value)}".encode('utf-8'))
+        for item in value:
+            _update_digest(digest, item)
+    else:
+        digest.update(repr(value).encode('utf-8'))
+
+
+def _render_source(render):
+    """렌더 함수가 정의된 모듈 전체 소스 (함수 밖의 색상/스타일 상수나 보조 함수 변경도 반영)"""
+    try:
+        return inspect.getsource(inspect.getmodule(render))
+    except (OSError, TypeError):
+        return render.__code__.co_code.hex()
+
+
+def chart_key(render, data):
+    """차트 입력 해시 - 집계값 + 렌더 함수 모듈 소스(스타일 포함) + matplotlib 버전"""
+    digest = hashlib.sha256()
+    source = _render_source(render)
+    try:
+        mpl_version = metadata.version('matplotlib')
+    except metadata.PackageNotFoundError:
+        mpl_version = 'unknown'
+    digest.update(repr((RENDER_CACHE_VERSION, render.__module__, render.__qualname__, mpl_version)).encode('utf-8'))
+    digest.update(source.encode('utf-8'))
+    _update_digest(digest, data)
+    return digest.hexdigest()
+
+
+def _load_manifest(manifest_path):
+    """매니페스트의 차트 기록 {저장 경로: {key, bytes, rendered_at}} 읽기 (없거나 깨졌으면 빈 dict)"""
+    if not os.path.exists(manifest_path):
+        return {}
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        if manifest.get('version') != RENDER_CACHE_VERSION:
+            return {}
+        return manifest.get('charts', {})
+    except (OSError, ValueError) as e:
+        print(f"⚠️ Render manifest ignored: {e}")
+        return {}
+
+
+def _save_manifest(manifest_path, charts):
+    with open(manifest_path + '.tmp', 'w', encoding='utf-8') as f:
+        json.dump({'version': RENDER_CACHE_VERSION, 'charts': charts}, f, ensure_ascii=False, indent=2)
+    os.replace(manifest_path + '.tmp', manifest_path)
+
+
+def _is_fresh(entry, chart_path, key):
+    """매니페스트 기록과 입력 해시가 같고, 기록된 PNG가 그대로 있으면 True"""
+    if entry is None or entry.get('key') != key or not os.path.exists(chart_path):
+        return False
+    return os.path.getsize(chart_path) == entry.get('bytes')
+
+
+def _timed_render(render, data, chart_path):
+    """렌더 함수를 실행하고 (저장 경로, 계측값) 반환 - 계측은 렌더링한 프로세스 안에서 측정"""
+    _use_agg_backend()
+    start = time.perf_counter()
+    cpu_start = time.process_time()
+    rss_before = peak_rss_mb()
+    result = render(data, chart_path)
+    metrics = {
+        'wall_s': round(time.perf_counter() - start, 4),
+        'cpu_s': round(time.process_time() - cpu_start, 4),
+        **rss_metrics(rss_before),
+        'pid': os.getpid(),
+    }
+    return result, metrics
+
+
+def render_charts(jobs, workers=None, profiler=None, manifest_path=None):
+    """(렌더 함수, 집계 데이터, 저장 경로) 목록을 렌더링하고 저장 경로 목록을 순서대로 반환
+
+    렌더 함수는 모듈 최상위 함수여야 하고(프로세스 간 전달), 집계 데이터만 받아 그린다.
+    workers가 1 이하이거나 다시 그릴 차트가 1개 이하면 현재 프로세스에서 순서대로 렌더링한다.
+    두 방식 모두 같은 렌더 함수와 Agg 백엔드를 쓰므로 결과 PNG는 동일하다.
+    profiler(RunProfiler)를 주면 차트별 렌더링 시간/메모리를 'render:<파일명>' 단계로 기록한다.
+    manifest_path를 주면 입력 해시(chart_key)가 매니페스트 기록과 같은 차트는 다시 그리지 않고
+    기존 PNG를 그대로 쓰며, 새로 그린 차트의 해시/크기/시각을 매니페스트에 기록한다.
+    """
+    if not jobs:
+        return []
+
+    manifest = _load_manifest(manifest_path) if manifest_path else {}
+    keys = [chart_key(render, data) if manifest_path else None for render, data, _ in jobs]
+    pending = [i for i, (_, _, chart_path) in enumerate(jobs)
+               if not (manifest_path and _is_fresh(manifest.get(chart_path), chart_path, keys[i]))]
+
+    if workers is None:
+        workers = min(len(pending), os.cpu_count() or 1)
+
+    start_s = profiler.elapsed() if profiler is not None else None
+    if workers <= 1 or len(pending) <= 1:
+        outcomes = [_timed_render(*jobs[i]) for i in pending]
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(pending)), initializer=_init_render_worker) as pool:
+            futures = [pool.submit(_timed_render, *jobs[i]) for i in pending]
+            outcomes = [future.result() for future in futures]
+    rendered = dict(zip(pending, outcomes))
+
+    results = []
+    for i, (_, _, chart_path) in enumerate(jobs):
+        stage_name = f"render:{os.path.basename(chart_path)}"
+        if i in rendered:
+            result, metrics = rendered[i]
+            if manifest_path:
+                manifest[chart_path] = {
+                    'key': keys[i],
+                    'bytes': os.path.getsize(chart_path),
+                    'rendered_at': datetime.now().isoformat(timespec='seconds'),
+                }
+            record = {'stage': stage_name, 'start_s': start_s, **metrics}
+        else:
+            result = chart_path
+            print(f"♻️ Chart inputs unchanged, reusing: {chart_path}")
+            record = {'stage': stage_name, 'start_s': start_s, 'wall_s': 0.0, 'cached': True}
+        if profiler is not None:
+            profiler.add_record(record)
+        results.append(result)
+
+    if manifest_path and rendered:
+        _save_manifest(manifest_path, manifest)
+    return results
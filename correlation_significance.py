@@ -0,0 +1,182 @@
+# correlation_significance.py
+# 상관관계 유의성 - 부트스트랩 신뢰구간과 순열검정 p값을 여러 반복을 묶은 행렬 연산으로 계산
+
+import os
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from advanced_correlation_analyzer import correlations_from_sums
+
+# 기본 반복 수와 신뢰수준
+SIGNIFICANCE_BOOTSTRAPS = 1000
+SIGNIFICANCE_PERMUTATIONS = 1000
+SIGNIFICANCE_CONFIDENCE = 0.95
+
+# 한 번에 만드는 반복 묶음의 원소 수 상한 (반복 수 × 행(또는 고유 행) 수)
+SIGNIFICANCE_BATCH_ELEMENTS = 20_000_000
+
+# 이 행 수를 넘는 그룹은 포아송 부트스트랩과, 무작위로 섞은 행의 순환 이동(FFT) 순열검정으로 계산
+SIGNIFICANCE_EXACT_ROWS = 10_000
+
+# 유의성 표(matrix_significance 결과)의 항목
+SIGNIFICANCE_TABLES = ['estimate', 'ci_low', 'ci_high', 'p_value']
+
+
+def _batches(total, per_batch):
+    """total개 반복을 per_batch개 이하 묶음 크기 목록으로"""
+    per_batch = max(1, int(per_batch))
+    return [min(per_batch, total - start) for start in range(0, total, per_batch)]
+
+
+def _collapse_rows(values):
+    """같은 값의 행을 합침 -> (고유 행 배열, 고유 행별 개수)"""
+    n, k = values.shape
+    codes = np.zeros(n, dtype=np.int64)
+    for j in range(k):
+        column_codes, uniques = pd.factorize(values[:, j])
+        codes = pd.factorize(codes * len(uniques) + column_codes)[0]
+    counts = np.bincount(codes)
+    first = np.empty(len(counts), dtype=np.int64)
+    first[codes[::-1]] = np.arange(n)[::-1]  # 고유 행별 첫 행 위치
+    return values[first], counts
+
+
+def bootstrap_correlations(values, n_boot=SIGNIFICANCE_BOOTSTRAPS, rng=None):
+    """행 복원추출 부트스트랩 상관관계 행렬 (n_boot, 변수, 변수)
+
+    같은 값의 행은 고유 행 하나와 개수로 합친 뒤, 반복마다 고유 행별 추출 개수를 뽑는다.
+    추출 개수 행렬(반복 × 고유 행)과 고유 행의 값/곱 행렬을 곱해 묶음 안의 모든 반복의 원시 합을 한 번에 구하므로
+    비용이 원래 행 수가 아니라 고유 행 수에 비례한다.
+    - SIGNIFICANCE_EXACT_ROWS행 이하: 다항분포 개수 (행별 복원추출과 같은 분포)
+    - 그보다 크면: 포아송 부트스트랩 (행마다 Poisson(1) 가중치 = 고유 행마다 Poisson(개수), 큰 표본에서 같은 분포)
+    """
+    rng = np.random.default_rng(rng)
+    n, k = values.shape
+    patterns, counts = _collapse_rows(values)
+    products = (patterns[:, :, None] * patterns[:, None, :]).reshape(len(patterns), k * k)
+
+    replicates = []
+    for size in _batches(n_boot, SIGNIFICANCE_BATCH_ELEMENTS // len(patterns)):
+        if n <= SIGNIFICANCE_EXACT_ROWS:
+            weights = rng.multinomial(n, counts / n, size=size).astype(float)
+        else:
+            weights = rng.poisson(counts, size=(size, len(counts))).astype(float)
+        s = weights @ patterns
+        ss = (weights @ products).reshape(size, k, k)
+        replicates.append(correlations_from_sums(weights.sum(axis=1), s, ss))
+    return np.concatenate(replicates)
+
+
+def _standardize(values):
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return (values - values.mean(axis=0)) / values.std(axis=0)
+
+
+def permutation_pvalues(values, n_perm=SIGNIFICANCE_PERMUTATIONS, rng=None):
+    """변수 쌍별 양측 순열검정 p값 행렬 (귀무가설: 두 변수가 서로 무관, 대각선/분산 0인 쌍은 NaN)
+
+    p = (1 + |r*| >= |r|인 반복 수) / (1 + 반복 수). 반복 r*는 표준화한 행렬 Z와, 행 순서를 바꾼 Z 사이의
+    교차 곱 Z^T Z[perm] / n이라서 반복 하나가 모든 변수 쌍의 귀무분포 값을 함께 준다.
+    - 작은 그룹: 무작위 순열 묶음을 한 번에 만들어 (반복, 변수, 변수) 교차 곱을 einsum으로 계산
+    - 큰 그룹(SIGNIFICANCE_EXACT_ROWS행 초과): 행을 한 번 무작위로 섞은 뒤 한 변수를 순환 이동한 값들이
+      반복이 된다 (상관계수는 행 순서와 무관하고, 순환 이동은 군이므로 정확한 순열검정). 모든 이동의 교차 곱을
+      FFT 교차상관 한 번으로 구하고 그중 n_perm개를 뽑으므로 비용이 O(n log n)이다.
+    """
+    rng = np.random.default_rng(rng)
+    n, k = values.shape
+    z = _standardize(values)
+    observed = np.abs(z.T @ z / n)
+    # 관측값과 같은 반복이 반올림 오차로 빠지지 않도록 약간의 여유
+    threshold = observed * (1 - 1e-9)
+    exceed = np.zeros((k, k))
+
+    if n <= SIGNIFICANCE_EXACT_ROWS:
+        total = n_perm
+        for size in _batches(n_perm, SIGNIFICANCE_BATCH_ELEMENTS // max(n * k, 1)):
+            order = np.argsort(rng.random((size, n)), axis=1)
+            cross = np.abs(np.einsum('ni,bnj->bij', z, z[order]) / n)
+            exceed += (cross >= threshold).sum(axis=0)
+    else:
+        shuffled = z[rng.permutation(n)]
+        shifts = rng.choice(np.arange(1, n), size=min(n_perm, n - 1), replace=False)
+        total = len(shifts)
+        spectra = np.fft.rfft(shuffled, axis=0)
+        for i in range(k):
+            for j in range(i + 1, k):
+                cross = np.fft.irfft(np.conj(spectra[:, i]) * spectra[:, j], n)[shifts] / n
+                exceed[i, j] = exceed[j, i] = (np.abs(cross) >= threshold[i, j]).sum()
+
+    pvalues = (1 + exceed) / (1 + total)
+    pvalues[np.isnan(observed)] = np.nan
+    np.fill_diagonal(pvalues, np.nan)
+    return pvalues
+
+
+def matrix_significance(values, columns, n_boot=SIGNIFICANCE_BOOTSTRAPS, n_perm=SIGNIFICANCE_PERMUTATIONS,
+                        confidence=SIGNIFICANCE_CONFIDENCE, seed=None):
+    """행렬 하나(결측 없는 행 × 변수 배열)의 상관계수, 부트스트랩 백분위 신뢰구간, 순열검정 p값
+
+    반환: {'estimate', 'ci_low', 'ci_high', 'p_value': 변수 × 변수 DataFrame, 'rows': 행 수}
+    """
+    seed = seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+    boot_rng, perm_rng = [np.random.default_rng(child) for child in seed.spawn(2)]
+    n, k = values.shape
+    estimate = correlations_from_sums(np.array([float(n)]), values.sum(axis=0)[None], (values.T @ values)[None])[0]
+    replicates = bootstrap_correlations(values, n_boot, boot_rng)
+    alpha = (1 - confidence) / 2
+    with warnings.catch_warnings():
+        # 분산이 0인 변수의 쌍은 모든 반복이 NaN -> 구간도 NaN
+        warnings.simplefilter('ignore', RuntimeWarning)
+        ci_low, ci_high = np.nanpercentile(replicates, [100 * alpha, 100 * (1 - alpha)], axis=0)
+    tables = {
+        'estimate': estimate,
+        'ci_low': ci_low,
+        'ci_high': ci_high,
+        'p_value': permutation_pvalues(values, n_perm, perm_rng),
+    }
+    result = {name: pd.DataFrame(table, index=columns, columns=columns) for name, table in tables.items()}
+    result['rows'] = n
+    return result
+
+
+def _significance_job(job):
+    """프로세스 풀 작업 하나 (그룹 키, 값 배열, 열 이름, 옵션)"""
+    key, values, columns, options = job
+    return key, matrix_significance(values, columns, **options)
+
+
+def correlation_significance(df, columns, by=None, n_boot=SIGNIFICANCE_BOOTSTRAPS, n_perm=SIGNIFICANCE_PERMUTATIONS,
+                             confidence=SIGNIFICANCE_CONFIDENCE, min_rows=11, seed=0, workers=1):
+    """전체(by=None) 또는 그룹별(시간대/요일 등) 상관관계 행렬의 신뢰구간과 p값
+
+    columns가 모두 있는 행만 쓴다. 그룹은 grouped_correlations()처럼 행 수가 min_rows 미만이면 빼고,
+    서로 독립이라 workers가 2 이상(None이면 CPU 수)이면 프로세스 풀에서 동시에 계산한다.
+    그룹별 난수는 seed에서 갈라져 나오므로 workers와 관계없이 결과가 같다.
+    반환: by=None이면 matrix_significance() 결과 하나, 아니면 {그룹 키: 결과} (그룹 키 오름차순)
+    """
+    frame = df[columns].astype(float)
+    complete = frame.notna().all(axis=1).to_numpy()
+    values = frame.to_numpy()[complete]
+    options = {'n_boot': n_boot, 'n_perm': n_perm, 'confidence': confidence}
+
+    if by is None:
+        return matrix_significance(values, columns, seed=seed, **options)
+
+    group_values = (df[by] if isinstance(by, str) else pd.Series(by, index=df.index)).to_numpy()[complete]
+    codes, keys = pd.factorize(group_values, sort=True)
+    sizes = np.bincount(codes[codes >= 0], minlength=len(keys))
+    selected = [g for g in range(len(keys)) if sizes[g] >= min_rows]
+    seeds = np.random.SeedSequence(seed).spawn(len(keys))
+    jobs = [(keys[g], values[codes == g], columns, {**options, 'seed': seeds[g]}) for g in selected]
+
+    if workers is None:
+        workers = min(len(jobs), os.cpu_count() or 1)
+    if workers <= 1 or len(jobs) <= 1:
+        results = [_significance_job(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as pool:
+            results = list(pool.map(_significance_job, jobs))
+    return {(key.item() if isinstance(key, np.generic) else key): result for key, result in results}
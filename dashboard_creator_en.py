@@ -1,13 +1,56 @@
 import pandas as pd
-import matplotlib.pyplot as plt
-import matplotlib.dates as mdates
 import numpy as np
 import os
+from data_loader_en import AnalysisWindow, classify_titles, read_csv_projected
+from frame_view import as_view
+
+DASHBOARD_FILENAME = "comprehensive_learning_dashboard.png"
+DAY_ORDER = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+
+DASHBOARD_COLUMNS = ['complexity_ma', 'primary_topic']
+
+# 대시보드 집계에 실제로 쓰는 컬럼 (이 컬럼만 꺼내서 집계)
+DASHBOARD_INPUT_COLUMNS = ['timestamp', 'date', 'hour', 'day_of_week', 'complexity_ma', 'question_depth', 'primary_topic']
+
+
+def add_dashboard_columns(df):
+    """대시보드/상관관계 분석에 쓰는 complexity_ma, primary_topic 컬럼이 없으면 계산해서 추가
+
+    FrameView를 넘기면 기본 프레임 대신 뷰의 사이드 테이블에 추가된다.
+    """
+    if 'complexity_ma' not in df.columns:
+        # word_count와 question_depth를 기반으로 복잡도 계산
+        if 'word_count' in df.columns and 'question_depth' in df.columns:
+            df['complexity_ma'] = (df['word_count'] / 100) + (df['question_depth'] * 10)
+        else:
+            # 기본값 설정
+            df['complexity_ma'] = 1.0
+
+    if 'primary_topic' not in df.columns:
+        # conversation_title을 기반으로 8개 토픽으로 분류
+        df['primary_topic'] = classify_titles(df['conversation_title'])
+    return df
+
+
+def _order_days(day_stats):
+    """요일별 집계표를 월요일부터 정렬 (숫자 요일은 이름으로 바꾸고, 없는 요일은 0)"""
+    # Convert numeric day_of_week to day names
+    day_mapping = {0: "Monday", 1: "Tuesday", 2: "Wednesday", 3: "Thursday",
+                   4: "Friday", 5: "Saturday", 6: "Sunday"}
+    if day_stats.index.dtype.kind in {'i','u','f'}:
+        day_stats.index = day_stats.index.map(lambda x: day_mapping.get(int(x), str(x)))
+    return day_stats.reindex(DAY_ORDER).fillna(0)
+
 
 class DashboardCreator:
-    def __init__(self, data_path):
+    def __init__(self, data_path, window=None):
         self.data_path = data_path
         self.df = None
+        # 분석 조건 - MainExecutor에서 받은 데이터는 이미 이 조건으로 걸러져 있음
+        # (직접 만들 때 조건을 주지 않으면 기간 제한 없이 CSV 전체를 집계)
+        self.window = window if window is not None else AnalysisWindow.unbounded()
+        self.sample = None  # StratifiedSample (있으면 미리보기 - 표본 가중 추정치와 신뢰구간 계산)
+        self.cube = None  # AggregationCube (있으면 메시지 대신 큐브 롤업으로 집계)
         self.portfolio_dir = "."
         os.makedirs(self.portfolio_dir, exist_ok=True)
 
@@ -16,172 +59,206 @@ class DashboardCreator:
         if hasattr(self, 'df') and self.df is not None:
             return self.df
 
-        # 기본적으로는 CSV 로드 (호환성 유지)
+        # 기본적으로는 CSV 로드 (호환성 유지) - 대시보드에 필요한 컬럼만 읽음
         try:
-            self.df = pd.read_csv(self.data_path)
+            self.df = self.window.apply(read_csv_projected(self.data_path))
         except:
             print("⚠️ No data path provided, assuming data is already loaded")
             return None
         return self.df
 
-    def create_comprehensive_dashboard(self):
-        # 필수 컬럼들이 없으면 계산해서 추가
-        if 'complexity_ma' not in self.df.columns:
-            # word_count와 question_depth를 기반으로 복잡도 계산
-            if 'word_count' in self.df.columns and 'question_depth' in self.df.columns:
-                self.df['complexity_ma'] = (self.df['word_count'] / 100) + (self.df['question_depth'] * 10)
-            else:
-                # 기본값 설정
-                self.df['complexity_ma'] = 1.0
-
-        if 'primary_topic' not in self.df.columns:
-            # conversation_title을 기반으로 8개 토픽으로 분류
-            def classify_topic(title):
-                title_lower = str(title).lower()
-
-                # AI/ML 관련
-                if any(keyword in title_lower for keyword in ['llm', 'ai', 'ml', 'neural', 'deep learning', 'machine learning', 'langchain', 'langgraph', 'transformer', 'gpt', 'bert']):
-                    return 'AI/ML'
-
-                # 개발 관련
-                elif any(keyword in title_lower for keyword in ['설치', '오류', '코드', '개발', 'programming', 'python', 'javascript']):
-                    return 'Development'
-
-                # 클라우드/인프라 관련
-                elif any(keyword in title_lower for keyword in ['aws', '클라우드', '서버리스', 'docker', 'kubernetes']):
-                    return 'Cloud/Infra'
-
-                # 디자인 관련
-                elif any(keyword in title_lower for keyword in ['디자인', 'ui', 'ux', '그래픽', 'design']):
-                    return 'Design'
-
-                # 비즈니스 관련
-                elif any(keyword in title_lower for keyword in ['프로젝트', '비즈니스', '네이밍', '마케팅', '사업', 'ott', 'ota']):
-                    return 'Business'
-
-                # 교육 관련
-                elif any(keyword in title_lower for keyword in ['교육', '학습', 'teaching', 'course', 'tutorial']):
-                    return 'Education'
-
-                # 데이터 관련
-                elif any(keyword in title_lower for keyword in ['데이터', '분석', 'data', 'analytics', '온톨로지']):
-                    return 'Data'
-
-                # 기타 (모든 토픽을 8개로 한정)
-                else:
-                    return 'General'
-
-            self.df['primary_topic'] = self.df['conversation_title'].apply(classify_topic)
-
-        fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(16, 12))
-        fig.suptitle("Personalized Learning Analysis Dashboard (Portfolio)", fontsize=16, fontweight="bold")
-
-        # 1. Hourly Efficiency
-        # filter by 2025-04-01 ~ 2025-08-31 if 'date' column exists
-        df_for_hour = self.df
-        if 'date' in self.df.columns:
-            df_for_hour = self.df.copy()
-            if not pd.api.types.is_datetime64_any_dtype(df_for_hour['date']):
-                df_for_hour['date'] = pd.to_datetime(df_for_hour['date'])
-            df_for_hour = df_for_hour[(df_for_hour['date'] >= pd.Timestamp('2025-04-01')) & (df_for_hour['date'] <= pd.Timestamp('2025-08-31'))]
-        hourly_eff = df_for_hour.groupby("hour")["complexity_ma"].mean()
-        ax1.plot(hourly_eff.index, hourly_eff.values, marker="o", linewidth=3, color="#2E86AB")
-        ax1.set_title("Hourly Efficiency", fontweight="bold")
-        ax1.set_xlabel("Hour")
-        ax1.set_ylabel("Complexity")
-        ax1.grid(True, alpha=0.3)
-        ax1.axvline(x=15, color="red", linestyle="--", alpha=0.7)
+    def compute_dashboard_data(self):
+        """대시보드 4개 차트에 필요한 집계값 계산 (렌더링과 분리)"""
+        if self.cube is not None and self.sample is None:
+            return self._compute_cube_data()
+        # 필수 컬럼들이 없으면 계산해서 추가 (뷰의 사이드 테이블에 추가되므로 원본 프레임은 그대로)
+        view = as_view(self.df)
+        add_dashboard_columns(view)
+        df = view.frame([col for col in DASHBOARD_INPUT_COLUMNS if col in view])
+        if self.sample is not None:
+            return self._compute_preview_data(df)
+
+        # 1. Hourly Efficiency (기간 필터는 로드 시점에 이미 적용됨)
+        hourly_eff = df.groupby("hour")["complexity_ma"].mean()
 
         # 2. Growth Trajectory (Enhanced like learning_growth_trajectory.png)
-        # Filter data for April-August period
-        df_for_growth = self.df
-        if 'date' in self.df.columns:
-            df_for_growth = self.df.copy()
-            if not pd.api.types.is_datetime64_any_dtype(df_for_growth['date']):
-                df_for_growth['date'] = pd.to_datetime(df_for_growth['date'])
-            df_for_growth = df_for_growth[(df_for_growth['date'] >= pd.Timestamp('2025-04-01')) &
-                                         (df_for_growth['date'] <= pd.Timestamp('2025-08-31'))]
-
-        # Ensure 'date' is datetime and group by date for daily aggregation
-        if 'date' in df_for_growth.columns:
-            if not pd.api.types.is_datetime64_any_dtype(df_for_growth['date']):
-                df_for_growth['date'] = pd.to_datetime(df_for_growth['date'])
-            daily_growth = df_for_growth.groupby('date')["complexity_ma"].mean()
+        # Group by date for daily aggregation, then make the (per-day) index datetime
+        if 'date' in df.columns:
+            daily_growth = df.groupby('date')["complexity_ma"].mean()
+            if not pd.api.types.is_datetime64_any_dtype(daily_growth.index):
+                daily_growth.index = pd.to_datetime(daily_growth.index)
         else:
-            daily_growth = df_for_growth.groupby(pd.Grouper(key='timestamp', freq='D'))["complexity_ma"].mean()
-
-        # Calculate trend line (7-day moving average)
-        trend_line = daily_growth.rolling(window=7).mean()
-
-        # Plot the data
-        ax2.fill_between(daily_growth.index, daily_growth.values, alpha=0.3, color="#FFA500")
-        ax2.plot(daily_growth.index, trend_line.values, color="#FF6B35", linewidth=4, label="7-day Trend")
-
-        # Add phase markers
-        total_days = len(daily_growth)
-        if total_days > 0:
-            ax2.axvline(x=daily_growth.index[min(int(total_days*0.3), total_days-1)],
-                       color="#2E86AB", linestyle="--", linewidth=2, alpha=0.8, label="Initial Phase")
-            ax2.axvline(x=daily_growth.index[min(int(total_days*0.7), total_days-1)],
-                       color="#F24236", linestyle="--", linewidth=2, alpha=0.8, label="Maturity Phase")
-
-        ax2.set_title("Learning Growth Trajectory (April-August 2025)", fontsize=12, fontweight="bold")
-        ax2.set_xlabel("Date", fontsize=10)
-        ax2.set_ylabel("Learning Complexity", fontsize=10)
-        ax2.legend(fontsize=8)
-
-        # Set robust date formatting on the x-axis
-        ax2.xaxis.set_major_formatter(mdates.DateFormatter('%m/%d'))
-        ax2.xaxis.set_major_locator(mdates.DayLocator(interval=7))
-        ax2.tick_params(axis='x', rotation=45, labelsize=8)
-        ax2.grid(True, alpha=0.3)
+            daily_growth = df.groupby(pd.Grouper(key='timestamp', freq='D'))["complexity_ma"].mean()
 
         # 3. Topic Distribution
-        topic_counts = self.df["primary_topic"].value_counts().head(8)
-        colors = plt.cm.Set3(np.linspace(0, 1, len(topic_counts)))
-        ax3.bar(range(len(topic_counts)), topic_counts.values, color=colors)
-        ax3.set_title("Main Topics", fontweight="bold")
-        ax3.set_xticks(range(len(topic_counts)))
-        ax3.set_xticklabels([t[:10] + "..." if len(t) > 10 else t for t in topic_counts.index],
-                           rotation=45, ha="right")
-        ax3.set_ylabel("Frequency")
-
-        # 4. Day of Week Patterns (필터링 기간 4월1일 ~ 8월말)
-        df_for_day = self.df
-        if 'date' in self.df.columns:
-            try:
-                df_for_day = self.df.copy()
-                if not pd.api.types.is_datetime64_any_dtype(df_for_day['date']):
-                    df_for_day['date'] = pd.to_datetime(df_for_day['date'])
-                df_for_day = df_for_day[(df_for_day['date'] >= pd.Timestamp('2025-04-01')) & (df_for_day['date'] <= pd.Timestamp('2025-08-31'))]
-            except Exception:
-                pass
-        day_stats = df_for_day.groupby("day_of_week")[['complexity_ma', 'question_depth']].mean()
-        # Convert numeric day_of_week to day names
-        day_mapping = {0: "Monday", 1: "Tuesday", 2: "Wednesday", 3: "Thursday",
-                       4: "Friday", 5: "Saturday", 6: "Sunday"}
-        if day_stats.index.dtype.kind in {'i','u','f'}:
-            day_stats.index = day_stats.index.map(lambda x: day_mapping.get(int(x), str(x)))
-        day_order = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
-        day_stats = day_stats.reindex(day_order).fillna(0)
-
-        x = range(len(day_order))
-        width = 0.35
-        ax4.bar([i - width/2 for i in x], day_stats["complexity_ma"], width, label="Complexity", color="#4ECDC4")
-        ax4.bar([i + width/2 for i in x], day_stats["question_depth"], width, label="Question Depth", color="#45B7D1")
-        ax4.set_title("Weekly Patterns", fontweight="bold")
-        ax4.set_xticks(x)
-        ax4.set_xticklabels([d[:3] for d in day_order])
-        ax4.legend()
-        ax4.grid(True, alpha=0.3)
-
-        plt.tight_layout()
-        chart_path = os.path.join(self.portfolio_dir, "comprehensive_learning_dashboard.png")
-        plt.savefig(chart_path, dpi=300, bbox_inches="tight")
-        plt.close()
+        topic_counts = df["primary_topic"].value_counts().head(8)
+
+        # 4. Day of Week Patterns (분석 기간 내 데이터)
+        day_stats = _order_days(df.groupby("day_of_week")[['complexity_ma', 'question_depth']].mean())
+
+        return {
+            'hourly_eff': hourly_eff,
+            'daily_growth': daily_growth,
+            'topic_counts': topic_counts,
+            'day_stats': day_stats,
+            'period_label': self.window.label(),
+        }
+
+    def _compute_cube_data(self):
+        """집계 큐브 롤업으로 같은 집계값 계산 (메시지를 다시 스캔하지 않음)"""
+        cube = self.cube
+        daily_growth = cube.mean('complexity_ma', 'date')
+        if not pd.api.types.is_datetime64_any_dtype(daily_growth.index):
+            daily_growth.index = pd.to_datetime(daily_growth.index)
+        day_stats = pd.DataFrame({col: cube.mean(col, 'day_of_week') for col in ['complexity_ma', 'question_depth']})
+
+        return {
+            'hourly_eff': cube.mean('complexity_ma', 'hour'),
+            'daily_growth': daily_growth,
+            'topic_counts': cube.value_counts('primary_topic').head(8),
+            'day_stats': _order_days(day_stats),
+            'period_label': self.window.label(),
+        }
+
+    def _compute_preview_data(self, df):
+        """미리보기 표본으로 같은 집계값을 가중 추정하고, 집계값별 신뢰구간 표를 intervals에 담음"""
+        sample = self.sample
+        day_names = df['day_of_week']
+        if day_names.dtype.kind in {'i', 'u', 'f'}:
+            day_names = day_names.map(lambda x: DAY_ORDER[int(x)] if 0 <= x < len(DAY_ORDER) else str(x))
+        date = df['date'] if 'date' in df.columns else df['timestamp'].dt.normalize().rename('date')
+
+        hourly = sample.group_mean(df['complexity_ma'], df['hour'])
+        daily = sample.group_mean(df['complexity_ma'], date)
+        if not pd.api.types.is_datetime64_any_dtype(daily.index):
+            daily.index = pd.to_datetime(daily.index)
+        topics = sample.group_total(df['primary_topic']).sort_values('estimate', ascending=False, kind='stable').head(8)
+        topics.index = topics.index.astype(object)
+        day_complexity = sample.group_mean(df['complexity_ma'], day_names).reindex(DAY_ORDER)
+        day_depth = sample.group_mean(df['question_depth'], day_names).reindex(DAY_ORDER)
+        day_stats = pd.DataFrame({'complexity_ma': day_complexity['estimate'],
+                                  'question_depth': day_depth['estimate']}).fillna(0)
+
+        return {
+            'hourly_eff': hourly['estimate'].rename('complexity_ma'),
+            'daily_growth': daily['estimate'].rename('complexity_ma'),
+            'topic_counts': topics['estimate'].rename('count'),
+            'day_stats': day_stats,
+            'period_label': self.window.label(),
+            'intervals': {
+                'hourly_eff': hourly,
+                'daily_growth': daily,
+                'topic_counts': topics,
+                'day_complexity': day_complexity,
+                'day_question_depth': day_depth,
+            },
+            'preview': sample.describe(),
+        }
+
+    def create_comprehensive_dashboard(self):
+        data = self.compute_dashboard_data()
+        chart_path = os.path.join(self.portfolio_dir, DASHBOARD_FILENAME)
+        render_dashboard(data, chart_path)
         print(f"✅ Dashboard created: {chart_path}")
 
-        return len(topic_counts), hourly_eff.max()
+        return len(data['topic_counts']), data['hourly_eff'].max()
+
+
+def render_dashboard(data, chart_path):
+    """compute_dashboard_data() 결과로 대시보드 PNG 저장 (프로세스 풀에서도 호출 가능)"""
+    # 플로팅 라이브러리는 차트를 실제로 그릴 때만 import (집계만 쓰는 호출은 import 비용 없음)
+    import matplotlib.pyplot as plt
+    import matplotlib.dates as mdates
+
+    hourly_eff = data['hourly_eff']
+    daily_growth = data['daily_growth']
+    topic_counts = data['topic_counts']
+    day_stats = data['day_stats']
+    # 미리보기 결과면 제목에 근사 표시를 붙이고 각 차트에 신뢰구간을 함께 그림
+    intervals = data.get('intervals')
+
+    fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(16, 12))
+    title = "Personalized Learning Analysis Dashboard (Portfolio)"
+    if 'preview' in data:
+        from preview_sampling import preview_caption
+        title += "\n" + preview_caption(data['preview'])
+    fig.suptitle(title, fontsize=16, fontweight="bold")
+
+    # 1. Hourly Efficiency
+    ax1.plot(hourly_eff.index, hourly_eff.values, marker="o", linewidth=3, color="#2E86AB")
+    if intervals is not None:
+        ax1.fill_between(hourly_eff.index, intervals['hourly_eff']['ci_low'], intervals['hourly_eff']['ci_high'],
+                         color="#2E86AB", alpha=0.2)
+    ax1.set_title("Hourly Efficiency", fontweight="bold")
+    ax1.set_xlabel("Hour")
+    ax1.set_ylabel("Complexity")
+    ax1.grid(True, alpha=0.3)
+    ax1.axvline(x=15, color="red", linestyle="--", alpha=0.7)
+
+    # 2. Growth Trajectory
+    # Calculate trend line (7-day moving average)
+    trend_line = daily_growth.rolling(window=7).mean()
+
+    # Plot the data
+    ax2.fill_between(daily_growth.index, daily_growth.values, alpha=0.3, color="#FFA500")
+    ax2.plot(daily_growth.index, trend_line.values, color="#FF6B35", linewidth=4, label="7-day Trend")
+    if intervals is not None:
+        ax2.fill_between(daily_growth.index, intervals['daily_growth']['ci_low'],
+                         intervals['daily_growth']['ci_high'], color="#FF6B35", alpha=0.15, label="Daily CI")
+
+    # Add phase markers
+    total_days = len(daily_growth)
+    if total_days > 0:
+        ax2.axvline(x=daily_growth.index[min(int(total_days*0.3), total_days-1)],
+                   color="#2E86AB", linestyle="--", linewidth=2, alpha=0.8, label="Initial Phase")
+        ax2.axvline(x=daily_growth.index[min(int(total_days*0.7), total_days-1)],
+                   color="#F24236", linestyle="--", linewidth=2, alpha=0.8, label="Maturity Phase")
+
+    ax2.set_title(f"Learning Growth Trajectory ({data['period_label']})", fontsize=12, fontweight="bold")
+    ax2.set_xlabel("Date", fontsize=10)
+    ax2.set_ylabel("Learning Complexity", fontsize=10)
+    ax2.legend(fontsize=8)
+
+    # Set robust date formatting on the x-axis
+    ax2.xaxis.set_major_formatter(mdates.DateFormatter('%m/%d'))
+    ax2.xaxis.set_major_locator(mdates.DayLocator(interval=7))
+    ax2.tick_params(axis='x', rotation=45, labelsize=8)
+    ax2.grid(True, alpha=0.3)
+
+    # 3. Topic Distribution
+    colors = plt.cm.Set3(np.linspace(0, 1, len(topic_counts)))
+    topic_err = None
+    if intervals is not None:
+        topic_ci = intervals['topic_counts']
+        topic_err = [topic_ci['estimate'] - topic_ci['ci_low'], topic_ci['ci_high'] - topic_ci['estimate']]
+    ax3.bar(range(len(topic_counts)), topic_counts.values, color=colors, yerr=topic_err, capsize=4)
+    ax3.set_title("Main Topics", fontweight="bold")
+    ax3.set_xticks(range(len(topic_counts)))
+    ax3.set_xticklabels([t[:10] + "..." if len(t) > 10 else t for t in topic_counts.index],
+                       rotation=45, ha="right")
+    ax3.set_ylabel("Frequency")
+
+    # 4. Day of Week Patterns
+    x = range(len(DAY_ORDER))
+    width = 0.35
+    complexity_err, depth_err = None, None
+    if intervals is not None:
+        complexity_err = (intervals['day_complexity']['ci_high'] - intervals['day_complexity']['estimate']).fillna(0)
+        depth_err = (intervals['day_question_depth']['ci_high'] - intervals['day_question_depth']['estimate']).fillna(0)
+    ax4.bar([i - width/2 for i in x], day_stats["complexity_ma"], width, label="Complexity", color="#4ECDC4",
+            yerr=complexity_err, capsize=3)
+    ax4.bar([i + width/2 for i in x], day_stats["question_depth"], width, label="Question Depth", color="#45B7D1",
+            yerr=depth_err, capsize=3)
+    ax4.set_title("Weekly Patterns", fontweight="bold")
+    ax4.set_xticks(x)
+    ax4.set_xticklabels([d[:3] for d in DAY_ORDER])
+    ax4.legend()
+    ax4.grid(True, alpha=0.3)
+
+    plt.tight_layout()
+    plt.savefig(chart_path, dpi=300, bbox_inches="tight")
+    plt.close()
+    return chart_path
 
 if __name__ == "__main__":
     creator = DashboardCreator("../processed_conversations.csv")
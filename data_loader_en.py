@@ -1,11 +1,460 @@
 import pandas as pd
+import numpy as np
 import os
 import json
+import re
+import hashlib
+import glob
+from run_instrumentation import profile_stage
+from text_index import TokenIndex
+from json_backend import get_json_backend, iter_json_records, iter_jsonl_records
+
+# 텍스트 파생 컬럼 계산에 쓰는 키워드/패턴 (분석 모듈 전체가 공유)
+QUESTION_TERMS = ['?', 'what', 'how', 'why', 'when', 'where']
+QUESTION_PATTERN = '|'.join(re.escape(term) for term in QUESTION_TERMS)
+
+LEARNING_KEYWORDS = [
+    'learn', 'study', 'understand', 'explain', 'how', 'what', 'why', 'teach',
+    'concept', 'algorithm', 'model', 'data', 'analysis', 'programming', 'code',
+    'python', 'machine learning', 'ai', 'deep learning', 'neural', 'network',
+    'statistics', 'probability', 'math', 'calculus', 'linear algebra',
+    'optimization', 'gradient', 'loss', 'accuracy', 'training', 'validation'
+]
+
+TECH_TERMS = ['python', 'ai', 'machine learning', 'data', 'algorithm', 'neural', 'network', 'model', 'training']
+
+TEXT_FEATURE_COLUMNS = ['word_count', 'question_depth', 'has_question', 'tech_term_density', 'is_learning_related']
+
+# DataLoader.load_data()가 보장하는 파생 컬럼
+LOADED_COLUMNS = ['timestamp', 'date', 'hour', 'day_of_week'] + TEXT_FEATURE_COLUMNS
+
+# conversation_title 기반 8개 토픽 분류 규칙 (위에서부터 먼저 맞는 토픽 선택)
+TITLE_TOPIC_KEYWORDS = [
+    ('AI/ML', ['llm', 'ai', 'ml', 'neural', 'deep learning', 'machine learning', 'langchain', 'langgraph', 'transformer', 'gpt', 'bert']),
+    ('Development', ['설치', '오류', '코드', '개발', 'programming', 'python', 'javascript']),
+    ('Cloud/Infra', ['aws', '클라우드', '서버리스', 'docker', 'kubernetes']),
+    ('Design', ['디자인', 'ui', 'ux', '그래픽', 'design']),
+    ('Business', ['프로젝트', '비즈니스', '네이밍', '마케팅', '사업', 'ott', 'ota']),
+    ('Education', ['교육', '학습', 'teaching', 'course', 'tutorial']),
+    ('Data', ['데이터', '분석', 'data', 'analytics', '온톨로지']),
+]
+
+
+def classify_title_topic(title):
+    """conversation_title을 8개 토픽 중 하나로 분류 (해당 없으면 General)"""
+    title_lower = str(title).lower()
+    for topic, keywords in TITLE_TOPIC_KEYWORDS:
+        if any(keyword in title_lower for keyword in keywords):
+            return topic
+    # 기타 (모든 토픽을 8개로 한정)
+    return 'General'
+
+
+# 제목 -> 토픽 메모 (프로세스 안에서 공유, save/load_title_topic_memo로 실행 간 유지)
+TITLE_TOPIC_MEMO = {}
+TITLE_TOPIC_MEMO_FILENAME = "title_topics.json"
+
+# 분류 규칙이 바뀌면 저장된 메모를 무효화하기 위한 규칙 해시
+TITLE_TOPIC_RULES_KEY = hashlib.sha256(repr(TITLE_TOPIC_KEYWORDS).encode('utf-8')).hexdigest()[:16]
+
+
+def classify_titles(titles, memo=None):
+    """conversation_title Series를 고유 제목마다 한 번만 분류해서 행 전체에 매핑
+
+    제목을 코드 배열로 바꾼 뒤(category면 기존 코드 사용) 고유 제목만 classify_title_topic으로 분류하고,
+    토픽 코드 배열로 다시 펼친다. 비용은 메시지 수가 아니라 대화(제목) 수에 비례한다.
+    입력이 category면 category, 아니면 문자열 Series를 반환한다 (.apply 결과와 같은 값).
+    """
+    memo = TITLE_TOPIC_MEMO if memo is None else memo
+    if isinstance(titles.dtype, pd.CategoricalDtype):
+        codes = titles.cat.codes.to_numpy()
+        uniques = list(titles.cat.categories)
+        if (codes < 0).any():
+            # 결측 제목은 맨 뒤 코드로 보내 NaN 제목과 같은 규칙(General)으로 분류
+            codes = np.where(codes < 0, len(uniques), codes)
+            uniques.append(np.nan)
+    else:
+        codes, uniques = pd.factorize(titles, use_na_sentinel=False)
+        uniques = list(uniques)
+
+    labels = []
+    for title in uniques:
+        key = str(title)
+        topic = memo.get(key)
+        if topic is None:
+            topic = memo[key] = classify_title_topic(title)
+        labels.append(topic)
+
+    topics, title_to_topic = np.unique(np.asarray(labels, dtype=object), return_inverse=True)
+    topic_codes = title_to_topic[codes] if len(codes) else np.zeros(0, dtype=np.intp)
+    if isinstance(titles.dtype, pd.CategoricalDtype):
+        values = pd.Categorical.from_codes(topic_codes, categories=topics)
+    else:
+        values = topics.astype(object)[topic_codes]
+    return pd.Series(values, index=titles.index, name='primary_topic')
+
+
+def load_title_topic_memo(path):
+    """저장된 제목 -> 토픽 메모를 TITLE_TOPIC_MEMO에 합침 (규칙이 바뀌었으면 무시)"""
+    if not os.path.exists(path):
+        return 0
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            saved = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"⚠️ Title topic memo ignored: {e}")
+        return 0
+    if saved.get('rules') != TITLE_TOPIC_RULES_KEY:
+        return 0
+    TITLE_TOPIC_MEMO.update(saved.get('topics', {}))
+    return len(saved.get('topics', {}))
+
+
+def save_title_topic_memo(path):
+    """TITLE_TOPIC_MEMO를 규칙 해시와 함께 저장"""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path + '.tmp', 'w', encoding='utf-8') as f:
+        json.dump({'rules': TITLE_TOPIC_RULES_KEY, 'topics': TITLE_TOPIC_MEMO}, f, ensure_ascii=False)
+    os.replace(path + '.tmp', path)
+
+
+class AnalysisWindow:
+    """분석 대상 행 조건 (기간, 시간대, 토픽)
+
+    로드 시점에 한 번만 적용되고, 분석 모듈들은 이미 걸러진 데이터를 받는다.
+    end_date는 기존과 같이 timestamp <= end_date (해당 날짜 0시)까지 포함한다.
+    """
+
+    def __init__(self, start_date='2025-04-01', end_date='2025-08-31', hours=None, topics=None):
+        self.start_date = pd.Timestamp(start_date)
+        self.end_date = pd.Timestamp(end_date)
+        self.hours = None if hours is None else frozenset(int(h) for h in hours)
+        self.topics = None if topics is None else frozenset(topics)
+        self._start_s = self.start_date.timestamp()
+        self._end_s = self.end_date.timestamp()
+
+    def __repr__(self):
+        return (f"AnalysisWindow({self.start_date} ~ {self.end_date}, "
+                f"hours={sorted(self.hours) if self.hours is not None else 'all'}, "
+                f"topics={sorted(self.topics) if self.topics is not None else 'all'})")
+
+    @classmethod
+    def unbounded(cls):
+        """기간/시간대/토픽 제한이 없는 조건 (모든 행 통과)"""
+        return cls(pd.Timestamp.min, pd.Timestamp.max)
+
+    def without_period(self):
+        """같은 시간대/토픽 조건에 기간 제한만 없앤 조건 (계속 추가되는 증분 배치 로드용)"""
+        return AnalysisWindow(pd.Timestamp.min, pd.Timestamp.max, hours=self.hours, topics=self.topics)
+
+    def period_text(self):
+        """보고서용 기간 문자열 (예: 2025-04-01 ~ 2025-08-31, 제한 없는 쪽은 비워 둠)"""
+        start = f"{self.start_date:%Y-%m-%d}" if self.start_date > pd.Timestamp.min else ""
+        end = f"{self.end_date:%Y-%m-%d}" if self.end_date < pd.Timestamp.max else ""
+        if not (start or end):
+            return "all dates"
+        return f"{start} ~ {end}".strip()
+
+    def label(self):
+        """차트 제목용 기간 문자열 (예: April-August 2025)"""
+        if self.start_date == pd.Timestamp.min and self.end_date == pd.Timestamp.max:
+            return "All Dates"
+        if self.start_date == pd.Timestamp.min:
+            return f"Through {self.end_date:%B %Y}"
+        if self.end_date == pd.Timestamp.max:
+            return f"Since {self.start_date:%B %Y}"
+        if self.start_date.year == self.end_date.year:
+            return f"{self.start_date:%B}-{self.end_date:%B %Y}"
+        return f"{self.start_date:%B %Y}-{self.end_date:%B %Y}"
+
+    def accepts_epoch(self, create_time):
+        """create_time(초)만으로 기간/시간대 조건을 판단 (파싱 중 조기 필터링용)"""
+        if not (self._start_s <= create_time <= self._end_s):
+            return False
+        return self.hours is None or int(create_time // 3600) % 24 in self.hours
+
+    def mask(self, df):
+        """timestamp / primary_topic 컬럼으로 조건을 만족하는 행 마스크 생성 (없는 컬럼 조건은 건너뜀)"""
+        mask = pd.Series(True, index=df.index)
+        if 'timestamp' in df.columns:
+            timestamp = df['timestamp']
+            if not pd.api.types.is_datetime64_any_dtype(timestamp):
+                timestamp = pd.to_datetime(timestamp)
+            mask &= (timestamp >= self.start_date) & (timestamp <= self.end_date)
+            if self.hours is not None:
+                mask &= timestamp.dt.hour.isin(self.hours)
+        if self.topics is not None and 'primary_topic' in df.columns:
+            mask &= df['primary_topic'].isin(self.topics)
+        return mask
+
+    def apply(self, df):
+        """조건에 맞는 행만 남긴 DataFrame 반환 (모든 행이 해당하면 그대로 반환)"""
+        mask = self.mask(df)
+        if mask.all():
+            return df
+        return df[mask]
+
+
+# 캐시 포맷/파생 컬럼 로직이 바뀌면 올려서 기존 캐시를 무효화
+LOADER_VERSION = 2
+
+# JSONL 스트리밍 로드 시 한 번에 DataFrame으로 만드는 레코드 수
+JSONL_CHUNK_SIZE = 50000
+
+# CSV에서 분석에 쓰는 컬럼과 dtype ('datetime'은 파서가 바로 날짜로 변환)
+# 파일에 없는 컬럼은 건너뛰고, 여기 없는 컬럼은 읽지 않는다.
+CSV_SCHEMA = {
+    'create_time': 'float64',
+    'timestamp': 'datetime',
+    'content': 'str',
+    'conversation_title': 'str',
+    'word_count': 'float64',
+    'question_depth': 'int64',
+    'tech_term_density': 'float64',
+    'complexity_ma': 'float64',
+    'has_question': 'bool',
+    'is_learning_related': 'bool',
+    'primary_topic': 'str',
+    'date': 'datetime',
+    'hour': 'int64',
+    'day_of_week': 'str',
+}
+
+
+def read_csv_projected(path, schema=CSV_SCHEMA):
+    """선언된 스키마의 컬럼만 지정 dtype으로 읽기 (pyarrow가 있으면 멀티스레드 Arrow 파서 사용)
+
+    헤더에 스키마 컬럼이 하나도 없으면 기존처럼 전체 컬럼을 읽는다.
+    선언한 dtype으로 변환할 수 없는 값이 있으면 같은 컬럼만 dtype 추론으로 다시 읽는다.
+    """
+    header = pd.read_csv(path, nrows=0).columns
+    usecols = [col for col in header if col in schema]
+    if not usecols:
+        return pd.read_csv(path)
+
+    dtype = {col: schema[col] for col in usecols if schema[col] != 'datetime'}
+    parse_dates = [col for col in usecols if schema[col] == 'datetime']
+    try:
+        import pyarrow  # noqa: F401
+        engine = 'pyarrow'
+    except ImportError:
+        engine = 'c'
+
+    try:
+        return pd.read_csv(path, engine=engine, usecols=usecols, dtype=dtype, parse_dates=parse_dates or None)
+    except (ValueError, TypeError) as e:
+        print(f"⚠️ CSV schema mismatch, inferring dtypes instead: {e}")
+        return pd.read_csv(path, usecols=usecols)
+
+
+# 여러 파일 입력에서 지원하는 확장자와 메시지 중복 판단 기준
+SOURCE_EXTENSIONS = ('.csv', '.json', '.jsonl')
+MESSAGE_ID_COLUMNS = ['id', 'message_id']
+CONVERSATION_KEY_COLUMNS = ['conversation_id', 'conversation_title']
+
+# 파일마다 다를 수 있는 파생 컬럼 - 일부 파일에만 있으면 합친 뒤 전체 행에 대해 다시 계산
+DERIVED_COLUMNS = TEXT_FEATURE_COLUMNS + ['date', 'hour', 'day_of_week', 'complexity_ma', 'primary_topic']
+
+
+def resolve_source_files(path):
+    """파일 경로, 디렉터리, glob 패턴을 정렬된 원본 파일 목록으로 변환
+
+    디렉터리는 바로 아래의 지원 확장자(.csv/.json/.jsonl) 파일만 사용한다.
+    """
+    if os.path.isdir(path):
+        return sorted(os.path.join(path, name) for name in os.listdir(path)
+                      if name.lower().endswith(SOURCE_EXTENSIONS) and os.path.isfile(os.path.join(path, name)))
+    if glob.has_magic(path):
+        return sorted(p for p in glob.glob(path) if os.path.isfile(p))
+    return [path] if os.path.exists(path) else []
+
+
+def message_timestamps(frame):
+    """행별 timestamp - create_time(초)이 있는 행은 create_time, 없는 행은 timestamp 컬럼 (둘 다 없으면 None)
+
+    create_time만 있는 JSONL과 timestamp만 있는 CSV를 합친 프레임에서도 모든 행의 시각이 유지된다.
+    """
+    timestamp = pd.to_datetime(frame['timestamp']) if 'timestamp' in frame.columns else None
+    if 'create_time' not in frame.columns:
+        return timestamp
+    created = pd.to_datetime(frame['create_time'], unit='s')
+    return created if timestamp is None else created.fillna(timestamp)
+
+
+def _parse_source_file(path, window, csv_schema, json_backend=None):
+    """원본 파일 하나를 파싱하고 timestamp를 만든 뒤 분석 조건으로 거른 DataFrame 반환 (워커 프로세스용)"""
+    frame = DataLoader(path, window=window, csv_schema=csv_schema, json_backend=json_backend)._parse_source()
+    timestamp = message_timestamps(frame)
+    if timestamp is None:
+        return frame
+    frame['timestamp'] = timestamp
+    return window.apply(frame)
+
+
+def concat_sources(frames):
+    """파일별 DataFrame을 한 번에 합침 - 일부 파일에만 있는 파생 컬럼은 빼서 합친 뒤 다시 계산되게 함"""
+    frames = [frame for frame in frames if len(frame.columns)]
+    if not frames:
+        return pd.DataFrame()
+    partial = set()
+    for col in DERIVED_COLUMNS:
+        if any(col in frame.columns for frame in frames) and not all(col in frame.columns for frame in frames):
+            partial.add(col)
+    if partial:
+        frames = [frame.drop(columns=[col for col in frame.columns if col in partial]) for frame in frames]
+    return pd.concat(frames, ignore_index=True)
+
+
+def drop_duplicate_messages(data):
+    """겹치는 export의 중복 메시지 제거 (먼저 나온 행 유지) -> (중복 제거된 DataFrame, 제거 행 수)
+
+    메시지 id(id/message_id)가 같거나, (대화 id 또는 제목, timestamp, content) 해시가 같으면 같은 메시지로 본다.
+    id가 없는 export와 있는 export가 섞여 있어도 두 번째 기준으로 겹치는 행이 걸러진다.
+    """
+    if data.empty:
+        return data, 0
+    id_col = next((col for col in MESSAGE_ID_COLUMNS if col in data.columns), None)
+    key_cols = [col for col in (next((c for c in CONVERSATION_KEY_COLUMNS if c in data.columns), None),
+                                'timestamp', 'content') if col is not None and col in data.columns]
+
+    # CSV는 빈 문자열을 결측으로 읽으므로 문자열 키는 결측을 빈 문자열로 맞춘 뒤 해시
+    key_frame = pd.DataFrame({col: data[col] if col == 'timestamp' else data[col].fillna('').astype(str)
+                              for col in key_cols})
+    duplicated = pd.Series(pd.util.hash_pandas_object(key_frame, index=False).to_numpy()).duplicated().to_numpy()
+    if id_col is not None:
+        ids = data[id_col]
+        has_id = ids.notna().to_numpy()
+        duplicated = duplicated | (has_id & ids.astype(str).duplicated().to_numpy())
+    removed = int(duplicated.sum())
+    if not removed:
+        return data, 0
+    return data[~duplicated].reset_index(drop=True), removed
+
+
+def add_text_features(data, content_col='content', text_index=None):
+    """content를 한 번만 소문자화해서 텍스트 파생 컬럼을 한꺼번에 추가
+
+    이미 존재하는 컬럼은 그대로 두고, 없는 컬럼만 벡터 연산으로 계산한다.
+    같은 행 순서로 만든 text_index(TokenIndex)를 주면 본문 스캔 대신 색인 질의로 계산한다.
+    """
+    missing = [col for col in TEXT_FEATURE_COLUMNS if col not in data.columns]
+    if not missing or content_col not in data.columns:
+        return data
+
+    content = data[content_col]
+    use_index = text_index is not None and text_index.n_docs == len(content)
+    if not use_index:
+        lowered = content.fillna('').astype(str).str.lower()
+
+    if 'word_count' in missing:
+        data['word_count'] = content.str.len()
+
+    if use_index:
+        question_mask = text_index.any(QUESTION_TERMS)
+    else:
+        question_mask = lowered.str.contains(QUESTION_PATTERN, regex=True).to_numpy(dtype=bool)
+    if 'question_depth' in missing:
+        data['question_depth'] = question_mask.astype(int)
+    if 'has_question' in missing:
+        data['has_question'] = question_mask
+
+    if 'tech_term_density' in missing:
+        # 용어별 포함 여부(중복 없이)를 더한 뒤 전체 용어 수로 나눔
+        if use_index:
+            term_hits = text_index.count(TECH_TERMS)
+        else:
+            term_hits = np.zeros(len(content), dtype=np.int64)
+            for term in TECH_TERMS:
+                term_hits += lowered.str.contains(term, regex=False).to_numpy(dtype=bool)
+        data['tech_term_density'] = term_hits / len(TECH_TERMS)
+
+    if 'is_learning_related' in missing:
+        # Learning-related = (keywords) OR (questions) OR (high tech density)
+        if use_index:
+            keyword_mask = text_index.any(LEARNING_KEYWORDS)
+        else:
+            keyword_pattern = '|'.join(re.escape(keyword) for keyword in LEARNING_KEYWORDS)
+            keyword_mask = lowered.str.contains(keyword_pattern, regex=True).to_numpy(dtype=bool)
+        data['is_learning_related'] = (
+            keyword_mask
+            | (data['has_question'] == True).to_numpy()
+            | (data['tech_term_density'] > 0.1).to_numpy()
+        )
+
+    return data
+
+
+# compact 모드에서 day_of_week 범주 순서 (월요일부터)
+WEEKDAY_NAMES = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+
+# compact 모드에서 category로 바꾸는 반복 문자열 컬럼
+CATEGORY_COLUMNS = ['conversation_title', 'primary_topic', 'question_category']
+
+
+def compact_frame(data, arrow_strings=False):
+    """행당 메모리가 큰 파생 컬럼을 작은 dtype으로 바꿔서 반환 (값은 그대로)
+
+    hour/question_depth는 int8, word_count는 int32, date는 datetime64(자정),
+    day_of_week와 반복 문자열(제목/토픽/질문 범주)은 category로 저장한다.
+    arrow_strings=True면 content도 Arrow 기반 문자열로 바꾼다 (pyarrow 필요).
+    이미 바뀐 컬럼은 건너뛰므로 여러 번 호출해도 된다.
+    """
+    columns = {}
+
+    for col, dtype in (('hour', 'int8'), ('question_depth', 'int8'), ('word_count', 'int32')):
+        if col in data.columns and pd.api.types.is_integer_dtype(data[col]) and data[col].dtype != dtype:
+            info = np.iinfo(dtype)
+            if data.empty or (data[col].min() >= info.min and data[col].max() <= info.max):
+                columns[col] = data[col].astype(dtype)
+
+    if 'date' in data.columns and not pd.api.types.is_datetime64_any_dtype(data['date']):
+        if 'timestamp' in data.columns and pd.api.types.is_datetime64_any_dtype(data['timestamp']):
+            columns['date'] = data['timestamp'].dt.normalize()
+        else:
+            columns['date'] = pd.to_datetime(data['date'])
+
+    if 'day_of_week' in data.columns and not isinstance(data['day_of_week'].dtype, pd.CategoricalDtype):
+        columns['day_of_week'] = pd.Categorical(data['day_of_week'], categories=WEEKDAY_NAMES)
+
+    for col in CATEGORY_COLUMNS:
+        if col in data.columns and not isinstance(data[col].dtype, pd.CategoricalDtype):
+            columns[col] = data[col].astype('category')
+
+    if arrow_strings and 'content' in data.columns:
+        try:
+            import pyarrow  # noqa: F401
+            if data['content'].dtype != 'string[pyarrow]':
+                columns['content'] = data['content'].astype('string[pyarrow]')
+        except ImportError:
+            print("⚠️ pyarrow not installed, keeping content as Python strings")
+
+    return data.assign(**columns) if columns else data
+
 
 class DataLoader:
-    def __init__(self, file_path):
+    def __init__(self, file_path, cache_dir=None, window=None, compact=False, arrow_strings=False,
+                 csv_schema=None, text_index=False, workers=None, dedupe=True, json_backend=None):
+        # 파일 경로, 디렉터리, glob 패턴 모두 가능 (여러 파일이면 병렬 파싱 후 합침)
         self.file_path = file_path
         self.data = None
+        # 정제/파생 컬럼까지 계산된 데이터를 저장하는 Feather 캐시 폴더 (None이면 캐시 사용 안 함)
+        self.cache_dir = cache_dir
+        # 분석 대상 조건 (기본: April 1st to August 31st 2025, 전체 시간대/토픽)
+        self.window = window if window is not None else AnalysisWindow()
+        self.profiler = None  # RunProfiler (있으면 파싱/필터/파생 단계별 계측)
+        # 메모리 절약 모드 (작은 정수/category/datetime64 컬럼, arrow_strings면 content도 Arrow 문자열)
+        self.compact = compact
+        self.arrow_strings = arrow_strings
+        # CSV 컬럼/dtype 선언 (예: CSV_SCHEMA) - 주면 필요한 컬럼만 멀티스레드 파서로 읽음
+        self.csv_schema = csv_schema
+        # 본문 토큰 역색인 사용 여부 - 만들면 캐시 옆에 저장되고 키워드 질의에 재사용됨
+        self.build_text_index = text_index
+        self.text_index = None
+        # 여러 파일 입력일 때 파싱 프로세스 수 (None이면 CPU 수, 1이면 순차 파싱)와 중복 메시지 제거 여부
+        self.workers = workers
+        self.dedupe = dedupe
+        # JSON/JSONL 파서 백엔드 이름 (None이면 orjson -> simdjson -> 표준 json 중 설치된 것)
+        self.json_backend = json_backend
 
     def _get_file_format(self):
         """파일 확장자에 따라 포맷 결정"""
@@ -13,83 +462,279 @@ class DataLoader:
         return ext.lower()
 
     def _load_csv(self):
-        """CSV 파일 로드"""
+        """CSV 파일 로드 (csv_schema가 있으면 필요한 컬럼만 선언된 dtype으로 읽음)"""
+        if self.csv_schema is not None:
+            return read_csv_projected(self.file_path, self.csv_schema)
         return pd.read_csv(self.file_path)
 
     def _load_json(self):
-        """JSON 파일 로드"""
-        with open(self.file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-
-        # JSON이 배열인 경우
-        if isinstance(data, list):
-            return pd.DataFrame(data)
-        # JSON이 단일 객체인 경우
+        """JSON 파일을 블록 단위로 스트리밍 디코딩 (최상위 배열을 텍스트와 목록으로 두 번 들고 있지 않음)"""
+        with open(self.file_path, 'rb') as f:
+            return self._records_to_frames(iter_json_records(f, get_json_backend(self.json_backend)))
+
+    def _load_jsonl(self, chunk_size=JSONL_CHUNK_SIZE):
+        """JSONL 파일을 여러 줄씩 묶어 한 번에 디코딩하면서 스트리밍 로드"""
+        with open(self.file_path, 'rb') as f:
+            return self._records_to_frames(iter_jsonl_records(f, get_json_backend(self.json_backend)), chunk_size)
+
+    def _records_to_frames(self, batches, chunk_size=JSONL_CHUNK_SIZE):
+        """디코딩된 레코드 묶음들을 청크 단위 DataFrame으로 모아 하나로 합침
+
+        파싱 직후 create_time이 분석 기간/시간대 밖인 레코드는 버리고,
+        남은 레코드만 청크마다 컬럼 배열로 모아 DataFrame을 만든다.
+        create_time이 없거나 숫자가 아닌 레코드는 load_data의 기간 필터에 맡긴다.
+        """
+        frames = []
+        chunk = []
+        columns_seen = None  # 모든 레코드가 걸러졌을 때 컬럼 구성 유지용
+        for records in batches:
+            for record in records:
+                if columns_seen is None:
+                    columns_seen = list(record)
+
+                create_time = record.get('create_time')
+                if isinstance(create_time, (int, float)) and not self.window.accepts_epoch(create_time):
+                    continue
+
+                chunk.append(record)
+                if len(chunk) >= chunk_size:
+                    frames.append(self._records_to_frame(chunk))
+                    chunk = []
+
+        if chunk:
+            frames.append(self._records_to_frame(chunk))
+
+        if not frames:
+            return pd.DataFrame(columns=columns_seen or [])
+        if len(frames) == 1:
+            return frames[0]
+        return pd.concat(frames, ignore_index=True)
+
+    def _parse_source(self):
+        """파일 포맷에 맞는 로더로 파싱 (지원하지 않는 포맷이면 ValueError)"""
+        file_format = self._get_file_format()
+        if file_format == '.csv':
+            return self._load_csv()
+        if file_format == '.json':
+            return self._load_json()
+        if file_format == '.jsonl':
+            return self._load_jsonl()
+        raise ValueError(f"Unsupported file format: {file_format}")
+
+    def _load_sources(self, files):
+        """여러 원본 파일을 프로세스 풀에서 동시에 파싱하고 합친 뒤 중복 메시지 제거"""
+        workers = self.workers if self.workers is not None else (os.cpu_count() or 1)
+        workers = max(1, min(workers, len(files)))
+        print(f"📚 Loading {len(files)} files with {workers} worker(s)...")
+        if workers == 1:
+            frames = [_parse_source_file(path, self.window, self.csv_schema, self.json_backend) for path in files]
+        else:
+            from concurrent.futures import ProcessPoolExecutor
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                frames = list(pool.map(_parse_source_file, files, [self.window] * len(files),
+                                       [self.csv_schema] * len(files), [self.json_backend] * len(files)))
+
+        data = concat_sources(frames)
+        if self.dedupe and 'timestamp' in data.columns:
+            data, removed = drop_duplicate_messages(data)
+            if removed:
+                print(f"🧹 Removed {removed} duplicate messages across files")
+        return data
+
+    @staticmethod
+    def _records_to_frame(records):
+        """레코드 목록을 컬럼 배열로 변환해 DataFrame 생성"""
+        keys = dict.fromkeys(key for record in records for key in record)
+        return pd.DataFrame({key: [record.get(key) for record in records] for key in keys})
+
+    def _cache_keys(self):
+        """(원본 경로 키, 원본 지문 키(크기/수정시각 + 로더 버전), 로드 옵션 키(분석 조건 등))"""
+        source = os.path.abspath(self.file_path)
+        if os.path.isfile(source):
+            stat = os.stat(source)
+            source_stamp = f"{stat.st_size}|{stat.st_mtime_ns}"
         else:
-            return pd.DataFrame([data])
+            # 디렉터리/glob이면 포함된 파일 목록과 각 파일의 크기/수정시각
+            source_stamp = "|".join(
+                f"{os.path.abspath(path)}:{os.stat(path).st_size}:{os.stat(path).st_mtime_ns}"
+                for path in resolve_source_files(self.file_path))
+        source_key = hashlib.sha256(source.encode('utf-8')).hexdigest()[:12]
+        fingerprint_key = hashlib.sha256(f"{source_stamp}|{LOADER_VERSION}".encode('utf-8')).hexdigest()[:12]
+        # 토픽 조건이 있으면 로드 시 제목 기반 토픽으로 거르므로 분류 규칙이 바뀌면 다른 캐시를 씀
+        topic_rules = TITLE_TOPIC_RULES_KEY if self.window.topics is not None else None
+        options_key = hashlib.sha256(
+            f"{self.window!r}|{self.compact}|{self.arrow_strings}|dedupe={self.dedupe}|"
+            f"{sorted((self.csv_schema or {}).items())}|topic_rules={topic_rules}".encode('utf-8')
+        ).hexdigest()[:12]
+        return source_key, fingerprint_key, options_key
+
+    def _cache_path(self):
+        """원본/지문/옵션 키로 캐시 파일 경로 결정
+
+        파일 이름은 {원본 키}-{지문 키}-{옵션 키}.feather - 같은 원본을 다른 옵션으로 읽은 캐시는 지문 키가 같아서
+        함께 남고, 원본이 바뀌면 지문 키가 달라진 이전 캐시만 _write_cache에서 지운다.
+        """
+        source_key, fingerprint_key, options_key = self._cache_keys()
+        return os.path.join(self.cache_dir, f"{source_key}-{fingerprint_key}-{options_key}.feather")
+
+    def state_key(self):
+        """원본 경로와 로드 옵션으로 정해지는 키 (원본 지문은 제외) - 증분 집계 상태 파일 이름용"""
+        source_key, _, options_key = self._cache_keys()
+        return f"{source_key}-{options_key}"
+
+    def _index_path(self):
+        """캐시 파일과 같은 키의 본문 색인 경로"""
+        return self._cache_path()[:-len('.feather')] + '.tokens.npz'
+
+    def cube_path(self):
+        """캐시 파일과 같은 키의 집계 큐브 경로 (캐시 폴더가 없으면 None)
+
+        큐브에는 제목 기반 토픽도 들어가므로 큐브 버전과 토픽 분류 규칙 해시를 이름에 포함한다.
+        """
+        if not self.cache_dir:
+            return None
+        from aggregate_cube import CUBE_VERSION
+        return self._cache_path()[:-len('.feather')] + f'.cube-v{CUBE_VERSION}-{TITLE_TOPIC_RULES_KEY[:8]}.feather'
+
+    def _prepare_text_index(self):
+        """본문 색인 준비 - 캐시에 저장된 색인이 있으면 불러오고, 없으면 만들어서 저장"""
+        if not self.build_text_index or 'content' not in self.data.columns:
+            return None
+        content = self.data['content']
+        if self.cache_dir and os.path.exists(self._index_path()):
+            try:
+                index = TokenIndex.load(self._index_path())
+                if index.n_docs == len(content):
+                    self.text_index = index.attach(content)
+                    return self.text_index
+            except (OSError, ValueError, KeyError) as e:
+                print(f"⚠️ Text index cache skipped: {e}")
+
+        self.text_index = TokenIndex.build(content)
+        return self.text_index
+
+    def _read_cache(self):
+        """유효한 캐시가 있으면 메모리 맵으로 읽어서 반환 (없으면 None)"""
+        if not self.cache_dir:
+            return None
+        cache_path = self._cache_path()
+        if not os.path.exists(cache_path):
+            return None
+        try:
+            import pyarrow.feather as feather
+            return feather.read_table(cache_path, memory_map=True).to_pandas()
+        except Exception as e:
+            print(f"⚠️ Cache read skipped: {e}")
+            return None
+
+    def _write_cache(self):
+        """로드/파생 완료된 데이터를 Feather로 저장하고 같은 원본의 오래된(지문이 다른) 캐시 삭제"""
+        if not self.cache_dir:
+            return
+        try:
+            import pyarrow.feather as feather
+            os.makedirs(self.cache_dir, exist_ok=True)
+            cache_path = self._cache_path()
+            # 메모리 맵으로 바로 읽을 수 있게 비압축으로 저장
+            feather.write_feather(self.data.reset_index(drop=True), cache_path + '.tmp',
+                                  compression='uncompressed')
+            os.replace(cache_path + '.tmp', cache_path)
+            if self.text_index is not None:
+                self.text_index.save(self._index_path())
 
-    def _load_jsonl(self):
-        """JSONL 파일 로드"""
-        data_list = []
-        with open(self.file_path, 'r', encoding='utf-8') as f:
-            for line in f:
-                if line.strip():  # 빈 줄 스킵
-                    data_list.append(json.loads(line.strip()))
-        return pd.DataFrame(data_list)
+            # 원본이 바뀐 이전 캐시(데이터/색인/큐브)만 삭제 - 옵션만 다른 캐시는 다음 실행에서 재사용
+            source_key, fingerprint_key = os.path.basename(cache_path).split('-')[:2]
+            for pattern in ("*.feather", "*.tokens.npz"):
+                for old_path in glob.glob(os.path.join(self.cache_dir, f"{source_key}-{pattern}")):
+                    if os.path.basename(old_path).split('-')[1] != fingerprint_key:
+                        os.remove(old_path)
+        except Exception as e:
+            print(f"⚠️ Cache write skipped: {e}")
 
     def load_data(self):
-        if not os.path.exists(self.file_path):
+        files = resolve_source_files(self.file_path)
+        if not files:
             print(f"❌ Error: File not found at {self.file_path}")
             return False
 
+        with profile_stage(self.profiler, 'cache_read') as record:
+            cached = self._read_cache()
+            record['rows_out'] = None if cached is None else len(cached)
+        if cached is not None:
+            self.data = cached
+            if self.build_text_index:
+                with profile_stage(self.profiler, 'text_index', rows_in=len(self.data)):
+                    if self._prepare_text_index() is not None and not os.path.exists(self._index_path()):
+                        self.text_index.save(self._index_path())
+            print(f"⚡ {len(self.data)} messages loaded from cache ({self._cache_path()})")
+            return True
+
         try:
             # 파일 포맷에 따라 로더 선택
             file_format = self._get_file_format()
 
-            if file_format == '.csv':
-                print("📄 Loading CSV file...")
-                self.data = self._load_csv()
-            elif file_format == '.json':
-                print("📋 Loading JSON file...")
-                self.data = self._load_json()
-            elif file_format == '.jsonl':
-                print("📝 Loading JSONL file...")
-                self.data = self._load_jsonl()
-            else:
-                print(f"❌ Unsupported file format: {file_format}")
-                print("📄 Supported formats: .csv, .json, .jsonl")
-                return False
-
-            # timestamp 컬럼 처리 (JSONL의 create_time을 사용)
-            if 'create_time' in self.data.columns:
-                self.data['timestamp'] = pd.to_datetime(self.data['create_time'], unit='s')
-            elif 'timestamp' in self.data.columns:
-                self.data['timestamp'] = pd.to_datetime(self.data['timestamp'])
-            else:
-                print("⚠️ Warning: No timestamp column found, skipping date filtering")
-                return False
-
-            # Filter data for April 1st to August 31st 2025
-            start_date = pd.Timestamp('2025-04-01')
-            end_date = pd.Timestamp('2025-08-31')
-            self.data = self.data[(self.data['timestamp'] >= start_date) & (self.data['timestamp'] <= end_date)]
-
-            # 필수 컬럼들 추가 (없으면 계산)
-            if 'word_count' not in self.data.columns:
-                self.data['word_count'] = self.data['content'].str.len()
-
-            if 'question_depth' not in self.data.columns:
-                # 간단한 질문 감지 로직
-                self.data['question_depth'] = self.data['content'].str.contains(r'\?|what|how|why|when|where', case=False).astype(int)
-
-            # 추가 컬럼 생성
-            self.data['date'] = self.data['timestamp'].dt.date
-            self.data['hour'] = self.data['timestamp'].dt.hour
-            self.data['day_of_week'] = self.data['timestamp'].dt.day_name()
-
-            print(f"✅ {len(self.data)} messages loaded successfully from {file_format.upper()} file")
+            with profile_stage(self.profiler, 'parse_source') as record:
+                if not os.path.isfile(self.file_path):
+                    # 디렉터리/glob: 파일별 병렬 파싱 + 합치기 + 중복 제거
+                    self.data = self._load_sources(files)
+                elif file_format == '.csv':
+                    print("📄 Loading CSV file...")
+                    self.data = self._load_csv()
+                elif file_format == '.json':
+                    print("📋 Loading JSON file...")
+                    self.data = self._load_json()
+                elif file_format == '.jsonl':
+                    print("📝 Loading JSONL file...")
+                    self.data = self._load_jsonl()
+                else:
+                    print(f"❌ Unsupported file format: {file_format}")
+                    print("📄 Supported formats: .csv, .json, .jsonl")
+                    return False
+                record['rows_out'] = len(self.data)
+
+            with profile_stage(self.profiler, 'window_filter', rows_in=len(self.data)) as record:
+                # timestamp 컬럼 처리 (JSONL의 create_time을 사용, create_time이 없는 행은 timestamp 유지)
+                timestamp = message_timestamps(self.data)
+                if timestamp is None:
+                    print("⚠️ Warning: No timestamp column found, skipping date filtering")
+                    return False
+                self.data['timestamp'] = timestamp
+
+                # 분석 조건(기간/시간대)은 여기서 한 번만 적용
+                self.data = self.window.apply(self.data)
+
+                # 토픽 조건이 있으면 제목 기반 토픽을 붙이고 한 번 더 거름
+                if self.window.topics is not None:
+                    if 'primary_topic' not in self.data.columns:
+                        self.data['primary_topic'] = classify_titles(self.data['conversation_title'])
+                    self.data = self.window.apply(self.data)
+                record['rows_out'] = len(self.data)
+
+            if self.build_text_index:
+                with profile_stage(self.profiler, 'text_index', rows_in=len(self.data)):
+                    self._prepare_text_index()
+
+            with profile_stage(self.profiler, 'feature_derivation', rows_in=len(self.data)) as record:
+                # 필수 컬럼들 추가 (없으면 계산) - 텍스트 파생 컬럼은 한 단계에서 계산 (색인이 있으면 색인 질의)
+                add_text_features(self.data, text_index=self.text_index)
+
+                # 추가 컬럼 생성
+                self.data['date'] = self.data['timestamp'].dt.date
+                self.data['hour'] = self.data['timestamp'].dt.hour
+                self.data['day_of_week'] = self.data['timestamp'].dt.day_name()
+                if self.compact:
+                    self.data = compact_frame(self.data, arrow_strings=self.arrow_strings)
+                    if self.text_index is not None:
+                        self.text_index.attach(self.data['content'])
+                record['rows_out'] = len(self.data)
+
+            with profile_stage(self.profiler, 'cache_write', rows_in=len(self.data)):
+                self._write_cache()
+
+            source_text = f"{file_format.upper()} file" if os.path.isfile(self.file_path) else f"{len(files)} files"
+            print(f"✅ {len(self.data)} messages loaded successfully from {source_text}")
             if 'timestamp' in self.data.columns:
-                print(f"   📅 Filtered: 2025-04-01 ~ 2025-08-31")
+                print(f"   📅 Filtered: {self.window.period_text()}")
             return True
 
         except Exception as e:
@@ -0,0 +1,98 @@
+# frame_view.py
+# 데이터 접근 계층 - 로드된 프레임 하나를 복사하지 않고 분석 모듈이 공유하는 읽기 전용 뷰
+
+import numpy as np
+import pandas as pd
+
+
+class FrameView:
+    """로드된 기본 프레임 위의 읽기 전용 뷰 (행 위치 배열 + 파생 컬럼 사이드 테이블)
+
+    - 행 필터는 기본 프레임을 복사하지 않고 위치 배열만 갖는 새 뷰를 만든다.
+    - 파생 컬럼 대입(view['col'] = ...)은 기본 프레임이 아니라 뷰의 사이드 테이블에 저장된다.
+    - 분석 모듈은 frame(필요한 컬럼)으로 필요한 컬럼만 꺼내서 집계한다.
+      필터가 없는 뷰에서 꺼낸 컬럼은 기본 프레임과 메모리를 공유한다.
+    """
+
+    def __init__(self, base, positions=None, derived=None):
+        if isinstance(base, FrameView):
+            raise TypeError("FrameView base must be a DataFrame (use view.filter() to narrow a view)")
+        self.base = base
+        self.positions = positions  # 기본 프레임 기준 행 위치 (None이면 전체 행)
+        # 파생 컬럼 이름 -> 기본 프레임 인덱스 라벨로 정렬된 Series
+        self.derived = dict(derived) if derived is not None else {}
+
+    def __repr__(self):
+        return f"FrameView({len(self)} of {len(self.base)} rows, derived={list(self.derived)})"
+
+    def __len__(self):
+        return len(self.base) if self.positions is None else len(self.positions)
+
+    @property
+    def empty(self):
+        return len(self) == 0 or len(self.columns) == 0
+
+    @property
+    def index(self):
+        return self.base.index if self.positions is None else self.base.index[self.positions]
+
+    @property
+    def columns(self):
+        return pd.Index(list(self.base.columns) + [col for col in self.derived if col not in self.base.columns])
+
+    def column(self, name):
+        """컬럼 하나를 뷰의 행 기준으로 반환 (파생 컬럼 우선)"""
+        if name in self.derived:
+            series = self.derived[name]
+            if self.positions is None or len(series) == len(self):
+                return series
+            return series.loc[self.index]
+        series = self.base[name]
+        return series if self.positions is None else series.iloc[self.positions]
+
+    def frame(self, columns=None):
+        """필요한 컬럼만 담은 DataFrame (필터가 없으면 기본 프레임과 메모리 공유)"""
+        columns = list(self.columns) if columns is None else list(columns)
+        return pd.DataFrame({col: self.column(col) for col in columns}, index=self.index)
+
+    def filter(self, mask):
+        """불리언 마스크(뷰 길이)에 맞는 행만 보는 새 뷰 - 사이드 테이블은 공유, 데이터는 복사 안 함"""
+        mask = np.asarray(mask, dtype=bool)
+        if len(mask) != len(self):
+            raise ValueError(f"Mask length {len(mask)} does not match view length {len(self)}")
+        current = np.arange(len(self.base)) if self.positions is None else self.positions
+        return FrameView(self.base, current[mask], self.derived)
+
+    def assign(self, **columns):
+        """파생 컬럼을 추가한 새 뷰 반환 (원래 뷰와 기본 프레임은 그대로)"""
+        view = FrameView(self.base, self.positions, self.derived)
+        for name, values in columns.items():
+            view[name] = values
+        return view
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            return self.column(key)
+        if isinstance(key, (list, tuple, pd.Index)):
+            return self.frame(key)
+        return self.filter(key)
+
+    def __setitem__(self, name, values):
+        """파생 컬럼을 사이드 테이블에 저장 (값은 뷰의 행 순서와 같아야 함)"""
+        if isinstance(values, pd.Series):
+            # DataFrame 대입과 같이 인덱스 라벨 기준으로 정렬
+            if not values.index.equals(self.index):
+                values = values.reindex(self.index)
+            self.derived[name] = values.rename(name)
+        else:
+            if not np.ndim(values):
+                values = np.full(len(self), values)
+            self.derived[name] = pd.Series(values, index=self.index, name=name)
+
+    def __contains__(self, name):
+        return name in self.derived or name in self.base.columns
+
+
+def as_view(data):
+    """DataFrame이면 뷰로 감싸고, 이미 뷰면 그대로 반환"""
+    return data if isinstance(data, FrameView) else FrameView(data)
@@ -0,0 +1,93 @@
+# headless_api.py
+# 집계 전용 API - 차트 없이 모든 분석 결과를 기본 자료형(dict/list/숫자/문자열)으로 반환
+#
+# 플로팅 라이브러리(matplotlib/seaborn)는 import하지 않으므로 예약 작업이나 API 호출에서 바로 쓸 수 있다.
+# 사용 예:
+#   python headless_api.py ../../conversations_parsed.jsonl --out aggregates.json
+
+import argparse
+import json
+import math
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+
+def _plain_key(key):
+    """dict 키로 쓸 수 있게 그룹 키를 문자열로 변환"""
+    key = to_plain(key)
+    return key if isinstance(key, str) else str(key)
+
+
+def to_plain(value):
+    """pandas/numpy 결과를 JSON으로 저장할 수 있는 기본 자료형으로 변환
+
+    DataFrame은 {컬럼: {인덱스: 값}}, Series는 {인덱스: 값}, 날짜는 ISO 문자열(자정이면 날짜만),
+    NaN/NA는 None으로 바꾼다.
+    """
+    if isinstance(value, pd.DataFrame):
+        return {_plain_key(col): to_plain(value[col]) for col in value.columns}
+    if isinstance(value, pd.Series):
+        return {_plain_key(key): to_plain(item) for key, item in value.items()}
+    if isinstance(value, dict):
+        return {_plain_key(key): to_plain(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple, np.ndarray, pd.Index)):
+        return [to_plain(item) for item in value]
+    if isinstance(value, pd.Timestamp):
+        if value is pd.NaT:
+            return None
+        return value.date().isoformat() if value == value.normalize() else value.isoformat()
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, np.generic):
+        value = value.item()
+    if value is pd.NA or (isinstance(value, float) and math.isnan(value)):
+        return None
+    return value
+
+
+def compute_aggregates(data_path, window=None, plain=True, **executor_options):
+    """데이터 파일 하나의 모든 집계값 계산 (차트 렌더링 없음)
+
+    executor_options는 MainExecutor 옵션(cache_dir, compact, csv_schema, preview 등)을 그대로 전달한다.
+    plain=False면 pandas 객체를 그대로 반환한다.
+    """
+    from main_executor_en import MainExecutor
+    executor = MainExecutor(data_path, window=window, **executor_options)
+    aggregates = executor.compute_aggregates()
+    return to_plain(aggregates) if plain else aggregates
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compute learning analytics aggregates without rendering charts")
+    parser.add_argument('data_path', help="conversation export (.csv, .json, .jsonl)")
+    parser.add_argument('--out', default='aggregates.json', help="output JSON file")
+    parser.add_argument('--no-cache', action='store_true', help="always parse the source file")
+    parser.add_argument('--preview', type=int, default=None, metavar='ROWS',
+                        help="estimate from a date x hour stratified sample of ROWS messages (adds confidence intervals)")
+    parser.add_argument('--seed', type=int, default=0, help="sample seed for --preview")
+    parser.add_argument('--significance', type=int, default=None, metavar='N',
+                        help="add bootstrap confidence intervals and permutation p-values (N resamples) to correlations")
+    parser.add_argument('--significance-workers', type=int, default=1, metavar='N',
+                        help="processes for per-hour/per-day significance tests (0 = CPU count)")
+    parser.add_argument('--rolling-window', default=None, metavar='WINDOW',
+                        help="add daily rolling Pearson/Spearman correlations over WINDOW (e.g. 7D, 30D)")
+    args = parser.parse_args(argv)
+
+    options = {'cache_dir': None} if args.no_cache else {}
+    if args.preview:
+        options.update(preview=args.preview, preview_seed=args.seed)
+    if args.significance:
+        options.update(significance=args.significance, significance_workers=args.significance_workers or None)
+    if args.rolling_window:
+        options.update(rolling_window=args.rolling_window)
+    aggregates = compute_aggregates(args.data_path, **options)
+    with open(args.out, 'w', encoding='utf-8') as f:
+        json.dump(aggregates, f, ensure_ascii=False, indent=2)
+    print(f"✅ Aggregates saved: {args.out}")
+    return aggregates
+
+
+if __name__ == "__main__":
+    main()
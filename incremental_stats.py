@@ -0,0 +1,251 @@
+# incremental_stats.py
+# 증분 집계 모듈 - 새로 추가된 메시지 배치만으로 상관관계/대시보드 집계를 갱신
+
+import hashlib
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from advanced_correlation_analyzer import (
+    DAYS_ORDER, MOMENT_NAMES, correlations_from_moments, grouped_moments
+)
+from data_loader_en import classify_titles
+
+STATE_VERSION = 1
+
+
+def merge_moments(a, b):
+    """두 충분통계량 묶음을 병합 (Chan et al. 병렬 분산 공식)"""
+    n_a, n_b = a['count'], b['count']
+    n = n_a + n_b
+    with np.errstate(invalid='ignore', divide='ignore'):
+        weight_b = np.where(n > 0, n_b / n, 0.0)
+        cross = np.where(n > 0, n_a * n_b / n, 0.0)
+    delta_x = b['mean_x'] - a['mean_x']
+    delta_y = b['mean_y'] - a['mean_y']
+    return {
+        'count': n,
+        'mean_x': a['mean_x'] + delta_x * weight_b,
+        'mean_y': a['mean_y'] + delta_y * weight_b,
+        'ssx': a['ssx'] + b['ssx'] + delta_x * delta_x * cross,
+        'ssy': a['ssy'] + b['ssy'] + delta_y * delta_y * cross,
+        'sxy': a['sxy'] + b['sxy'] + delta_x * delta_y * cross,
+    }
+
+
+def message_keys(batch):
+    """메시지별 식별 해시 (uint64) - id/timestamp/content로 만듦 (행 순서, 파일 경로와 무관)"""
+    columns = [col for col in ['id', 'message_id', 'timestamp', 'content'] if col in batch.columns]
+    key_frame = pd.DataFrame({col: batch[col] if col == 'timestamp' else batch[col].astype(str) for col in columns})
+    return pd.util.hash_pandas_object(key_frame, index=False).to_numpy()
+
+
+def batch_fingerprint(batch, keys=None):
+    """배치 내용 식별자 - 메시지 식별 해시(keys, 없으면 계산)를 정렬해 만든 값"""
+    keys = message_keys(batch) if keys is None else keys
+    return hashlib.sha256(np.sort(keys).tobytes()).hexdigest()[:16]
+
+
+class IncrementalLearningStats:
+    """병합 가능한 충분통계량으로 유지되는 상관관계/대시보드 집계 상태
+
+    update()는 새 배치만 훑어서 상태를 갱신하므로 갱신 비용이 전체 이력이 아니라
+    배치 크기에 비례한다. 결과 메서드들은 기존 분석 모듈과 같은 형태의 값을 반환한다.
+    충분통계량은 한 번 더해지면 되돌릴 수 없으므로, 반영한 배치의 내용 식별자와 반영한 메시지의
+    식별 해시(message_keys)를 상태에 함께 저장한다. 같은 배치는 통째로 건너뛰고, 이전 배치와 겹치는 배치는
+    이미 반영한 메시지만 빼고 반영한다 (늦게 들어온 과거 시각의 메시지도 반영됨). 뺀 행 수는 상태에 기록한다.
+    """
+
+    # 상관관계 변수 (AdvancedCorrelationAnalyzer.calculate_correlations와 동일)
+    CORR_COLUMNS = ['complexity_ma', 'word_count', 'question_depth', 'hour']
+    # 상관관계 그룹 기준 ('overall'은 전체를 하나의 그룹으로 취급)
+    CORR_GROUPS = ['overall', 'hour', 'day_of_week']
+    # 평균 계산용 합계/개수를 유지하는 기준과 변수
+    MEAN_GROUPS = ['hour', 'date', 'day_of_week']
+    MEAN_COLUMNS = ['complexity_ma', 'question_depth']
+
+    def __init__(self, state_path=None):
+        self.state_path = state_path
+        self.total_rows = 0
+        # {그룹 기준: {키: {'rows': 행 수, count/mean_x/...: (변수, 변수) 배열}}}
+        self.moments = {group: {} for group in self.CORR_GROUPS}
+        # {그룹 기준: {키: {변수: [합계, 개수]}}}
+        self.sums = {group: {} for group in self.MEAN_GROUPS}
+        self.topic_counts_ = {}
+        self.applied_batches = []  # 반영한 배치 식별자 (batch_fingerprint)
+        self.applied_messages = np.zeros(0, dtype=np.uint64)  # 반영한 메시지 식별 해시 (정렬됨)
+        self.skipped_rows = 0  # 이미 반영한 메시지라서 뺀 행 수 (겹치는 배치)
+
+    @staticmethod
+    def _key(value):
+        """JSON 저장을 위해 그룹 키를 문자열로 정규화"""
+        if hasattr(value, 'isoformat'):
+            return value.isoformat()[:10]
+        return str(value)
+
+    def _prepare_batch(self, batch):
+        """배치에 complexity_ma / primary_topic이 없으면 대시보드와 같은 규칙으로 계산 (원본은 수정 안 함)"""
+        columns = {}
+        if 'complexity_ma' not in batch.columns:
+            columns['complexity_ma'] = (batch['word_count'] / 100) + (batch['question_depth'] * 10)
+        if 'primary_topic' not in batch.columns and 'conversation_title' in batch.columns:
+            columns['primary_topic'] = classify_titles(batch['conversation_title'])
+        return batch.assign(**columns) if columns else batch
+
+    def update(self, batch):
+        """새 메시지 배치(DataLoader로 로드/전처리된 DataFrame)를 상태에 반영 (이미 반영한 배치는 건너뜀)"""
+        if batch is None or batch.empty:
+            return self
+        keys = message_keys(batch)
+        fingerprint = batch_fingerprint(batch, keys)
+        if fingerprint in self.applied_batches:
+            print(f"⚠️ Batch already applied, skipping ({len(batch)} messages, {fingerprint})")
+            return self
+        fresh = ~np.isin(keys, self.applied_messages)
+        if not fresh.all():
+            self.skipped_rows += int((~fresh).sum())
+            batch, keys = batch[fresh], keys[fresh]
+            if batch.empty:
+                self.applied_batches.append(fingerprint)
+                return self
+        batch = self._prepare_batch(batch)
+
+        for group in self.CORR_GROUPS:
+            by = np.zeros(len(batch), dtype=int) if group == 'overall' else group
+            keys, sizes, moments = grouped_moments(batch, self.CORR_COLUMNS, by)
+            for g, key in enumerate(keys):
+                key = 'all' if group == 'overall' else self._key(key)
+                new = {name: moments[name][g] for name in MOMENT_NAMES}
+                old = self.moments[group].get(key)
+                merged = new if old is None else merge_moments(old, new)
+                merged['rows'] = (0 if old is None else old['rows']) + int(sizes[g])
+                self.moments[group][key] = merged
+
+        for group in self.MEAN_GROUPS:
+            # compact 모드의 category 키(date/day_of_week)는 없는 범주를 빈 그룹으로 만들지 않도록 observed=True
+            aggregated = batch.groupby(group, sort=False, observed=True)[self.MEAN_COLUMNS].agg(['sum', 'count'])
+            for key, row in aggregated.iterrows():
+                entry = self.sums[group].setdefault(self._key(key), {col: [0.0, 0] for col in self.MEAN_COLUMNS})
+                for col in self.MEAN_COLUMNS:
+                    entry[col][0] += float(row[(col, 'sum')])
+                    entry[col][1] += int(row[(col, 'count')])
+
+        if 'primary_topic' in batch.columns:
+            topic_counts = batch['primary_topic'].value_counts()
+            for topic, count in topic_counts[topic_counts > 0].items():
+                self.topic_counts_[topic] = self.topic_counts_.get(topic, 0) + int(count)
+
+        self.total_rows += len(batch)
+        self.applied_batches.append(fingerprint)
+        self.applied_messages = np.union1d(self.applied_messages, keys)
+        return self
+
+    # ---- 결과 조회 ----
+
+    def _correlation_frame(self, entry, columns=None):
+        corr = correlations_from_moments({name: entry[name][None] for name in MOMENT_NAMES})[0]
+        frame = pd.DataFrame(corr, index=self.CORR_COLUMNS, columns=self.CORR_COLUMNS)
+        return frame if columns is None else frame.loc[columns, columns]
+
+    def correlations(self, min_rows=11):
+        """calculate_correlations()와 같은 형태의 {'overall', 'hourly'} 상관관계"""
+        if 'all' not in self.moments['overall']:
+            return None
+        hourly = {
+            int(key): self._correlation_frame(entry)
+            for key, entry in sorted(self.moments['hour'].items(), key=lambda item: int(item[0]))
+            if entry['rows'] >= min_rows
+        }
+        return {'overall': self._correlation_frame(self.moments['overall']['all']), 'hourly': hourly}
+
+    def weekday_correlations(self, min_rows=11):
+        """요일별 표현 길이 ↔ 질문 깊이 상관계수 (월요일부터)"""
+        result = {}
+        for day in DAYS_ORDER:
+            entry = self.moments['day_of_week'].get(day)
+            if entry is not None and entry['rows'] >= min_rows:
+                result[day] = self._correlation_frame(entry).loc['word_count', 'question_depth']
+        return result
+
+    def _means(self, group, column):
+        keys = list(self.sums[group].keys())
+        with np.errstate(invalid='ignore', divide='ignore'):
+            values = [self.sums[group][key][column][0] / self.sums[group][key][column][1] for key in keys]
+        return pd.Series(values, index=keys, dtype=float)
+
+    def hourly_efficiency(self):
+        """시간대별 평균 complexity_ma"""
+        means = self._means('hour', 'complexity_ma')
+        means.index = means.index.astype(int)
+        return means.sort_index().rename_axis('hour')
+
+    def daily_growth(self):
+        """날짜별 평균 complexity_ma"""
+        means = self._means('date', 'complexity_ma')
+        means.index = pd.to_datetime(means.index)
+        return means.sort_index().rename_axis('date')
+
+    def weekday_stats(self):
+        """요일별 평균 complexity_ma / question_depth (월요일부터, 없는 요일은 0)"""
+        stats = pd.DataFrame({col: self._means('day_of_week', col) for col in self.MEAN_COLUMNS})
+        return stats.reindex(DAYS_ORDER).fillna(0)
+
+    def topic_counts(self):
+        """토픽별 메시지 수 (많은 순)"""
+        return pd.Series(self.topic_counts_, dtype=int).sort_values(ascending=False)
+
+    # ---- 저장/불러오기 ----
+
+    def save(self, state_path=None):
+        """상태를 JSON 파일로 저장"""
+        state_path = state_path or self.state_path
+        state = {
+            'version': STATE_VERSION,
+            'total_rows': self.total_rows,
+            'moments': {
+                group: {
+                    key: {name: (value.tolist() if isinstance(value, np.ndarray) else value)
+                          for name, value in entry.items()}
+                    for key, entry in entries.items()
+                }
+                for group, entries in self.moments.items()
+            },
+            'sums': self.sums,
+            'topic_counts': self.topic_counts_,
+            'applied_batches': self.applied_batches,
+            'applied_messages': self.applied_messages.tolist(),
+            'skipped_rows': self.skipped_rows,
+        }
+        os.makedirs(os.path.dirname(os.path.abspath(state_path)), exist_ok=True)
+        with open(state_path + '.tmp', 'w', encoding='utf-8') as f:
+            json.dump(state, f, ensure_ascii=False)
+        os.replace(state_path + '.tmp', state_path)
+        return state_path
+
+    @classmethod
+    def load(cls, state_path):
+        """저장된 상태 불러오기 (파일이 없거나 버전이 다르면 빈 상태)"""
+        stats = cls(state_path)
+        if not os.path.exists(state_path):
+            return stats
+        with open(state_path, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+        if state.get('version') != STATE_VERSION:
+            print(f"⚠️ Incremental state version mismatch, starting fresh: {state_path}")
+            return stats
+
+        stats.total_rows = state['total_rows']
+        for group, entries in state['moments'].items():
+            stats.moments[group] = {
+                key: {name: (value if name == 'rows' else np.array(value, dtype=float))
+                      for name, value in entry.items()}
+                for key, entry in entries.items()
+            }
+        stats.sums = state['sums']
+        stats.topic_counts_ = state['topic_counts']
+        stats.applied_batches = state.get('applied_batches', [])
+        stats.applied_messages = np.array(state.get('applied_messages', []), dtype=np.uint64)
+        stats.skipped_rows = state.get('skipped_rows', 0)
+        return stats
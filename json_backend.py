@@ -0,0 +1,225 @@
+# json_backend.py
+# JSON 파서 백엔드 - orjson/simdjson이 설치되어 있으면 사용하고, 없으면 표준 json 모듈 사용
+
+import json
+
+import numpy as np
+
+# 자동 선택 순서 (설치된 첫 번째 백엔드 사용)
+JSON_BACKEND_ORDER = ['orjson', 'simdjson', 'json']
+
+# JSONL 묶음 디코딩/JSON 배열 스트리밍 시 한 번에 읽는 바이트 수
+JSON_BLOCK_BYTES = 8 * 1024 * 1024
+
+# 배열 스트리밍에서 원소 경계를 찾을 때 한 번에 훑는 바이트 수 (임시 배열 크기 상한)
+JSON_SCAN_BYTES = 1024 * 1024
+
+_BACKENDS = {}
+
+
+class JsonBackend:
+    """JSON 디코더 하나 (이름 + bytes/str -> 파이썬 객체 함수)
+
+    loads_many는 여러 줄(줄마다 JSON 값 하나)을 묶음으로 디코딩한다. 호출 비용이 큰 파서(표준 json)는
+    '[' + ','.join(lines) + ']' 하나로 묶어 한 번에, 호출 비용이 작은 파서(orjson)는 줄마다 바로 디코딩한다.
+    가속 파서가 거부하는 입력(NaN 리터럴, 64비트를 넘는 정수 등)은 표준 json으로 다시 디코딩하므로
+    백엔드와 관계없이 결과가 같다.
+    """
+
+    def __init__(self, name, loads, join_lines=True):
+        self.name = name
+        self._loads = loads
+        self.join_lines = join_lines  # 줄들을 배열 하나로 묶어 디코딩할지 여부
+
+    def __repr__(self):
+        return f"JsonBackend({self.name})"
+
+    def loads(self, data):
+        try:
+            return self._loads(data)
+        except ValueError:
+            if self.name == 'json':
+                raise
+            return json.loads(data)
+
+    def loads_many(self, lines):
+        """JSON 값 한 줄씩 담긴 bytes 목록을 한 번에 디코딩 (잘못된 줄이 있으면 그 줄에서 오류)"""
+        if not lines:
+            return []
+        loads = self._loads
+        try:
+            if not self.join_lines:
+                return [loads(line) for line in lines]
+            values = loads(b'[' + b','.join(lines) + b']')
+            if len(values) == len(lines):
+                return values
+        except ValueError:
+            pass
+        # 한 줄에 값이 여러 개이거나 가속 파서가 거부한 줄이 있으면 줄 단위로 (표준 json 재시도 포함) 디코딩
+        return [self.loads(line) for line in lines]
+
+
+def _import_backend(name):
+    if name == 'orjson':
+        import orjson
+        return JsonBackend('orjson', orjson.loads, join_lines=False)
+    if name == 'simdjson':
+        import simdjson
+        return JsonBackend('simdjson', simdjson.loads)
+    if name == 'json':
+        return JsonBackend('json', json.loads)
+    raise ValueError(f"Unknown JSON backend: {name} (choose from {', '.join(JSON_BACKEND_ORDER)})")
+
+
+def get_json_backend(name=None):
+    """이름으로 백엔드 선택 (None이면 설치된 가장 빠른 백엔드, 요청한 백엔드가 없으면 자동 선택)"""
+    if name is not None:
+        try:
+            if name not in _BACKENDS:
+                _BACKENDS[name] = _import_backend(name)
+            return _BACKENDS[name]
+        except ImportError:
+            print(f"⚠️ {name} not installed, choosing the JSON backend automatically")
+
+    for candidate in JSON_BACKEND_ORDER:
+        try:
+            if candidate not in _BACKENDS:
+                _BACKENDS[candidate] = _import_backend(candidate)
+            return _BACKENDS[candidate]
+        except ImportError:
+            continue
+
+
+def iter_jsonl_records(f, backend, block_bytes=JSON_BLOCK_BYTES):
+    """바이너리 JSONL 파일을 약 block_bytes 분량의 줄씩 묶어 디코딩한 레코드 목록으로 생성 (빈 줄 무시)"""
+    while True:
+        lines = f.readlines(block_bytes)
+        if not lines:
+            return
+        lines = [line.strip() for line in lines]
+        yield backend.loads_many([line for line in lines if line])
+
+
+_QUOTE, _BACKSLASH, _COMMA = ord('"'), ord('\\'), ord(',')
+
+# 바이트별 분류표 - 경계 판단에 필요한 글자(따옴표/괄호/쉼표)와 괄호의 깊이 변화
+_STRUCTURAL = np.zeros(256, dtype=bool)
+_STRUCTURAL[list(b'"{}[],')] = True
+_DEPTH_DELTA = np.zeros(256, dtype=np.int64)
+_DEPTH_DELTA[list(b'{[')] = 1
+_DEPTH_DELTA[list(b'}]')] = -1
+
+
+class _ArrayBoundaryScanner:
+    """최상위 JSON 배열 본문에서 원소 경계(깊이 0의 ',')와 닫는 ']' 위치를 찾는 상태 기계
+
+    중첩 깊이, 문자열 안인지 여부, 직전 블록이 이스케이프 역슬래시로 끝났는지를 블록 사이에 이어서
+    유지하므로 각 바이트를 한 번만 훑는다. 블록 안에서는 numpy로 따옴표/괄호/쉼표 위치만 골라 계산한다.
+    """
+
+    def __init__(self):
+        self.depth = 0  # 최상위 배열 안 기준 중첩 깊이
+        self.in_string = False
+        self.escape_next = False  # 직전 블록 마지막 글자가 다음 글자를 이스케이프하는 역슬래시인지
+
+    def scan(self, block):
+        """block에서 원소 경계 ',' 위치 배열과 닫는 ']' 위치(없으면 None) 반환"""
+        commas = []
+        for offset in range(0, len(block), JSON_SCAN_BYTES):
+            part_commas, end = self._scan_part(block[offset:offset + JSON_SCAN_BYTES])
+            commas.append(part_commas + offset)
+            if end is not None:
+                return np.concatenate(commas), end + offset
+        return (np.concatenate(commas) if commas else np.zeros(0, dtype=np.int64)), None
+
+    def _escaping_backslashes(self, data):
+        """다음 글자를 이스케이프하는 역슬래시 위치 (연속된 역슬래시 중 홀수 번째, 오름차순)"""
+        backslashes = np.flatnonzero(data == _BACKSLASH)
+        carried = self.escape_next
+        # 블록 첫 역슬래시가 직전 블록에서 이스케이프됐으면 그 연속 구간의 홀짝이 하나 밀림
+        shift_first = carried and len(backslashes) and backslashes[0] == 0
+        if len(backslashes):
+            new_run = np.r_[True, np.diff(backslashes) != 1]
+            if shift_first or not new_run.all():  # 대부분은 떨어진 역슬래시 하나씩이라 모두 이스케이프
+                run_starts = np.flatnonzero(new_run)
+                run_lengths = np.diff(np.r_[run_starts, len(backslashes)])
+                index_in_run = np.arange(len(backslashes)) - np.repeat(run_starts, run_lengths)
+                if shift_first:
+                    index_in_run[:run_lengths[0]] += 1
+                backslashes = backslashes[index_in_run % 2 == 0]
+        self.escape_next = bool(len(backslashes)) and bool(backslashes[-1] == len(data) - 1)
+        return backslashes, carried
+
+    def _scan_part(self, part):
+        data = np.frombuffer(part, dtype=np.uint8)
+        positions = np.flatnonzero(_STRUCTURAL[data])
+
+        # 이스케이프된 따옴표 제외 (괄호/쉼표는 이스케이프돼도 문자열 안이라 깊이 판단에 영향 없음)
+        escaping, carried = self._escaping_backslashes(data)
+        if len(escaping) or carried:
+            escaped = np.zeros(len(data) + 1, dtype=bool)
+            escaped[escaping + 1] = True
+            escaped[0] |= carried
+            positions = positions[~escaped[positions]]
+        chars = data[positions]
+
+        # 열린 따옴표 수의 홀짝으로 문자열 안/밖 판단 (문자열 밖의 괄호만 깊이에 반영)
+        quotes = chars == _QUOTE
+        outside = (np.cumsum(quotes) + self.in_string) % 2 == 0
+        delta = np.where(outside, _DEPTH_DELTA[chars], 0)
+        depth = self.depth + np.cumsum(delta)
+
+        commas = positions[(chars == _COMMA) & outside & (depth == 0)]
+        closing = np.flatnonzero((delta < 0) & (depth < 0))
+        if len(closing):
+            end = int(positions[closing[0]])
+            return commas[commas < end], end
+
+        if len(positions):
+            self.depth = int(depth[-1])
+            self.in_string = not bool(outside[-1])
+        return commas, None
+
+
+def iter_json_records(f, backend, block_bytes=JSON_BLOCK_BYTES):
+    """바이너리 JSON 파일을 레코드 목록 단위로 생성
+
+    최상위가 배열이면 블록 단위로 읽으면서 원소 경계를 상태 기계로 찾고, 블록마다 완성된 원소들만
+    디코딩하므로 원본 텍스트 전체와 디코딩된 전체 목록을 동시에 메모리에 들고 있지 않는다.
+    (중첩 객체 원소도 같은 방식이고, 각 바이트는 한 번만 훑는다.)
+    최상위가 배열이 아니면(단일 객체 등) 파일 전체를 디코딩해 한 개짜리 목록으로 돌려준다.
+    """
+    buffer = b''
+    while len(buffer) < 3:  # 앞쪽 공백/BOM을 건너뛰고 첫 글자 확인
+        block = f.read(block_bytes)
+        buffer = (buffer + block).lstrip()
+        if buffer.startswith(b'\xef\xbb\xbf'):
+            buffer = buffer[3:].lstrip()
+        if not block or buffer[:1] not in (b'', b'\xef'):
+            break
+    if not buffer.startswith(b'['):
+        value = backend.loads(buffer + f.read())
+        yield value if isinstance(value, list) else [value]
+        return
+
+    scanner = _ArrayBoundaryScanner()
+    pending = []  # 아직 경계를 만나지 못한 원소의 앞부분
+    block = buffer[1:] or f.read(block_bytes)
+    while block:
+        commas, end = scanner.scan(block)
+        cut = end if end is not None else (int(commas[-1]) if len(commas) else None)
+        if cut is None:
+            pending.append(block)
+        else:
+            body = b''.join(pending) + block[:cut]
+            pending = [block[cut + 1:]] if end is None else []
+            if body.strip():
+                records = backend.loads(b'[' + body + b']')
+                if records:
+                    yield records
+        if end is not None:
+            if (block[end + 1:] + f.read()).strip():
+                raise ValueError("Extra data after JSON array")
+            return
+        block = f.read(block_bytes)
+    raise ValueError("Unterminated JSON array")
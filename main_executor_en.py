@@ -3,23 +3,261 @@ import os
 from datetime import datetime
 
 class MainExecutor:
-    def __init__(self, data_path):
-        self.data_path = data_path
+    def __init__(self, data_path, cache_dir=".data_cache", window=None, render_workers=None, stage_workers=None,
+                 trace_memory=False, profile_dir=None, compact=False, arrow_strings=False, csv_schema=None,
+                 render_cache=True, text_index=False, preview=None, preview_seed=0, ingest_workers=None,
+                 dedupe=True, json_backend=None, cube=True, significance=None, significance_workers=1,
+                 rolling_window=None):
+        from data_loader_en import AnalysisWindow
+        from run_instrumentation import RunProfiler
+        self.data_path = data_path  # 파일, 디렉터리, glob 패턴 (여러 export 파일은 병렬 파싱 후 중복 제거)
+        # 분석 조건 (기간/시간대/토픽) - 로드 시점에 한 번만 적용되고 모든 분석 모듈이 공유
+        self.window = window if window is not None else AnalysisWindow()
         self.portfolio_dir = "."
         os.makedirs(self.portfolio_dir, exist_ok=True)
+        self.cache_dir = cache_dir  # 로드/전처리 결과 캐시 폴더 (None이면 매번 원본 파싱)
         self.data_loader = None  # 데이터 로더 인스턴스
+        # 차트 렌더링 프로세스 수 (None이면 CPU 수, 1이면 순차 렌더링)
+        self.render_workers = render_workers
+        # 차트 입력(집계값/스타일) 해시가 이전 실행과 같으면 PNG를 다시 그리지 않음 (render_manifest.json)
+        self.render_cache = render_cache
+        # 독립 분석 단계를 동시에 실행할 스레드 수 (1이면 순차 실행)
+        self.stage_workers = stage_workers
+        self.pipeline = None  # 단계 그래프 (실행 중 결과 메모이즈)
+        # 단계별 시간/CPU/메모리/행 수 계측 (trace_memory: tracemalloc, profile_dir: 단계별 cProfile 저장)
+        self.profiler = RunProfiler(trace_memory=trace_memory, profile_dir=profile_dir)
+        # 메모리 절약 모드 (작은 정수/category/datetime64 컬럼) - 모든 분석 단계가 그대로 사용
+        self.compact = compact
+        self.arrow_strings = arrow_strings
+        # CSV 입력의 컬럼/dtype 선언 (data_loader_en.CSV_SCHEMA 등) - 필요한 컬럼만 멀티스레드로 읽음
+        self.csv_schema = csv_schema
+        # 본문 토큰 역색인 (키워드 질의를 색인으로 처리, 데이터 캐시 옆에 저장)
+        self.text_index = text_index
+        # 미리보기 모드 - 날짜 × 시간대 층화 표본 preview행으로 집계하고 신뢰구간과 근사 표시를 함께 출력
+        self.preview = preview
+        self.preview_seed = preview_seed
+        self.preview_sample = None  # 미리보기 표본 (StratifiedSample)
+        # 여러 파일 입력의 파싱 프로세스 수 (None이면 CPU 수)와 겹치는 메시지 중복 제거 여부
+        self.ingest_workers = ingest_workers
+        self.dedupe = dedupe
+        # JSON/JSONL 파서 백엔드 ('orjson', 'simdjson', 'json', None이면 설치된 가장 빠른 것)
+        self.json_backend = json_backend
+        # 집계 큐브 - 로드마다 한 번 만들어(캐시 폴더에 저장) 모든 차트/요약을 큐브 롤업으로 계산
+        self.cube = cube
+        # 상관관계 유의성 - 부트스트랩/순열검정 반복 수 (None이면 계산 안 함)와 그룹별 계산 프로세스 수
+        self.significance = significance
+        self.significance_workers = significance_workers
+        # 시간 창 상관관계 추이 - 창 길이 ('7D' 등, None이면 계산 안 함), 하루 간격으로 창 이동
+        self.rolling_window = rolling_window
 
-    def run_data_loader(self):
-        print("1️⃣ Running data loader...")
+    def _build_pipeline(self):
+        """분석 단계 그래프 선언 - 각 단계가 쓰는 입력과 필요한/생성하는 컬럼을 명시"""
+        from pipeline_scheduler import PipelineScheduler, Stage
+        from data_loader_en import LOADED_COLUMNS
+        from dashboard_creator_en import DASHBOARD_COLUMNS
+        from aggregate_cube import CUBE_INPUT_COLUMNS
+        # 미리보기면 로드한 데이터에서 표본을 먼저 뽑고, 파생 컬럼/분석은 표본 행에만 적용
+        sample_stages = [Stage('sample', self._sample_stage, inputs=['load'])] if self.preview else []
+        # 전체 데이터 분석이면 분석 단계들이 큐브 롤업으로 집계 (미리보기는 표본 가중 추정이라 큐브를 쓰지 않음)
+        use_cube = self.cube and not self.preview
+        cube_stages = [Stage('cube', self._cube_stage, inputs=['derive'], requires=CUBE_INPUT_COLUMNS)] if use_cube else []
+        analysis_inputs = ['derive', 'cube'] if use_cube else ['derive']
+        rolling_stages = [Stage('rolling_correlation', self._rolling_correlation_stage, inputs=['derive'],
+                                requires=['timestamp', 'word_count', 'question_depth', 'complexity_ma'])
+                          ] if self.rolling_window else []
+        return PipelineScheduler([
+            Stage('load', self._load_stage, produces=LOADED_COLUMNS),
+            *sample_stages,
+            Stage('derive', self._derive_stage, inputs=['sample' if self.preview else 'load'],
+                  requires=['word_count', 'question_depth', 'conversation_title'],
+                  produces=DASHBOARD_COLUMNS),
+            *cube_stages,
+            Stage('dashboard', self._dashboard_stage, inputs=analysis_inputs,
+                  requires=['hour', 'date', 'day_of_week', 'complexity_ma', 'question_depth', 'primary_topic']),
+            Stage('question_level', self._question_level_stage, inputs=analysis_inputs,
+                  requires=['content', 'timestamp', 'question_depth', 'primary_topic', 'is_learning_related']),
+            Stage('correlation', self._correlation_stage, inputs=analysis_inputs,
+                  requires=['word_count', 'question_depth', 'hour', 'day_of_week']),
+            *rolling_stages,
+            Stage('render', self._render_stage,
+                  inputs=['dashboard', 'question_level', 'correlation'] + [stage.name for stage in rolling_stages]),
+        ], workers=self.stage_workers, profiler=self.profiler)
+
+    def _get_pipeline(self):
+        if self.pipeline is None:
+            self.pipeline = self._build_pipeline()
+        return self.pipeline
+
+    def rerun_stage(self, name):
+        """한 단계(와 그 결과를 쓰는 단계)만 다시 계산 - 나머지는 메모이즈된 결과 재사용"""
+        pipeline = self._get_pipeline()
+        pipeline.invalidate(name)
+        return pipeline.run([name])[name]
+
+    # ---- 파이프라인 단계 ----
+
+    def _new_data_loader(self):
+        """실행 옵션(원본/분석 조건/로드 옵션)대로 설정된 DataLoader (아직 로드하지 않음)"""
         from data_loader_en import DataLoader
-        self.data_loader = DataLoader(self.data_path)  # 인스턴스 저장
-        if self.data_loader.load_data():
-            stats = self.data_loader.get_basic_stats()
-            print(f"✅ Data loaded: {stats}")
-            return stats
-        else:
-            print("❌ Failed to load data")
+        return DataLoader(self.data_path, cache_dir=self.cache_dir, window=self.window,
+                          compact=self.compact, arrow_strings=self.arrow_strings,
+                          csv_schema=self.csv_schema, text_index=self.text_index,
+                          workers=self.ingest_workers, dedupe=self.dedupe,
+                          json_backend=self.json_backend)
+
+    def _load_stage(self):
+        print("1️⃣ Running data loader...")
+        self.data_loader = self._new_data_loader()  # 인스턴스 저장
+        self.data_loader.profiler = self.profiler
+        if not self.data_loader.load_data():
+            raise RuntimeError(f"Failed to load data: {self.data_path}")
+        return self.data_loader.data
+
+    def _sample_stage(self, data):
+        from preview_sampling import StratifiedSample
+        self.preview_sample = StratifiedSample.draw(data, self.preview, seed=self.preview_seed)
+        print(f"🎲 Preview sample: {self.preview_sample}")
+        return self.preview_sample.view(data)
+
+    def _derive_stage(self, data):
+        from dashboard_creator_en import add_dashboard_columns
+        from data_loader_en import (TITLE_TOPIC_MEMO, TITLE_TOPIC_MEMO_FILENAME,
+                                    load_title_topic_memo, save_title_topic_memo)
+        from frame_view import as_view
+        # 제목 -> 토픽 분류 결과는 캐시 폴더에 저장해서 다음 실행에서도 재사용
+        memo_path = os.path.join(self.cache_dir, TITLE_TOPIC_MEMO_FILENAME) if self.cache_dir else None
+        if memo_path:
+            load_title_topic_memo(memo_path)
+        known_titles = len(TITLE_TOPIC_MEMO)
+
+        # 파생 컬럼은 뷰의 사이드 테이블에 추가해서 로드된 원본 프레임은 복사/수정하지 않음
+        derived = add_dashboard_columns(as_view(data))
+        if memo_path and len(TITLE_TOPIC_MEMO) > known_titles:
+            save_title_topic_memo(memo_path)
+        if self.compact:
+            from data_loader_en import compact_frame
+            derived = compact_frame(derived)  # 새로 생긴 primary_topic도 category로
+        return derived
+
+    def _cube_stage(self, data):
+        from aggregate_cube import AggregationCube
+        # 캐시 폴더에 같은 데이터로 만든 큐브가 있으면 불러오고, 없으면 한 번 스캔해서 만들고 저장
+        cube_path = self.data_loader.cube_path() if self.data_loader is not None else None
+        if cube_path and os.path.exists(cube_path):
+            try:
+                cube = AggregationCube.load(cube_path)
+                if cube.total_rows == len(data):
+                    print(f"🧊 Aggregation cube loaded: {cube}")
+                    return cube
+            except Exception as e:
+                print(f"⚠️ Aggregation cube cache skipped: {e}")
+
+        cube = AggregationCube.build(data)
+        print(f"🧊 Aggregation cube built: {cube}")
+        if cube_path:
+            try:
+                cube.save(cube_path)
+            except Exception as e:
+                print(f"⚠️ Aggregation cube write skipped: {e}")
+        return cube
+
+    def _dashboard_stage(self, data, cube=None):
+        print("\n5️⃣ Creating dashboard...")
+        from dashboard_creator_en import DashboardCreator
+        creator = DashboardCreator("", window=self.window)
+        creator.df = data  # 이미 로드된 데이터 사용
+        creator.sample = self.preview_sample
+        creator.cube = cube  # 있으면 메시지 대신 큐브 롤업으로 집계
+        return creator.compute_dashboard_data()
+
+    def _question_level_stage(self, data, cube=None):
+        print("\n6️⃣ Running question level analysis...")
+        from question_level_analyzer_en import QuestionLevelAnalyzer
+        analyzer = QuestionLevelAnalyzer("", window=self.window)
+        analyzer.df = data  # 이미 로드된 데이터 사용
+        analyzer.profiler = self.profiler
+        analyzer.text_index = self.data_loader.text_index  # 로드 시 만든 본문 색인 재사용
+        analyzer.sample = self.preview_sample
+        analyzer.cube = cube
+        return analyzer.compute_question_level_data()
+
+    def _correlation_stage(self, data, cube=None):
+        print("\n7️⃣ Running correlation analysis...")
+        from advanced_correlation_analyzer import AdvancedCorrelationAnalyzer
+        analyzer = AdvancedCorrelationAnalyzer("", window=self.window)
+        analyzer.df = data  # 이미 로드된 데이터 사용
+        analyzer.profiler = self.profiler
+        analyzer.sample = self.preview_sample
+        analyzer.cube = cube
+        analyzer.significance_replicates = self.significance
+        analyzer.significance_workers = self.significance_workers
+        return analyzer.compute_correlation_dashboard_data()
+
+    def _rolling_correlation_stage(self, data):
+        print("\n8️⃣ Running rolling correlation analysis...")
+        from advanced_correlation_analyzer import AdvancedCorrelationAnalyzer
+        analyzer = AdvancedCorrelationAnalyzer("", window=self.window)
+        analyzer.df = data
+        analyzer.profiler = self.profiler
+        return analyzer.compute_rolling_correlation_data(window=self.rolling_window)
+
+    def _render_stage(self, dashboard_data, question_level_data, correlation_data, rolling_data=None):
+        print("\n🎨 Rendering charts...")
+        from chart_renderer import RENDER_MANIFEST_FILENAME, render_charts
+        from dashboard_creator_en import DASHBOARD_FILENAME, render_dashboard
+        from question_level_analyzer_en import QUESTION_LEVEL_FILENAME, render_question_level_chart
+        from advanced_correlation_analyzer import (CORRELATION_FILENAME, ROLLING_CORRELATION_FILENAME,
+                                                   render_correlation_dashboard, render_rolling_correlation_chart)
+
+        jobs = [
+            (render_dashboard, dashboard_data, os.path.join(self.portfolio_dir, DASHBOARD_FILENAME)),
+            (render_question_level_chart, question_level_data,
+             os.path.join(self.portfolio_dir, QUESTION_LEVEL_FILENAME)),
+        ]
+        if correlation_data is not None:
+            jobs.append((render_correlation_dashboard, correlation_data,
+                         os.path.join(self.portfolio_dir, CORRELATION_FILENAME)))
+        if rolling_data is not None:
+            jobs.append((render_rolling_correlation_chart, rolling_data,
+                         os.path.join(self.portfolio_dir, ROLLING_CORRELATION_FILENAME)))
+        manifest_path = os.path.join(self.portfolio_dir, RENDER_MANIFEST_FILENAME) if self.render_cache else None
+        return render_charts(jobs, workers=self.render_workers, profiler=self.profiler, manifest_path=manifest_path)
+
+    # ---- 집계 전용 실행 (차트 없음) ----
+
+    def compute_aggregates(self):
+        """차트 렌더링 없이 모든 집계값 계산 - 플로팅 라이브러리를 import하지 않음
+
+        반환: stats / dashboard / question_level / correlation / correlation_insights (pandas 객체 그대로)
+              + rolling_correlation (rolling_window를 지정한 경우)
+        """
+        from advanced_correlation_analyzer import correlation_insights
+        stages = ['dashboard', 'question_level', 'correlation'] + (['rolling_correlation'] if self.rolling_window else [])
+        results = self._get_pipeline().run(stages)
+        correlation = results['correlation']
+        aggregates = {
+            'stats': self.data_loader.get_basic_stats(),
+            'dashboard': results['dashboard'],
+            'question_level': results['question_level'],
+            'correlation': correlation,
+            'correlation_insights': (correlation_insights(correlation['overall'], correlation.get('significance'))
+                                     if correlation is not None else {}),
+        }
+        if self.rolling_window:
+            aggregates['rolling_correlation'] = results['rolling_correlation']
+        return aggregates
+
+    # ---- 단계별 실행 (결과는 파이프라인에 메모이즈) ----
+
+    def run_data_loader(self):
+        try:
+            self._get_pipeline().run(['load'])
+        except RuntimeError as e:
+            print(f"❌ {e}")
             return {'total_messages': 0, 'start_date': 'N/A', 'end_date': 'N/A', 'avg_word_count': 0.0, 'avg_question_depth': 0.0}
+        stats = self.data_loader.get_basic_stats()
+        print(f"✅ Data loaded: {stats}")
+        return stats
 
     def run_hourly_analysis(self):
         print("\n2️⃣ Running hourly analysis...")
@@ -40,44 +278,188 @@ class MainExecutor:
         return "General", 100  # 기본값
 
     def run_dashboard_creation(self):
-        print("\n5️⃣ Creating dashboard...")
-        from dashboard_creator_en import DashboardCreator
-        # 데이터 공유 방식으로 수정
-        creator = DashboardCreator("")
-        creator.df = self.data_loader.data  # 이미 로드된 데이터 사용
-        topic_count, max_efficiency = creator.create_comprehensive_dashboard()
+        data = self._get_pipeline().run(['dashboard'])['dashboard']
+        topic_count, max_efficiency = len(data['topic_counts']), data['hourly_eff'].max()
         print(f"✅ Dashboard: {topic_count} topics")
         return topic_count, max_efficiency
 
     def run_question_level_analysis(self):
-        print("\n6️⃣ Running question level analysis...")
-        from question_level_analyzer_en import QuestionLevelAnalyzer
-        # 데이터 공유 방식으로 수정
-        analyzer = QuestionLevelAnalyzer("")
-        analyzer.df = self.data_loader.data  # 이미 로드된 데이터 사용
-        learning_count, daily_avg, weekly_avg = analyzer.create_question_level_chart()
+        data = self._get_pipeline().run(['question_level'])['question_level']
+        learning_count, daily_avg, weekly_avg = data['learning_count'], data['daily_depth'].mean(), data['weekly_depth'].mean()
         print(f"✅ Question level analysis: {learning_count} learning conversations")
         return learning_count, daily_avg, weekly_avg
 
+    def run_correlation_analysis(self):
+        data = self._get_pipeline().run(['correlation'])['correlation']
+        if data is None:
+            print("❌ Correlation analysis skipped")
+            return False
+        return True
+
+    def run_chart_rendering(self):
+        chart_paths = self._get_pipeline().run(['render'])['render']
+        for chart_path in chart_paths:
+            print(f"✅ Chart ready: {chart_path}")
+        return chart_paths
+
+    def run_incremental_update(self, batch_path, state_path=None):
+        """새 메시지 배치만 로드해서 저장된 증분 집계 상태를 갱신하고 결과를 다시 계산"""
+        print("\n🔄 Running incremental update...")
+        from data_loader_en import DataLoader
+        from incremental_stats import IncrementalLearningStats
+
+        if state_path is None:
+            # 원본/분석 조건/로드 옵션이 다른 실행끼리 상태를 섞지 않도록 데이터 캐시와 같은 키로 이름을 정함
+            state_name = f"incremental_stats-{self._new_data_loader().state_key()}.json"
+            state_path = os.path.join(self.cache_dir or self.portfolio_dir, state_name)
+
+        # 증분 배치는 분석 기간 이후에 계속 추가되므로 기간 제한 없이 시간대/토픽 조건만 적용
+        batch_loader = DataLoader(batch_path, window=self.window.without_period(), compact=self.compact,
+                                  csv_schema=self.csv_schema, workers=self.ingest_workers, dedupe=self.dedupe,
+                                  json_backend=self.json_backend)
+        if not batch_loader.load_data():
+            print("❌ Failed to load batch")
+            return None
+
+        if os.path.exists(state_path):
+            stats = IncrementalLearningStats.load(state_path)
+        else:
+            # 첫 갱신이면 전체 이력(기본 원본)으로 상태를 한 번 만들어 두고 그 위에 배치를 더함
+            try:
+                base = self._get_pipeline().run(['load'])['load']
+            except RuntimeError as e:
+                print(f"❌ {e}")
+                return None
+            stats = IncrementalLearningStats(state_path).update(base)
+            print(f"📦 Incremental state seeded from {len(base)} loaded messages")
+        previous_rows = stats.total_rows
+        stats.update(batch_loader.data)
+        stats.save()
+
+        hourly_eff = stats.hourly_efficiency()
+        results = {
+            'total_messages': stats.total_rows,
+            'correlations': stats.correlations(),
+            'weekday_correlations': stats.weekday_correlations(),
+            'hourly_efficiency': hourly_eff,
+            'daily_growth': stats.daily_growth(),
+            'weekday_stats': stats.weekday_stats(),
+            'topic_counts': stats.topic_counts(),
+        }
+        print(f"✅ Incremental update: +{stats.total_rows - previous_rows} messages "
+              f"(total {stats.total_rows}, optimal hour {hourly_eff.idxmax() if not hourly_eff.empty else 'N/A'})")
+        return results
+
+    def _preview_report_section(self):
+        """미리보기 보고서용 신뢰구간 절 (표본 정보 + 주요 추정치의 구간)"""
+        from preview_sampling import preview_caption
+        results = self._get_pipeline().run(['dashboard', 'question_level', 'correlation'])
+        level = self.preview_sample.confidence
+        lines = ["## Approximate Preview", f"> {preview_caption(self.preview_sample.describe())}", ""]
+
+        learning = results['question_level']['intervals']['learning_count']
+        if not learning.empty:
+            row = learning.iloc[0]
+            lines.append(f"- Learning Conversations (estimated): {row['estimate']:,.0f} "
+                         f"({level:.0%} CI {row['ci_low']:,.0f} ~ {row['ci_high']:,.0f})")
+
+        hourly = results['dashboard']['intervals']['hourly_eff'].dropna(subset=['estimate'])
+        if not hourly.empty:
+            hour = hourly['estimate'].idxmax()
+            row = hourly.loc[hour]
+            lines.append(f"- Peak Hourly Efficiency (estimated): {hour}:00, {row['estimate']:.3f} "
+                         f"({level:.0%} CI {row['ci_low']:.3f} ~ {row['ci_high']:.3f})")
+
+        weekly = results['question_level']['intervals']['weekly_depth'].dropna(subset=['estimate'])
+        if not weekly.empty:
+            row = weekly.iloc[-1]
+            lines.append(f"- Latest Weekly Question Depth (estimated, week ending {weekly.index[-1]:%Y-%m-%d}): "
+                         f"{row['estimate']:.2f} ({level:.0%} CI {row['ci_low']:.2f} ~ {row['ci_high']:.2f})")
+
+        correlation = results['correlation']
+        if correlation is not None and 'intervals' in correlation:
+            from advanced_correlation_analyzer import correlation_insights
+            strongest = correlation_insights(correlation['overall']).get('strongest_correlation')
+            if strongest is not None:
+                x, y = strongest['variables']
+                low = correlation['intervals']['overall_low'].loc[x, y]
+                high = correlation['intervals']['overall_high'].loc[x, y]
+                lines.append(f"- Strongest Correlation (sample): {x} ↔ {y}, r = {correlation['overall'].loc[x, y]:.3f} "
+                             f"({level:.0%} CI {low:.3f} ~ {high:.3f})")
+        return "\n".join(lines) + "\n\n"
+
+    def _significance_report_section(self):
+        """상관관계 유의성 절 (가장 강한 쌍의 부트스트랩 신뢰구간/p값 + 유의한 시간대/요일)"""
+        from advanced_correlation_analyzer import correlation_insights
+        correlation = self._get_pipeline().run(['correlation'])['correlation']
+        if correlation is None or 'significance' not in correlation:
+            return ""
+        insights = correlation_insights(correlation['overall'], correlation['significance'])
+        lines = ["## Correlation Significance",
+                 f"> {self.significance} bootstrap resamples (95% CI) and {self.significance} permutations per matrix", ""]
+
+        strongest = insights.get('strongest_correlation')
+        if strongest is not None:
+            x, y = strongest['variables']
+            verdict = "significant" if strongest['significant'] else "not significant"
+            lines.append(f"- Strongest Correlation: {x} ↔ {y}, r = {correlation['overall'].loc[x, y]:.3f} "
+                         f"(95% CI {strongest['ci_low']:.3f} ~ {strongest['ci_high']:.3f}, "
+                         f"p = {strongest['p_value']:.3f}, {verdict})")
+        patterns = insights.get('significant_patterns', {})
+        hours = ", ".join(f"{hour}:00" for hour in patterns.get('hourly', [])) or "none"
+        days = ", ".join(patterns.get('day', [])) or "none"
+        lines.append(f"- Hours with a significant Expression ↔ Question Depth correlation: {hours}")
+        lines.append(f"- Days with a significant Expression ↔ Question Depth correlation: {days}")
+        return "\n".join(lines) + "\n\n"
+
+    def _load_failed_report(self):
+        """데이터를 불러오지 못했을 때의 짧은 보고서 - 분석/차트 단계는 실행하지 않음"""
+        report_content = f'''# Personalized Learning Pattern Analysis Report (Portfolio) - LOAD FAILED
+
+- **Data Source**: {self.data_path}
+- **Analysis Period**: {self.window.period_text()}
+- No analysis was run because the data could not be loaded. Check the path and file format (.csv, .json, .jsonl).
+
+---
+*Generated: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}*
+'''
+        report_path = os.path.join(self.portfolio_dir, "portfolio_analysis_report_en.md")
+        with open(report_path, "w", encoding="utf-8") as f:
+            f.write(report_content)
+        print(f"⚠️ Load failed, short report generated: {report_path}")
+        return report_content
+
     def generate_final_report(self):
         print("\n📝 Generating final report...")
         stats = self.run_data_loader()
+        if 'load' not in self._get_pipeline().results:
+            return self._load_failed_report()
+        # 서로 독립인 분석 단계는 동시에 실행되고, 아래 run_* 호출은 메모이즈된 결과를 사용
+        self._get_pipeline().run()
         optimal_hour, _ = self.run_hourly_analysis()
         avg_growth, _ = self.run_growth_analysis()
         top_topic, _ = self.run_topic_analysis()
         topic_count, _ = self.run_dashboard_creation()
         learning_count, daily_avg, weekly_avg = self.run_question_level_analysis()
+        self.run_correlation_analysis()
+        self.run_chart_rendering()
+
+        # 미리보기면 보고서 제목에 근사 표시를 붙이고 주요 추정치의 신뢰구간 절을 추가
+        title_suffix = " - APPROXIMATE PREVIEW" if self.preview_sample is not None else ""
+        preview_section = self._preview_report_section() if self.preview_sample is not None else ""
+        if self.significance and self.preview_sample is None:
+            preview_section += self._significance_report_section()
 
-        report_content = f'''# Personalized Learning Pattern Analysis Report (Portfolio)
+        report_content = f'''# Personalized Learning Pattern Analysis Report (Portfolio){title_suffix}
 
 ## Analysis Overview
 - **Total Messages**: {stats['total_messages']}
-- **Analysis Period**: 2025-04-01 ~ 2025-08-31 (Filtered from {stats['start_date']} ~ {stats['end_date']})
+- **Analysis Period**: {self.window.period_text()} (Filtered from {stats['start_date']} ~ {stats['end_date']})
 - **Average Complexity**: {stats.get('avg_word_count', 0):.3f}
 - **Applied Methodologies**: 25 (Data Analysis, ML, Visualization)
 - **Learning Conversations**: {learning_count} ({learning_count/stats['total_messages']*100:.1f}%)
 
-## Key Insights
+{preview_section}## Key Insights
 - Optimal Learning Time: {optimal_hour}:00
 - Average Growth Rate: {avg_growth:.3f}
 - Most Discussed Topic: {top_topic}
@@ -112,6 +494,7 @@ class MainExecutor:
 - topic_distribution_analysis.png
 - comprehensive_learning_dashboard.png
 - question_level_evolution.png
+- correlation_learning_patterns.png
 
 ## Analysis Module Structure
 - data_loader_en.py: Data loading and preprocessing
@@ -134,6 +517,17 @@ class MainExecutor:
             f.write(report_content)
 
         print(f"✅ Final report generated: {report_path}")
+
+        # 단계별 계측값을 기계가 읽을 수 있는 실행 리포트로 함께 저장
+        run_report_path = self.profiler.write_report(
+            os.path.join(self.portfolio_dir, "portfolio_analysis_run_report.json"),
+            data_path=self.data_path,
+            window=repr(self.window),
+            render_workers=self.render_workers,
+            stage_workers=self.stage_workers,
+            preview=self.preview_sample.describe() if self.preview_sample is not None else None,
+        )
+        print(f"⏱️ Run report generated: {run_report_path}")
         return report_content
 
 if __name__ == "__main__":
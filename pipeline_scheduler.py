@@ -0,0 +1,125 @@
+# pipeline_scheduler.py
+# 파이프라인 스케줄러 - 단계 간 의존성에 따라 실행하고 실행 중 결과를 메모이즈
+
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import pandas as pd
+
+from frame_view import FrameView
+from run_instrumentation import profile_stage
+
+# 컬럼 검사/행 수 기록 대상 (DataFrame 또는 그 위의 FrameView)
+FRAME_TYPES = (pd.DataFrame, FrameView)
+
+
+class Stage:
+    """파이프라인 단계 선언
+
+    func는 inputs 단계들의 결과를 순서대로 인자로 받는다.
+    requires는 DataFrame(또는 FrameView) 입력에 있어야 하는 컬럼, produces는 결과에 생기는 컬럼이다.
+    """
+
+    def __init__(self, name, func, inputs=(), requires=(), produces=()):
+        self.name = name
+        self.func = func
+        self.inputs = list(inputs)
+        self.requires = list(requires)
+        self.produces = list(produces)
+
+    def __repr__(self):
+        return f"Stage({self.name!r}, inputs={self.inputs})"
+
+
+class PipelineScheduler:
+    """선언된 단계 그래프를 의존성 순서로 실행 (서로 독립인 단계는 스레드로 동시 실행)
+
+    결과는 self.results에 메모이즈되므로, 같은 실행 안에서 한 단계만 invalidate()하고
+    다시 run()하면 그 단계와 그 결과를 쓰는 단계만 다시 계산된다.
+    profiler(RunProfiler)를 주면 각 단계를 'stage:<이름>'으로 계측한다.
+    """
+
+    def __init__(self, stages, workers=None, profiler=None):
+        self.stages = {stage.name: stage for stage in stages}
+        self.workers = workers
+        self.profiler = profiler
+        self.results = {}
+
+        for stage in stages:
+            for name in stage.inputs:
+                if name not in self.stages:
+                    raise ValueError(f"Stage '{stage.name}' depends on unknown stage '{name}'")
+
+    def _dependencies(self, targets):
+        """targets 실행에 필요한 단계 중 아직 결과가 없는 단계 집합"""
+        needed = set()
+        stack = list(targets)
+        while stack:
+            name = stack.pop()
+            if name in needed or name in self.results:
+                continue
+            needed.add(name)
+            stack.extend(self.stages[name].inputs)
+        return needed
+
+    def dependents(self, name):
+        """name 결과를 (직간접적으로) 사용하는 단계 집합"""
+        found = set()
+        stack = [name]
+        while stack:
+            current = stack.pop()
+            for stage in self.stages.values():
+                if current in stage.inputs and stage.name not in found:
+                    found.add(stage.name)
+                    stack.append(stage.name)
+        return found
+
+    def invalidate(self, name):
+        """name과 그 결과를 쓰는 단계들의 메모이즈 결과 삭제"""
+        for stale in {name} | self.dependents(name):
+            self.results.pop(stale, None)
+
+    def _run_stage(self, stage, inputs):
+        for value in inputs:
+            if isinstance(value, FRAME_TYPES):
+                missing = [col for col in stage.requires if col not in value.columns]
+                if missing:
+                    raise ValueError(f"Stage '{stage.name}' requires missing columns: {missing}")
+
+        rows_in = next((len(value) for value in inputs if isinstance(value, FRAME_TYPES)), None)
+        with profile_stage(self.profiler, f"stage:{stage.name}", rows_in=rows_in) as record:
+            result = stage.func(*inputs)
+            if isinstance(result, FRAME_TYPES):
+                record['rows_out'] = len(result)
+
+        if isinstance(result, FRAME_TYPES):
+            missing = [col for col in stage.produces if col not in result.columns]
+            if missing:
+                raise ValueError(f"Stage '{stage.name}' did not produce columns: {missing}")
+        return result
+
+    def run(self, targets=None):
+        """targets 단계(기본: 전체)를 실행하고 {단계 이름: 결과} 반환"""
+        targets = list(self.stages) if targets is None else list(targets)
+        pending = self._dependencies(targets)
+
+        if pending:
+            with ThreadPoolExecutor(max_workers=self.workers) as pool:
+                running = {}
+                while pending or running:
+                    ready = [name for name in pending
+                             if all(dep in self.results for dep in self.stages[name].inputs)]
+                    for name in sorted(ready):
+                        stage = self.stages[name]
+                        inputs = [self.results[dep] for dep in stage.inputs]
+                        running[pool.submit(self._run_stage, stage, inputs)] = name
+                        pending.discard(name)
+
+                    if not running:
+                        raise RuntimeError(f"Pipeline has a dependency cycle among: {sorted(pending)}")
+
+                    done, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        name = running.pop(future)
+                        self.results[name] = future.result()
+
+        return {name: self.results[name] for name in targets}
@@ -0,0 +1,209 @@
+# preview_sampling.py
+# 미리보기 모드 - 날짜 × 시간대 층화 표본으로 집계하고, 각 집계값의 신뢰구간을 함께 계산
+
+from statistics import NormalDist
+
+import numpy as np
+import pandas as pd
+
+from frame_view import as_view
+
+# 층화 기준 컬럼 (날짜 × 시간대)과 기본 신뢰수준
+PREVIEW_STRATA = ['date', 'hour']
+PREVIEW_CONFIDENCE = 0.95
+
+# 신뢰구간 표(group_mean/group_total 결과)의 컬럼
+INTERVAL_COLUMNS = ['estimate', 'ci_low', 'ci_high', 'std_error', 'sample_rows']
+
+
+def _z_value(confidence):
+    """양측 신뢰수준에 해당하는 정규분포 분위수 (0.95 -> 1.96)"""
+    return NormalDist().inv_cdf(0.5 + confidence / 2)
+
+
+def _combined_codes(columns):
+    """여러 컬럼 값의 조합을 0부터 시작하는 정수 코드로 변환 (결측도 하나의 값으로 취급)"""
+    combined = np.zeros(len(columns[0]), dtype=np.int64)
+    for column in columns:
+        codes, uniques = pd.factorize(column)
+        combined = combined * (len(uniques) + 1) + (codes + 1)
+    return pd.factorize(combined)[0]
+
+
+def correlation_interval(r, n, confidence=PREVIEW_CONFIDENCE):
+    """피어슨 상관계수의 Fisher z 변환 신뢰구간 (n: 계산에 쓴 행 수, n <= 3이면 NaN)
+
+    r, n은 스칼라나 같은 모양의 배열(상관관계 행렬 등) 모두 가능하다.
+    """
+    r = np.asarray(r, dtype=float)
+    n = np.asarray(n, dtype=float)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        center = np.arctanh(np.clip(r, -0.999999, 0.999999))
+        half = _z_value(confidence) / np.sqrt(n - 3)
+        low = np.tanh(center - half)
+        high = np.tanh(center + half)
+    too_small = n <= 3
+    return np.where(too_small, np.nan, low), np.where(too_small, np.nan, high)
+
+
+class StratifiedSample:
+    """날짜 × 시간대 층별 비례 배분 표본과 추정 가중치
+
+    층 h의 전체 행 수가 N_h, 표본 행 수가 n_h이면 표본 행의 가중치는 N_h / n_h이다.
+    모든 층에서 최소 1행을 뽑아 날짜/시간대가 차트에서 빠지지 않게 한다 (표본 크기가 층 수보다 작으면
+    층을 날짜 단위로, 그래도 작으면 층화 없이 뽑는다).
+    그룹 평균/합계는 가중 추정치이고, 표준오차는 층화 표본의 선형화 분산(유한모집단 보정 포함)으로 구한다.
+    그룹(시간대, 날짜, 주, 요일)이나 학습 관련 행 같은 부분집합에도 같은 식이 그대로 적용된다.
+    표본이 1행인 층은 분산 추정에 기여하지 못하므로 표본 크기는 층 수보다 충분히 크게 잡는다.
+    """
+
+    def __init__(self, index, rows, strata, stratum_rows, stratum_sample, confidence=PREVIEW_CONFIDENCE):
+        self.index = index                    # 표본 행의 원본 인덱스 라벨
+        self.rows = rows                      # 표본 행의 위치 (draw에 넘긴 데이터 기준, 정렬됨)
+        self.strata = strata                  # 표본 행의 층 코드
+        self.stratum_rows = stratum_rows      # 층별 전체 행 수 N_h
+        self.stratum_sample = stratum_sample  # 층별 표본 행 수 n_h
+        self.weights = stratum_rows[strata] / stratum_sample[strata]
+        self.confidence = confidence
+        self.total_rows = int(stratum_rows.sum())
+        self.strata_columns = list(PREVIEW_STRATA)  # 실제로 쓴 층화 컬럼 (draw에서 거칠게 바뀔 수 있음)
+
+    def __repr__(self):
+        return (f"StratifiedSample({len(self)} of {self.total_rows} rows, "
+                f"{len(self.stratum_rows)} strata, confidence={self.confidence:.0%})")
+
+    def __len__(self):
+        return len(self.rows)
+
+    @classmethod
+    def draw(cls, data, size, by=PREVIEW_STRATA, seed=0, confidence=PREVIEW_CONFIDENCE):
+        """데이터(DataFrame 또는 FrameView)에서 size행을 층화 추출 (seed가 같으면 같은 표본)"""
+        view = as_view(data)
+        n = len(view)
+        size = max(1, min(int(size), n))
+
+        # 표본 크기가 층 수보다 작으면 층을 거칠게 (날짜 × 시간대 -> 날짜 -> 층화 없음)
+        by = list(by)
+        while True:
+            columns = [view[col].to_numpy() for col in by]
+            codes = _combined_codes(columns) if columns and n else np.zeros(n, dtype=np.int64)
+            stratum_rows = np.bincount(codes, minlength=1)
+            if len(stratum_rows) <= size or not by:
+                break
+            by = by[:-1]
+        n_strata = len(stratum_rows)
+
+        # 층마다 1행을 먼저 주고 나머지를 (N_h - 1)에 비례 배분, 반올림 오차는 최대 나머지 방식
+        quota = (stratum_rows - 1) * ((size - n_strata) / max(n - n_strata, 1))
+        stratum_sample = 1 + np.floor(quota).astype(np.int64)
+        shortfall = size - int(stratum_sample.sum())
+        if shortfall > 0:
+            stratum_sample[np.argsort(np.floor(quota) - quota, kind='stable')[:shortfall]] += 1
+
+        # 층 안에서는 무작위 순서의 앞쪽 n_h행 선택
+        rng = np.random.default_rng(seed)
+        order = np.lexsort((rng.random(n), codes))
+        starts = np.concatenate(([0], np.cumsum(stratum_rows)[:-1])).astype(np.int64)
+        rank = np.arange(n) - starts[codes[order]]
+        rows = np.sort(order[rank < stratum_sample[codes[order]]])
+        sample = cls(view.index[rows], rows, codes[rows], stratum_rows, stratum_sample, confidence=confidence)
+        sample.strata_columns = by
+        return sample
+
+    def view(self, data):
+        """표본 행만 보는 FrameView (draw에 넘긴 것과 같은 데이터를 넘김, 복사 없음)"""
+        view = as_view(data)
+        mask = np.zeros(len(view), dtype=bool)
+        mask[self.rows] = True
+        return view.filter(mask)
+
+    def describe(self):
+        """차트/보고서 표시용 표본 정보"""
+        return {
+            'sample_rows': len(self),
+            'total_rows': self.total_rows,
+            'strata': len(self.stratum_rows),
+            'strata_columns': list(self.strata_columns),
+            'confidence': self.confidence,
+        }
+
+    def _estimate(self, values, groups):
+        """그룹별 가중 평균(values가 있을 때) 또는 가중 합계 추정치와 신뢰구간 표
+
+        values/groups는 원본 인덱스 라벨을 가진 Series이고, 표본 중 라벨이 없거나 값이 결측인 행은
+        그룹 밖(부분집합 밖)으로 본다. groups에 Series 리스트를 주면 MultiIndex 그룹이 된다.
+        """
+        group_list = list(groups) if isinstance(groups, (list, tuple)) else [groups]
+        aligned = [self._align(group) for group in group_list]
+        in_group = np.logical_and.reduce([group.notna().to_numpy() for group in aligned])
+        y = None
+        if values is not None:
+            y = self._align(values).to_numpy(dtype=float, na_value=np.nan)
+            in_group &= ~np.isnan(y)
+
+        if len(aligned) == 1:
+            group_codes, keys = pd.factorize(aligned[0][in_group], sort=True)
+            keys = pd.Index(keys, name=group_list[0].name)
+        else:
+            group_codes, keys = pd.factorize(pd.MultiIndex.from_arrays([group[in_group] for group in aligned]),
+                                             sort=True)
+            keys = pd.MultiIndex.from_tuples(list(keys), names=[group.name for group in group_list])
+        k = len(keys)
+        if k == 0:
+            return pd.DataFrame(columns=INTERVAL_COLUMNS, index=keys, dtype=float)
+        g = group_codes.astype(np.int64)
+        w = self.weights[in_group]
+        strata = self.strata[in_group]
+
+        weight_sum = np.bincount(g, weights=w, minlength=k)
+        if y is None:
+            estimate = weight_sum
+            z = w  # 합계 추정량의 선형화 변수
+        else:
+            y = y[in_group]
+            with np.errstate(invalid='ignore', divide='ignore'):
+                estimate = np.bincount(g, weights=w * y, minlength=k) / weight_sum
+            z = w * (y - estimate[g]) / weight_sum[g]  # 비율 추정량(가중 평균)의 선형화 변수
+
+        # 실제로 나타난 (층, 그룹) 칸만 집계 - 층 수 × 그룹 수 배열을 만들지 않음
+        cells, cell_keys = pd.factorize(strata * k + g)
+        s1 = np.bincount(cells, weights=z)
+        s2 = np.bincount(cells, weights=z * z)
+        cell_strata, cell_groups = cell_keys // k, cell_keys % k
+        n_h = self.stratum_sample[cell_strata].astype(float)
+        N_h = self.stratum_rows[cell_strata].astype(float)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            factor = np.where(n_h > 1, n_h / (n_h - 1) * (1 - n_h / N_h), 0.0)
+            terms = factor * (s2 - s1 * s1 / n_h)
+        variance = np.bincount(cell_groups, weights=terms, minlength=k)
+        std_error = np.sqrt(np.clip(variance, 0, None))
+
+        half = _z_value(self.confidence) * std_error
+        return pd.DataFrame({
+            'estimate': estimate,
+            'ci_low': estimate - half,
+            'ci_high': estimate + half,
+            'std_error': std_error,
+            'sample_rows': np.bincount(g, minlength=k),
+        }, index=keys, columns=INTERVAL_COLUMNS)
+
+    def _align(self, series):
+        """원본 인덱스 라벨 기준 Series를 표본 행 순서로 맞춤 (표본에 없는 라벨은 NaN)"""
+        if len(series) == len(self.index) and series.index.equals(self.index):
+            return series
+        return series.reindex(self.index)
+
+    def group_mean(self, values, groups):
+        """그룹별 평균 추정치와 신뢰구간 (INTERVAL_COLUMNS 표, 그룹 키 오름차순)"""
+        return self._estimate(values, groups)
+
+    def group_total(self, groups):
+        """그룹별 전체 행 수 추정치와 신뢰구간 (INTERVAL_COLUMNS 표, 그룹 키 오름차순)"""
+        return self._estimate(None, groups)
+
+
+def preview_caption(preview):
+    """차트 제목/보고서에 붙이는 근사 결과 표시 문구 (describe() 결과로 생성)"""
+    return (f"APPROXIMATE PREVIEW - {preview['sample_rows']:,} of {preview['total_rows']:,} messages "
+            f"({' x '.join(preview['strata_columns']) or 'simple random'} stratified), "
+            f"shaded/error bars: {preview['confidence']:.0%} CI")
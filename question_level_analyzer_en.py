@@ -1,13 +1,91 @@
 import pandas as pd
-import matplotlib.pyplot as plt
-import matplotlib.dates as mdates
 import numpy as np
 import os
+from data_loader_en import AnalysisWindow, add_text_features, classify_titles, read_csv_projected
+from run_instrumentation import profile_stage
+from frame_view import as_view
+
+QUESTION_LEVEL_FILENAME = "question_level_evolution.png"
+
+# 질문 수준 추세 분석에 실제로 쓰는 컬럼 (이 컬럼만 꺼내서 집계)
+QUESTION_LEVEL_INPUT_COLUMNS = ['timestamp', 'date', 'question_depth', 'primary_topic', 'content']
+
+# 질문 깊이 구간 (Basic: 0, Intermediate: 1-2, Advanced: 3+)
+QUESTION_CATEGORY_BINS = [-0.1, 0.5, 2.5, 16.1]
+QUESTION_CATEGORY_LABELS = ['Basic', 'Intermediate', 'Advanced']
+
+# More comprehensive keywords with lower threshold for better classification
+TOPIC_KEYWORDS = {
+    'Programming': ['code', 'python', 'javascript', 'java', 'c++', 'php', 'ruby', 'swift', 'kotlin',
+                  'function', 'class', 'method', 'variable', 'loop', 'algorithm', 'debug', 'error',
+                  'compile', 'syntax', 'programming', 'script', 'library', 'framework', 'api',
+                  'database', 'sql', 'query', 'server', 'backend', 'frontend'],
+    'AI/ML': ['ai', 'artificial intelligence', 'machine learning', 'ml', 'neural', 'network',
+             'deep learning', 'model', 'training', 'predict', 'classification', 'regression',
+             'tensor', 'pytorch', 'tensorflow', 'keras', 'scikit', 'nlp', 'vision', 'gpt',
+             'bert', 'transformer', 'embedding', 'token', 'fine-tune', 'inference'],
+    'Data Science': ['data', 'dataset', 'dataframe', 'pandas', 'numpy', 'matplotlib', 'seaborn',
+                   'analysis', 'analytics', 'statistics', 'probability', 'correlation', 'plot',
+                   'visualization', 'chart', 'graph', 'csv', 'json', 'excel', 'table', 'pivot'],
+    'Web Development': ['html', 'css', 'javascript', 'react', 'vue', 'angular', 'node', 'express',
+                       'jquery', 'bootstrap', 'sass', 'webpack', 'babel', 'npm', 'yarn', 'web',
+                       'website', 'browser', 'dom', 'http', 'ajax', 'json', 'api', 'rest'],
+    'Mathematics': ['math', 'calculus', 'algebra', 'geometry', 'statistics', 'probability',
+                  'equation', 'formula', 'theorem', 'matrix', 'vector', 'integral', 'derivative',
+                  'function', 'graph', 'plot', 'linear', 'quadratic', 'differential'],
+    'Development Tools': ['vscode', 'cursor', 'git', 'github', 'terminal', 'cli', 'command',
+                        'shell', 'bash', 'docker', 'kubernetes', 'linux', 'mac', 'windows',
+                        'editor', 'ide', 'debug', 'compile', 'build', 'deploy'],
+    'Design Tools': ['figma', 'sketch', 'photoshop', 'illustrator', 'ui', 'ux', 'design',
+                   'wireframe', 'prototype', 'mockup', 'color', 'font', 'layout', 'responsive',
+                   'mobile', 'web', 'app', 'interface', 'user experience'],
+    'Research/Education': ['learn', 'study', 'understand', 'explain', 'research', 'paper',
+                         'experiment', 'methodology', 'analysis', 'theory', 'concept', 'principle',
+                         'education', 'teaching', 'course', 'tutorial', 'guide', 'documentation']
+}
+
+
+def classify_topics_by_content(content, topic_keywords=TOPIC_KEYWORDS, text_index=None, positions=None):
+    """키워드 매칭 수가 가장 많은 토픽을 메시지별로 일괄 선택 (매칭이 없으면 None)
+
+    여러 토픽에 걸친 키워드는 한 번만 검사하고, 그 결과를 키워드 × 토픽
+    행렬로 메시지 × 토픽 매칭 수 행렬에 더한다. 동점이면 먼저 나온 토픽을 고른다.
+    text_index(TokenIndex)와 content 행의 색인 위치(positions)를 주면 본문을 스캔하지 않고 색인으로 검사한다.
+    """
+    topics = list(topic_keywords.keys())
+    keywords = list(dict.fromkeys(k for t in topics for k in topic_keywords[t]))
+    keyword_pos = {keyword: i for i, keyword in enumerate(keywords)}
+
+    keyword_topic = np.zeros((len(keywords), len(topics)), dtype=np.int32)
+    for j, topic in enumerate(topics):
+        for keyword in topic_keywords[topic]:
+            keyword_topic[keyword_pos[keyword], j] += 1
+
+    counts = np.zeros((len(content), len(topics)), dtype=np.int32)
+    if text_index is not None:
+        for keyword, topic_row in zip(keywords, keyword_topic):
+            counts[text_index.contains(keyword)[positions]] += topic_row
+    else:
+        lowered = content.fillna('').astype(str).str.lower()
+        for keyword, topic_row in zip(keywords, keyword_topic):
+            hit = lowered.str.contains(keyword, regex=False).to_numpy(dtype=bool)
+            counts[hit] += topic_row
+
+    labels = np.asarray(topics, dtype=object)[counts.argmax(axis=1)]
+    labels[counts.max(axis=1) < 1] = None
+    return pd.Series(labels, index=content.index, dtype=object)
+
 
 class QuestionLevelAnalyzer:
-    def __init__(self, data_path):
+    def __init__(self, data_path, window=None):
         self.data_path = data_path
         self.df = None
+        # 분석 조건 - MainExecutor에서 받은 데이터는 이미 이 조건으로 걸러져 있음
+        self.window = window if window is not None else AnalysisWindow()
+        self.profiler = None  # RunProfiler (있으면 학습 필터/토픽 재분류 단계 계측)
+        self.text_index = None  # 기본 프레임 본문의 TokenIndex (있으면 토픽 재분류에 사용)
+        self.sample = None  # StratifiedSample (있으면 미리보기 - 표본 가중 추정치와 신뢰구간 계산)
+        self.cube = None  # AggregationCube (있으면 메시지 대신 큐브 롤업으로 집계)
         self.portfolio_dir = "."
         os.makedirs(self.portfolio_dir, exist_ok=True)
 
@@ -16,58 +94,39 @@ class QuestionLevelAnalyzer:
         if hasattr(self, 'df') and self.df is not None:
             return self.df
 
-        # 기본적으로는 CSV 로드 (호환성 유지)
+        # 기본적으로는 CSV 로드 (호환성 유지) - 분석에 필요한 컬럼만 읽음
         try:
-            self.df = pd.read_csv(self.data_path)
+            self.df = read_csv_projected(self.data_path)
             # Convert timestamp to datetime for time-based analysis
             if 'timestamp' in self.df.columns:
                 self.df['timestamp'] = pd.to_datetime(self.df['timestamp'])
-                # Filter for April 1st to August 31st 2025
-                start_date = pd.Timestamp('2025-04-01')
-                end_date = pd.Timestamp('2025-08-31')
-                self.df = self.df[(self.df['timestamp'] >= start_date) & (self.df['timestamp'] <= end_date)]
+                # Filter for the analysis window
+                self.df = self.window.apply(self.df)
         except:
             print("⚠️ No data path provided, assuming data is already loaded")
 
         return self.df
 
     def filter_learning_related_conversations(self):
-        """Filter only learning-related conversations"""
-        learning_keywords = [
-            'learn', 'study', 'understand', 'explain', 'how', 'what', 'why', 'teach',
-            'concept', 'algorithm', 'model', 'data', 'analysis', 'programming', 'code',
-            'python', 'machine learning', 'ai', 'deep learning', 'neural', 'network',
-            'statistics', 'probability', 'math', 'calculus', 'linear algebra',
-            'optimization', 'gradient', 'loss', 'accuracy', 'training', 'validation'
-        ]
-
-        # Filter conversations containing learning keywords
-        learning_mask = self.df['content'].str.lower().apply(
-            lambda x: any(keyword in str(x) for keyword in learning_keywords)
-        )
-
-        # Conversations with questions (has_question 컬럼이 없으면 계산)
-        if 'has_question' not in self.df.columns:
-            self.df['has_question'] = self.df['content'].str.contains(r'\?|what|how|why|when|where', case=False, na=False)
-
-        question_mask = self.df['has_question'] == True
-
-        # Conversations with high technical term density
-        if 'tech_term_density' not in self.df.columns:
-            # 간단한 기술 용어 밀도 계산
-            tech_terms = ['python', 'ai', 'machine learning', 'data', 'algorithm', 'neural', 'network', 'model', 'training']
-            self.df['tech_term_density'] = self.df['content'].str.lower().apply(
-                lambda x: sum(1 for term in tech_terms if term in str(x)) / len(tech_terms) if x else 0
-            )
-
-        tech_mask = self.df['tech_term_density'] > 0.1
-
-        # Learning-related = (keywords) OR (questions) OR (high tech density)
-        learning_related = self.df[learning_mask | question_mask | tech_mask].copy()
-
-        # Ensure date column exists for time-based analysis
-        if 'date' not in learning_related.columns and 'timestamp' in learning_related.columns:
-            learning_related['date'] = pd.to_datetime(learning_related['timestamp'].dt.date)
+        """Filter only learning-related conversations
+
+        원본 프레임을 복사하지 않고 학습 관련 행만 보는 FrameView를 반환한다.
+        """
+        with profile_stage(self.profiler, 'learning_filter', rows_in=len(self.df)) as record:
+            view = as_view(self.df)
+            # DataLoader에서 미리 계산한 텍스트 파생 컬럼을 재사용 (없으면 뷰의 사이드 테이블에 계산)
+            add_text_features(view)
+
+            # Learning-related = (keywords) OR (questions) OR (high tech density)
+            learning_related = view.filter(view['is_learning_related'].to_numpy(dtype=bool))
+
+            # Ensure date column exists for time-based analysis
+            if 'date' not in learning_related and 'timestamp' in learning_related:
+                learning_related['date'] = pd.to_datetime(learning_related['timestamp'].dt.date)
+            # 대시보드 단계를 거치지 않은 데이터면 제목 기반 토픽을 학습 관련 행에만 계산
+            if 'primary_topic' not in learning_related and 'conversation_title' in learning_related:
+                learning_related['primary_topic'] = classify_titles(learning_related['conversation_title'])
+            record['rows_out'] = len(learning_related)
 
         print(f"📚 Total conversations: {len(self.df)}")
         print(f"🎓 Learning-related conversations: {len(learning_related)}")
@@ -77,97 +136,63 @@ class QuestionLevelAnalyzer:
 
     def analyze_question_level_trends(self, learning_data):
         """Analyze question level evolution trends"""
+        # 필요한 컬럼만 한 번 꺼낸 작업용 프레임 (원본 프레임은 수정하지 않음)
+        view = as_view(learning_data)
+        columns = [col for col in QUESTION_LEVEL_INPUT_COLUMNS if col in view]
+        df = view.frame(columns)
+
         # Ensure timestamp is datetime for proper grouping
-        if 'timestamp' in learning_data.columns:
-            learning_data = learning_data.copy()
-            if not pd.api.types.is_datetime64_any_dtype(learning_data['timestamp']):
-                learning_data['timestamp'] = pd.to_datetime(learning_data['timestamp'])
+        if 'timestamp' in df.columns and not pd.api.types.is_datetime64_any_dtype(df['timestamp']):
+            df['timestamp'] = pd.to_datetime(df['timestamp'])
 
         # Daily question depth average - use timestamp for consistent grouping
-        if 'date' in learning_data.columns:
+        if 'date' in df.columns:
             # Ensure date column is datetime type
-            if not pd.api.types.is_datetime64_any_dtype(learning_data['date']):
-                learning_data = learning_data.copy()
-                learning_data['date'] = pd.to_datetime(learning_data['date'])
-            daily_question_depth = learning_data.groupby('date')['question_depth'].mean()
+            if not pd.api.types.is_datetime64_any_dtype(df['date']):
+                df['date'] = pd.to_datetime(df['date'])
+            daily_question_depth = df.groupby('date')['question_depth'].mean()
         else:
             # Fallback to daily grouping by timestamp
-            daily_question_depth = learning_data.groupby(pd.Grouper(key='timestamp', freq='D'))['question_depth'].mean()
+            daily_question_depth = df.groupby(pd.Grouper(key='timestamp', freq='D'))['question_depth'].mean()
 
         # Weekly question depth changes
-        weekly_question_depth = learning_data.groupby(pd.Grouper(key='timestamp', freq='W'))['question_depth'].mean()
+        weekly_question_depth = df.groupby(pd.Grouper(key='timestamp', freq='W'))['question_depth'].mean()
 
         # Monthly question depth changes - use 'ME' instead of deprecated 'M'
-        monthly_question_depth = learning_data.groupby(pd.Grouper(key='timestamp', freq='ME'))['question_depth'].mean()
+        monthly_question_depth = df.groupby(pd.Grouper(key='timestamp', freq='ME'))['question_depth'].mean()
 
         # Apply topic refinement for better categorization (same as topic_analyzer_en.py)
-        df = learning_data.copy()
-
         # Refine General topics based on content analysis
         general_mask = df["primary_topic"] == "General"
 
         if general_mask.sum() > 0:
-            general_data = df[general_mask].copy()
-
-            # More comprehensive keywords with lower threshold for better classification
-            topic_keywords = {
-                'Programming': ['code', 'python', 'javascript', 'java', 'c++', 'php', 'ruby', 'swift', 'kotlin',
-                              'function', 'class', 'method', 'variable', 'loop', 'algorithm', 'debug', 'error',
-                              'compile', 'syntax', 'programming', 'script', 'library', 'framework', 'api',
-                              'database', 'sql', 'query', 'server', 'backend', 'frontend'],
-                'AI/ML': ['ai', 'artificial intelligence', 'machine learning', 'ml', 'neural', 'network',
-                         'deep learning', 'model', 'training', 'predict', 'classification', 'regression',
-                         'tensor', 'pytorch', 'tensorflow', 'keras', 'scikit', 'nlp', 'vision', 'gpt',
-                         'bert', 'transformer', 'embedding', 'token', 'fine-tune', 'inference'],
-                'Data Science': ['data', 'dataset', 'dataframe', 'pandas', 'numpy', 'matplotlib', 'seaborn',
-                               'analysis', 'analytics', 'statistics', 'probability', 'correlation', 'plot',
-                               'visualization', 'chart', 'graph', 'csv', 'json', 'excel', 'table', 'pivot'],
-                'Web Development': ['html', 'css', 'javascript', 'react', 'vue', 'angular', 'node', 'express',
-                                   'jquery', 'bootstrap', 'sass', 'webpack', 'babel', 'npm', 'yarn', 'web',
-                                   'website', 'browser', 'dom', 'http', 'ajax', 'json', 'api', 'rest'],
-                'Mathematics': ['math', 'calculus', 'algebra', 'geometry', 'statistics', 'probability',
-                              'equation', 'formula', 'theorem', 'matrix', 'vector', 'integral', 'derivative',
-                              'function', 'graph', 'plot', 'linear', 'quadratic', 'differential'],
-                'Development Tools': ['vscode', 'cursor', 'git', 'github', 'terminal', 'cli', 'command',
-                                    'shell', 'bash', 'docker', 'kubernetes', 'linux', 'mac', 'windows',
-                                    'editor', 'ide', 'debug', 'compile', 'build', 'deploy'],
-                'Design Tools': ['figma', 'sketch', 'photoshop', 'illustrator', 'ui', 'ux', 'design',
-                               'wireframe', 'prototype', 'mockup', 'color', 'font', 'layout', 'responsive',
-                               'mobile', 'web', 'app', 'interface', 'user experience'],
-                'Research/Education': ['learn', 'study', 'understand', 'explain', 'research', 'paper',
-                                     'experiment', 'methodology', 'analysis', 'theory', 'concept', 'principle',
-                                     'education', 'teaching', 'course', 'tutorial', 'guide', 'documentation']
-            }
-
-            # Create a mapping for reclassification with priorities
-            topic_mapping = {}
-            for idx in general_data.index:
-                content = str(general_data.loc[idx, 'content']).lower()
-
-                # Find best matching topic based on keyword count
-                best_topic = None
-                max_matches = 0
-
-                for topic, keywords in topic_keywords.items():
-                    matches = sum(1 for keyword in keywords if keyword in content)
-                    if matches > max_matches:
-                        max_matches = matches
-                        best_topic = topic
-
-                # More flexible threshold: reclassify if we have at least 1 keyword match
-                if best_topic and max_matches >= 1:
-                    topic_mapping[idx] = best_topic
-
-            # Apply reclassification
-            for idx, new_topic in topic_mapping.items():
-                df.loc[idx, "primary_topic"] = new_topic
+            with profile_stage(self.profiler, 'topic_refinement', rows_in=int(general_mask.sum())) as record:
+                # 메시지 × 토픽 키워드 수 행렬로 한 번에 재분류하고, 컬럼도 한 번만 갱신
+                general_index = df.index[general_mask]
+                # 색인이 기본 프레임 기준이면 재분류 대상 행의 색인 위치로 바로 질의
+                text_index, positions = None, None
+                if self.text_index is not None and self.text_index.n_docs == len(view.base):
+                    view_positions = np.arange(len(view.base)) if view.positions is None else view.positions
+                    text_index, positions = self.text_index, view_positions[general_mask.to_numpy()]
+                new_topics = classify_topics_by_content(df.loc[general_mask, 'content'],
+                                                        text_index=text_index, positions=positions)
+                matched = new_topics.notna().to_numpy()
+                if matched.any():
+                    if isinstance(df["primary_topic"].dtype, pd.CategoricalDtype):
+                        # compact 모드(category)면 새 토픽을 범주에 먼저 추가
+                        missing = new_topics[matched].unique()
+                        missing = [t for t in missing if t not in df["primary_topic"].cat.categories]
+                        if missing:
+                            df["primary_topic"] = df["primary_topic"].cat.add_categories(missing)
+                    df.loc[general_index[matched], "primary_topic"] = new_topics[matched].to_numpy()
+                record['rows_out'] = int(matched.sum())
 
         # Question category distribution changes over time (using refined topics)
         # More balanced bins: only 0 is Basic, rest distributed
         df['question_category'] = pd.cut(
             df['question_depth'],
-            bins=[-0.1, 0.5, 2.5, 16.1],  # Basic: 0, Intermediate: 1-2, Advanced: 3+
-            labels=['Basic', 'Intermediate', 'Advanced']
+            bins=QUESTION_CATEGORY_BINS,  # Basic: 0, Intermediate: 1-2, Advanced: 3+
+            labels=QUESTION_CATEGORY_LABELS
         )
 
         question_categories_over_time = df.groupby(
@@ -177,78 +202,214 @@ class QuestionLevelAnalyzer:
 
         return daily_question_depth, weekly_question_depth, monthly_question_depth, question_categories_over_time
 
-    def create_question_level_chart(self):
-        """Create question level evolution chart"""
+    def compute_question_level_data(self):
+        """질문 수준 차트 4개에 필요한 집계값 계산 (렌더링과 분리)"""
+        if self.cube is not None and self.sample is None:
+            return self._compute_cube_data()
         learning_data = self.filter_learning_related_conversations()
+        if self.sample is not None:
+            return self._compute_preview_data(learning_data)
         daily_depth, weekly_depth, monthly_depth, category_trends = self.analyze_question_level_trends(learning_data)
 
-        fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(16, 12))
-        fig.suptitle("Question Level Evolution Analysis (April-August 2025, Learning Conversations Only)", fontsize=16, fontweight="bold")
-
-        # 1. Daily question depth trend
         # Convert index to datetime for proper plotting
         if not pd.api.types.is_datetime64_any_dtype(daily_depth.index):
             daily_depth.index = pd.to_datetime(daily_depth.index)
 
-        ax1.plot(daily_depth.index, daily_depth.values, linewidth=2, color="#2E86AB", alpha=0.7)
-        ax1.fill_between(daily_depth.index, daily_depth.values, alpha=0.3, color="#2E86AB")
-        ax1.set_title("Daily Question Depth Trend (April-August 2025)", fontweight="bold")
-        ax1.set_xlabel("Date")
-        ax1.set_ylabel("Average Question Depth")
-
-        # Set date format for x-axis - ensure proper datetime handling
-        ax1.xaxis.set_major_formatter(mdates.DateFormatter('%m/%d'))
-        ax1.xaxis.set_major_locator(mdates.DayLocator(interval=7))  # Weekly ticks
-        ax1.tick_params(axis="x", rotation=45)
-        ax1.grid(True, alpha=0.3)
-
-        # 2. Weekly question depth evolution
-        ax2.plot(weekly_depth.index, weekly_depth.values, marker="o", linewidth=3,
-                markersize=6, color="#FF6B35", markerfacecolor="#F24236")
-        ax2.set_title("Weekly Question Depth Evolution (April-August 2025)", fontweight="bold")
-        ax2.set_xlabel("Week")
-        ax2.set_ylabel("Average Question Depth")
-
-        # Set date format for x-axis - more robust approach
-        ax2.xaxis.set_major_formatter(mdates.DateFormatter('%m/%d'))
-        ax2.xaxis.set_major_locator(mdates.MonthLocator(interval=1))
-        ax2.tick_params(axis="x", rotation=45)
-        ax2.grid(True, alpha=0.3)
-
-        # 3. Question categories over time
-        if not category_trends.empty:
-            category_trends.plot(kind='area', stacked=True, ax=ax3,
-                               color=['#4ECDC4', '#45B7D1', '#96CEB4'])
-            ax3.set_title("Question Categories Over Time (April-August 2025)", fontweight="bold")
-            ax3.set_xlabel("Week")
-            ax3.set_ylabel("Number of Questions")
-            ax3.legend(title="Question Level")
-            ax3.tick_params(axis="x", rotation=45)
-
-        # 4. Monthly progression
-        ax4.plot(monthly_depth.index, monthly_depth.values, linewidth=4,
-                marker="s", markersize=8, color="#F24236", markerfacecolor="#FF6B35")
-        ax4.set_title("Monthly Question Level Progression (April-August 2025)", fontweight="bold")
-        ax4.set_xlabel("Month")
-        ax4.set_ylabel("Average Question Depth")
-        ax4.tick_params(axis="x", rotation=45)
-        ax4.grid(True, alpha=0.3)
-
-        # Add trend line
-        if len(monthly_depth) > 1:
-            z = np.polyfit(range(len(monthly_depth)), monthly_depth.values, 1)
-            p = np.poly1d(z)
-            ax4.plot(monthly_depth.index, p(range(len(monthly_depth))),
-                    "--", color="red", linewidth=2, alpha=0.8, label="Trend")
-            ax4.legend()
-
-        plt.tight_layout()
-        chart_path = os.path.join(self.portfolio_dir, "question_level_evolution.png")
-        plt.savefig(chart_path, dpi=300, bbox_inches="tight")
-        plt.close()
+        return {
+            'learning_count': len(learning_data),
+            'daily_depth': daily_depth,
+            'weekly_depth': weekly_depth,
+            'monthly_depth': monthly_depth,
+            'category_trends': category_trends,
+            'period_label': self.window.label(),
+        }
+
+    def _compute_cube_data(self):
+        """집계 큐브의 학습 관련 칸을 롤업해서 같은 집계값 계산 (메시지를 다시 스캔하지 않음)
+
+        차트에 쓰이지 않는 토픽 재분류는 건너뛴다. 주/월 구간은 날짜 키로 정한다.
+        """
+        cube = self.cube
+        learning_count = cube.count(learning_only=True)
+        print(f"📚 Total conversations: {cube.total_rows}")
+        print(f"🎓 Learning-related conversations: {learning_count}")
+        print(f"📊 Learning ratio: {learning_count/cube.total_rows*100:.1f}%")
+
+        cells = cube.cells
+        date = pd.to_datetime(cells['date'])
+        # pd.Grouper(key='timestamp', freq='W'/'ME')와 같은 구간 라벨 (주의 일요일, 월의 마지막 날)
+        week = date.dt.to_period('W').dt.end_time.dt.normalize().rename('timestamp')
+        month = date.dt.to_period('M').dt.end_time.dt.normalize().rename('timestamp')
+
+        daily_depth = cube.mean('question_depth', date, learning_only=True)
+        weekly_depth = cube.mean('question_depth', week, learning_only=True)
+        monthly_depth = cube.mean('question_depth', month, learning_only=True)
+        if not weekly_depth.empty:
+            weekly_depth = weekly_depth.reindex(
+                pd.date_range(weekly_depth.index.min(), weekly_depth.index.max(), freq='W', name='timestamp'))
+        if not monthly_depth.empty:
+            monthly_depth = monthly_depth.reindex(
+                pd.date_range(monthly_depth.index.min(), monthly_depth.index.max(), freq='ME', name='timestamp'))
+
+        category_trends = cube.count([week, 'question_category'], learning_only=True).unstack()
+        category_trends = category_trends.reindex(index=weekly_depth.index, columns=QUESTION_CATEGORY_LABELS).fillna(0)
+        category_trends.columns.name = 'question_category'
+
+        return {
+            'learning_count': learning_count,
+            'daily_depth': daily_depth,
+            'weekly_depth': weekly_depth,
+            'monthly_depth': monthly_depth,
+            'category_trends': category_trends,
+            'period_label': self.window.label(),
+        }
+
+    def _compute_preview_data(self, learning_data):
+        """미리보기 표본의 학습 관련 행으로 같은 집계값을 가중 추정하고, 신뢰구간 표를 intervals에 담음
+
+        차트에 쓰이지 않는 토픽 재분류는 건너뛴다.
+        """
+        sample = self.sample
+        view = as_view(learning_data)
+        df = view.frame([col for col in ['timestamp', 'date', 'question_depth'] if col in view])
+        timestamp = pd.to_datetime(df['timestamp'])
+        date = pd.to_datetime(df['date']) if 'date' in df.columns else timestamp.dt.normalize()
+        depth = df['question_depth']
+        # pd.Grouper(freq='W'/'ME')와 같은 구간 라벨 (주의 일요일, 월의 마지막 날)
+        week = timestamp.dt.to_period('W').dt.end_time.dt.normalize().rename('timestamp')
+        month = timestamp.dt.to_period('M').dt.end_time.dt.normalize().rename('timestamp')
+
+        daily = sample.group_mean(depth, date.rename('date'))
+        weekly = sample.group_mean(depth, week)
+        monthly = sample.group_mean(depth, month)
+        if not weekly.empty:
+            weekly = weekly.reindex(pd.date_range(weekly.index.min(), weekly.index.max(), freq='W', name='timestamp'))
+        if not monthly.empty:
+            monthly = monthly.reindex(pd.date_range(monthly.index.min(), monthly.index.max(), freq='ME', name='timestamp'))
+
+        category = pd.cut(depth, bins=QUESTION_CATEGORY_BINS, labels=QUESTION_CATEGORY_LABELS).rename('question_category')
+        categories = sample.group_total([week, category])
+        category_trends = categories['estimate'].unstack().reindex(index=weekly.index, columns=QUESTION_CATEGORY_LABELS)
+        category_trends = category_trends.fillna(0)
+        category_trends.columns.name = 'question_category'
+
+        learning = sample.group_total(pd.Series('learning', index=df.index))
+        learning_count = int(round(learning['estimate'].iloc[0])) if not learning.empty else 0
+
+        return {
+            'learning_count': learning_count,
+            'daily_depth': daily['estimate'].rename('question_depth'),
+            'weekly_depth': weekly['estimate'].rename('question_depth'),
+            'monthly_depth': monthly['estimate'].rename('question_depth'),
+            'category_trends': category_trends,
+            'period_label': self.window.label(),
+            'intervals': {
+                'learning_count': learning,
+                'daily_depth': daily,
+                'weekly_depth': weekly,
+                'monthly_depth': monthly,
+                'category_trends': categories,
+            },
+            'preview': sample.describe(),
+        }
+
+    def create_question_level_chart(self):
+        """Create question level evolution chart"""
+        data = self.compute_question_level_data()
+        chart_path = os.path.join(self.portfolio_dir, QUESTION_LEVEL_FILENAME)
+        render_question_level_chart(data, chart_path)
         print(f"✅ Question level evolution chart created: {chart_path}")
 
-        return len(learning_data), daily_depth.mean(), weekly_depth.mean()
+        return data['learning_count'], data['daily_depth'].mean(), data['weekly_depth'].mean()
+
+
+def render_question_level_chart(data, chart_path):
+    """compute_question_level_data() 결과로 질문 수준 차트 PNG 저장 (프로세스 풀에서도 호출 가능)"""
+    # 플로팅 라이브러리는 차트를 실제로 그릴 때만 import
+    import matplotlib.pyplot as plt
+    import matplotlib.dates as mdates
+
+    daily_depth = data['daily_depth']
+    weekly_depth = data['weekly_depth']
+    monthly_depth = data['monthly_depth']
+    category_trends = data['category_trends']
+    period = data['period_label']
+    # 미리보기 결과면 제목에 근사 표시를 붙이고 추세선에 신뢰구간을 함께 그림
+    intervals = data.get('intervals')
+
+    fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(16, 12))
+    title = f"Question Level Evolution Analysis ({period}, Learning Conversations Only)"
+    if 'preview' in data:
+        from preview_sampling import preview_caption
+        title += "\n" + preview_caption(data['preview'])
+    fig.suptitle(title, fontsize=16, fontweight="bold")
+
+    # 1. Daily question depth trend
+    ax1.plot(daily_depth.index, daily_depth.values, linewidth=2, color="#2E86AB", alpha=0.7)
+    ax1.fill_between(daily_depth.index, daily_depth.values, alpha=0.3, color="#2E86AB")
+    if intervals is not None:
+        ax1.fill_between(daily_depth.index, intervals['daily_depth']['ci_low'], intervals['daily_depth']['ci_high'],
+                         color="#2E86AB", alpha=0.15, hatch='//', linewidth=0)
+    ax1.set_title(f"Daily Question Depth Trend ({period})", fontweight="bold")
+    ax1.set_xlabel("Date")
+    ax1.set_ylabel("Average Question Depth")
+
+    # Set date format for x-axis - ensure proper datetime handling
+    ax1.xaxis.set_major_formatter(mdates.DateFormatter('%m/%d'))
+    ax1.xaxis.set_major_locator(mdates.DayLocator(interval=7))  # Weekly ticks
+    ax1.tick_params(axis="x", rotation=45)
+    ax1.grid(True, alpha=0.3)
+
+    # 2. Weekly question depth evolution
+    ax2.plot(weekly_depth.index, weekly_depth.values, marker="o", linewidth=3,
+            markersize=6, color="#FF6B35", markerfacecolor="#F24236")
+    if intervals is not None:
+        ax2.fill_between(weekly_depth.index, intervals['weekly_depth']['ci_low'], intervals['weekly_depth']['ci_high'],
+                         color="#FF6B35", alpha=0.2)
+    ax2.set_title(f"Weekly Question Depth Evolution ({period})", fontweight="bold")
+    ax2.set_xlabel("Week")
+    ax2.set_ylabel("Average Question Depth")
+
+    # Set date format for x-axis - more robust approach
+    ax2.xaxis.set_major_formatter(mdates.DateFormatter('%m/%d'))
+    ax2.xaxis.set_major_locator(mdates.MonthLocator(interval=1))
+    ax2.tick_params(axis="x", rotation=45)
+    ax2.grid(True, alpha=0.3)
+
+    # 3. Question categories over time
+    if not category_trends.empty:
+        category_trends.plot(kind='area', stacked=True, ax=ax3,
+                           color=['#4ECDC4', '#45B7D1', '#96CEB4'])
+        ax3.set_title(f"Question Categories Over Time ({period})", fontweight="bold")
+        ax3.set_xlabel("Week")
+        ax3.set_ylabel("Number of Questions")
+        ax3.legend(title="Question Level")
+        ax3.tick_params(axis="x", rotation=45)
+
+    # 4. Monthly progression
+    ax4.plot(monthly_depth.index, monthly_depth.values, linewidth=4,
+            marker="s", markersize=8, color="#F24236", markerfacecolor="#FF6B35")
+    if intervals is not None:
+        ax4.fill_between(monthly_depth.index, intervals['monthly_depth']['ci_low'],
+                         intervals['monthly_depth']['ci_high'], color="#F24236", alpha=0.2)
+    ax4.set_title(f"Monthly Question Level Progression ({period})", fontweight="bold")
+    ax4.set_xlabel("Month")
+    ax4.set_ylabel("Average Question Depth")
+    ax4.tick_params(axis="x", rotation=45)
+    ax4.grid(True, alpha=0.3)
+
+    # Add trend line
+    if len(monthly_depth) > 1:
+        z = np.polyfit(range(len(monthly_depth)), monthly_depth.values, 1)
+        p = np.poly1d(z)
+        ax4.plot(monthly_depth.index, p(range(len(monthly_depth))),
+                "--", color="red", linewidth=2, alpha=0.8, label="Trend")
+        ax4.legend()
+
+    plt.tight_layout()
+    plt.savefig(chart_path, dpi=300, bbox_inches="tight")
+    plt.close()
+    return chart_path
 
 if __name__ == "__main__":
     analyzer = QuestionLevelAnalyzer("../processed_conversations.csv")
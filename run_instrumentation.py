@@ -0,0 +1,165 @@
+# run_instrumentation.py
+# 실행 계측 모듈 - 단계별 시간/CPU/메모리/행 수 기록 및 JSON 실행 리포트 저장
+
+import cProfile
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from datetime import datetime
+
+try:
+    import resource
+except ImportError:  # Windows 등 Unix가 아닌 플랫폼
+    resource = None
+
+
+def peak_rss_mb():
+    """프로세스 최대 RSS (MB) - Linux는 KB, macOS는 byte 단위
+
+    resource 모듈이 없으면 psutil의 최대 working set(Windows)을 쓰고, 그것도 없으면 None.
+    """
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+    try:
+        import psutil
+    except ImportError:
+        return None
+    peak = getattr(psutil.Process().memory_info(), 'peak_wset', None)
+    return None if peak is None else peak / (1024 * 1024)
+
+
+def _round_mb(value):
+    return None if value is None else round(value, 1)
+
+
+def rss_metrics(peak_before):
+    """구간 RSS 계측값 - 구간 시작 시점 대비 프로세스 최대 RSS 증가량과 (프로세스 시작부터 누적된) 최대 RSS
+
+    ru_maxrss는 프로세스 전체의 최대치라서 앞 단계가 더 많이 썼으면 뒤 단계는 증가량이 0이다.
+    최대 RSS를 읽을 수 없는 플랫폼에서는 두 값 모두 None.
+    """
+    peak = peak_rss_mb()
+    growth = None if peak is None or peak_before is None else peak - peak_before
+    return {'rss_peak_growth_mb': _round_mb(growth), 'process_peak_rss_mb': _round_mb(peak)}
+
+
+class RunProfiler:
+    """파이프라인 단계별 계측값 수집기
+
+    stage() 컨텍스트로 감싼 구간마다 wall/CPU 시간, 최대 RSS 증가량(rss_metrics), 입출력 행 수를 기록한다.
+    trace_memory=True면 tracemalloc 증가량/최대치도 기록하고(느려짐),
+    profile_dir를 주면 단계별 cProfile 결과를 <단계 이름>.prof로 저장한다
+    (cProfile은 중첩되지 않으므로 스레드마다 가장 바깥 단계만 프로파일링).
+    tracemalloc 최대치는 프로세스에 하나뿐이라서, 단계가 열리거나 닫힐 때마다 그때까지의 최대치를
+    (모든 스레드의) 열린 단계 전부에 반영한 뒤 초기화한다. 그래서 바깥 단계의 최대치는
+    max(자기 구간 최대치, 안쪽 단계 최대치) - 시작 시점 사용량이 된다.
+    단계가 여러 스레드에서 동시에 돌면 tracemalloc/RSS 값은 프로세스 전체 기준의 근사치다.
+    """
+
+    def __init__(self, trace_memory=False, profile_dir=None):
+        self.trace_memory = trace_memory
+        self.profile_dir = profile_dir
+        self.records = []
+        self.started_at = datetime.now()
+        self._t0 = time.perf_counter()
+        self._lock = threading.Lock()
+        self._local = threading.local()  # 스레드별 cProfile 동작 여부
+        self._open_peaks = {}  # 열린 단계 record id -> 지금까지의 tracemalloc 최대치 (byte)
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        if profile_dir:
+            os.makedirs(profile_dir, exist_ok=True)
+
+    @contextmanager
+    def stage(self, name, rows_in=None):
+        """단계 계측 컨텍스트 - yield되는 record에 rows_out 등을 채울 수 있음"""
+        record = {'stage': name, 'rows_in': rows_in, 'rows_out': None,
+                  'thread': threading.current_thread().name}
+
+        if self.trace_memory:
+            with self._lock:
+                self._fold_traced_peak()
+                traced_before = tracemalloc.get_traced_memory()[0]
+                self._open_peaks[id(record)] = traced_before
+
+        profile = None
+        if self.profile_dir and not getattr(self._local, 'profiling', False):
+            profile = cProfile.Profile()
+            try:
+                profile.enable()
+                self._local.profiling = True
+            except ValueError:
+                # 다른 스레드에서 이미 프로파일러가 동작 중이면 이 단계는 건너뜀
+                profile = None
+
+        start = time.perf_counter()
+        cpu_start = time.thread_time()
+        rss_before = peak_rss_mb()
+        try:
+            yield record
+        except BaseException as e:
+            record['error'] = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            record['start_s'] = round(start - self._t0, 4)
+            record['wall_s'] = round(time.perf_counter() - start, 4)
+            record['cpu_s'] = round(time.thread_time() - cpu_start, 4)
+            record.update(rss_metrics(rss_before))
+            if self.trace_memory:
+                with self._lock:
+                    self._fold_traced_peak()
+                    current = tracemalloc.get_traced_memory()[0]
+                    peak = self._open_peaks.pop(id(record))
+                record['tracemalloc_delta_mb'] = round((current - traced_before) / (1024 * 1024), 3)
+                record['tracemalloc_peak_mb'] = round((peak - traced_before) / (1024 * 1024), 3)
+            if profile is not None:
+                profile.disable()
+                self._local.profiling = False
+                profile_path = os.path.join(self.profile_dir, f"{name.replace(':', '_')}.prof")
+                profile.dump_stats(profile_path)
+                record['profile'] = profile_path
+            self.add_record(record)
+
+    def _fold_traced_peak(self):
+        """지금까지의 tracemalloc 최대치를 열린 단계 전부에 반영하고 최대치 초기화 (self._lock 안에서 호출)"""
+        peak = tracemalloc.get_traced_memory()[1]
+        for key, open_peak in self._open_peaks.items():
+            self._open_peaks[key] = max(open_peak, peak)
+        tracemalloc.reset_peak()
+
+    def elapsed(self):
+        """계측 시작 후 경과 시간 (초)"""
+        return round(time.perf_counter() - self._t0, 4)
+
+    def add_record(self, record):
+        """외부(예: 렌더링 워커 프로세스)에서 측정한 계측값 추가"""
+        with self._lock:
+            self.records.append(record)
+
+    def to_dict(self, **extra):
+        return {
+            'started_at': self.started_at.isoformat(timespec='seconds'),
+            'total_wall_s': self.elapsed(),
+            'process_peak_rss_mb': _round_mb(peak_rss_mb()),
+            'trace_memory': self.trace_memory,
+            'stages': sorted(self.records, key=lambda record: record.get('start_s', 0)),
+            **extra,
+        }
+
+    def write_report(self, report_path, **extra):
+        """계측 결과를 JSON 실행 리포트로 저장"""
+        with open(report_path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(**extra), f, ensure_ascii=False, indent=2, default=str)
+        return report_path
+
+
+def profile_stage(profiler, name, rows_in=None):
+    """profiler가 있으면 단계 계측 컨텍스트, 없으면 빈 record를 주는 컨텍스트 반환"""
+    if profiler is None:
+        return nullcontext({})
+    return profiler.stage(name, rows_in=rows_in)
@@ -0,0 +1,64 @@
+# test_advanced_correlation_analyzer.py
+# 그룹별 상관관계 엔진 회귀 테스트 (python -m pytest -q)
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from advanced_correlation_analyzer import grouped_correlations, grouped_moments
+
+COLUMNS = ['word_count', 'question_depth', 'complexity_ma']
+
+
+@pytest.fixture
+def frame():
+    """시간대/요일/토픽 키와 변수별로 다른 위치에 결측치가 있는 행 단위 데이터"""
+    rng = np.random.default_rng(0)
+    n = 2000
+    word_count = rng.gamma(2.0, 40.0, n)
+    df = pd.DataFrame({
+        'hour': rng.integers(0, 24, n),
+        'day_of_week': rng.choice(['Monday', 'Tuesday', 'Sunday'], n),
+        'primary_topic': rng.choice(['Programming', 'AI/ML', 'General'], n),
+        'word_count': word_count,
+        'question_depth': (word_count / 50 + rng.normal(0, 1, n)).round(),
+        'complexity_ma': word_count * 0.01 + rng.normal(0, 0.5, n),
+    })
+    for col, rate in zip(COLUMNS, [0.05, 0.1, 0.2]):
+        df.loc[rng.random(n) < rate, col] = np.nan
+    return df
+
+
+@pytest.mark.parametrize('by', ['hour', 'day_of_week', 'primary_topic'])
+def test_grouped_correlations_match_groupby_corr(frame, by):
+    """한 번에 구한 그룹별 상관관계가 그룹마다 DataFrame.corr()를 부른 결과와 같아야 함 (쌍별 결측 제외 포함)"""
+    result = grouped_correlations(frame, COLUMNS, by, min_rows=0)
+    expected = {key: group[COLUMNS].corr() for key, group in frame.groupby(by)}
+    assert list(result) == sorted(expected)
+    for key, corr in expected.items():
+        pd.testing.assert_frame_equal(result[key], corr)
+
+
+def test_grouped_moments_counts_and_constant_groups(frame):
+    """쌍별 개수는 두 변수가 모두 있는 행 수, 분산이 0인 그룹의 상관관계는 DataFrame.corr()처럼 NaN"""
+    frame = frame.copy()
+    frame.loc[frame['hour'] == 3, 'question_depth'] = 2.0
+    keys, sizes, moments = grouped_moments(frame, COLUMNS, 'hour')
+    assert list(sizes) == frame.groupby('hour').size().tolist()
+
+    g = keys.tolist().index(3)
+    group = frame[frame['hour'] == 3]
+    both = group[['word_count', 'complexity_ma']].notna().all(axis=1).sum()
+    assert moments['count'][g, 0, 2] == moments['count'][g, 2, 0] == both
+
+    result = grouped_correlations(frame, COLUMNS, 'hour', min_rows=0)[3]
+    pd.testing.assert_frame_equal(result, group[COLUMNS].corr())
+    assert np.isnan(result.loc['question_depth', 'word_count'])
+
+
+def test_min_rows_drops_small_groups(frame):
+    """행 수가 min_rows 미만인 그룹은 결과에서 빠져야 함"""
+    frame = frame.copy()
+    frame.loc[frame.index[:5], 'primary_topic'] = 'Rare'
+    assert 'Rare' not in grouped_correlations(frame, COLUMNS, 'primary_topic', min_rows=11)
+    assert 'Rare' in grouped_correlations(frame, COLUMNS, 'primary_topic', min_rows=0)
@@ -0,0 +1,151 @@
+# test_aggregate_cube.py
+# 집계 큐브 롤업 회귀 테스트 (python -m pytest -q)
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from aggregate_cube import AggregationCube
+
+
+@pytest.fixture
+def frame():
+    """여러 날짜/시간대/토픽에 걸친 행 단위 데이터 (한 칸에 여러 행이 모이도록 키 값 수를 줄임)"""
+    rng = np.random.default_rng(0)
+    n = 600
+    times = pd.Timestamp('2025-05-01') + pd.to_timedelta(rng.integers(0, 24 * 10, n), unit='h')
+    word_count = rng.integers(1, 200, n).astype(float)
+    return pd.DataFrame({
+        'date': times.date,
+        'hour': times.hour,
+        'day_of_week': times.day_name(),
+        'primary_topic': rng.choice(['Python', 'SQL', 'React', 'General'], n),
+        'is_learning_related': rng.random(n) < 0.7,
+        'word_count': word_count,
+        'question_depth': rng.integers(0, 8, n).astype(float),
+        'complexity_ma': word_count / 10 + rng.normal(size=n),
+    })
+
+
+def test_rollups_match_row_level_groupby(frame):
+    cube = AggregationCube.build(frame)
+    assert cube.total_rows == len(frame) and len(cube) < len(frame)
+
+    assert cube.count() == len(frame)
+    pd.testing.assert_series_equal(cube.count('hour'), frame.groupby('hour')['word_count'].size(),
+                                   check_names=False, check_dtype=False)
+    pd.testing.assert_series_equal(cube.mean('word_count', 'day_of_week'),
+                                   frame.groupby('day_of_week')['word_count'].mean(), check_names=False)
+    learning = frame[frame['is_learning_related']]
+    pd.testing.assert_series_equal(cube.mean('question_depth', 'primary_topic', learning_only=True),
+                                   learning.groupby('primary_topic')['question_depth'].mean(), check_names=False)
+    assert cube.value_counts('primary_topic').to_dict() == frame['primary_topic'].value_counts().to_dict()
+    assert list(cube.value_counts('primary_topic').index) == list(frame['primary_topic'].value_counts().index)
+
+
+def test_correlation_rollups_match_pandas(frame):
+    cube = AggregationCube.build(frame)
+    columns = ['word_count', 'question_depth', 'complexity_ma', 'hour']
+
+    overall = cube.correlations(columns)
+    np.testing.assert_allclose(overall.to_numpy(), frame[columns].corr().to_numpy(), atol=1e-10)
+
+    by_day = cube.correlations(columns, by='day_of_week', min_rows=11)
+    expected = {day: group[columns].corr() for day, group in frame.groupby('day_of_week') if len(group) >= 11}
+    assert list(by_day) == sorted(expected)
+    for day, matrix in by_day.items():
+        np.testing.assert_allclose(matrix.to_numpy(), expected[day].to_numpy(), atol=1e-10)
+
+
+def test_missing_measure_falls_back(frame):
+    """값 컬럼에 결측이 있으면 상관관계는 None (평균은 결측을 건너뜀)"""
+    frame.loc[3, 'word_count'] = np.nan
+    cube = AggregationCube.build(frame)
+    assert cube.correlations(['word_count', 'question_depth']) is None
+    pd.testing.assert_series_equal(cube.mean('word_count', 'hour'), frame.groupby('hour')['word_count'].mean(),
+                                   check_names=False)
+
+
+def test_save_and_load_round_trip(frame, tmp_path):
+    cube = AggregationCube.build(frame)
+    loaded = AggregationCube.load(cube.save(str(tmp_path / "cube.feather")))
+    assert loaded.total_rows == cube.total_rows
+    pd.testing.assert_series_equal(loaded.mean('complexity_ma', 'hour'), cube.mean('complexity_ma', 'hour'))
+
+
+def test_correlations_stay_accurate_for_large_values():
+    """값이 큰 컬럼도 원시 합의 상쇄 오차 없이 행 단위 상관관계와 같아야 함"""
+    rng = np.random.default_rng(1)
+    n = 50000
+    times = pd.Timestamp('2025-05-01') + pd.to_timedelta(rng.integers(0, 24 * 10, n), unit='h')
+    word_count = 1e7 + rng.normal(size=n)
+    frame = pd.DataFrame({
+        'date': times.date, 'hour': times.hour, 'day_of_week': times.day_name(),
+        'primary_topic': 'Python', 'is_learning_related': True,
+        'word_count': word_count, 'question_depth': rng.integers(0, 8, n).astype(float),
+        'complexity_ma': word_count + rng.normal(size=n),
+    })
+    corr = AggregationCube.build(frame).correlations(['word_count', 'complexity_ma'])
+    expected = np.corrcoef(frame['word_count'], frame['complexity_ma'])[0, 1]
+    assert abs(corr.loc['word_count', 'complexity_ma'] - expected) < 1e-8
+
+
+def _analyzer(frame, cube):
+    from advanced_correlation_analyzer import AdvancedCorrelationAnalyzer
+    analyzer = AdvancedCorrelationAnalyzer(None)
+    analyzer.df = frame
+    analyzer.cube = cube
+    return analyzer
+
+
+def test_analyzer_cube_correlations_match_row_path(frame):
+    """상관관계 분석기의 전체/시간대별/요일별 상관관계가 큐브가 있을 때와 없을 때 같아야 함"""
+    with_cube = _analyzer(frame, AggregationCube.build(frame))
+    without_cube = _analyzer(frame, None)
+
+    cube_result, row_result = with_cube.calculate_correlations(), without_cube.calculate_correlations()
+    np.testing.assert_allclose(cube_result['overall'].to_numpy(), row_result['overall'].to_numpy(), atol=1e-10)
+    assert list(cube_result['hourly']) == list(row_result['hourly'])
+    for hour, matrix in cube_result['hourly'].items():
+        np.testing.assert_allclose(matrix.to_numpy(), row_result['hourly'][hour].to_numpy(), atol=1e-10)
+
+    cube_days = with_cube._cube_correlations(['word_count', 'question_depth'], by='day_of_week')
+    row_days = without_cube._cube_correlations(['word_count', 'question_depth'], by='day_of_week')
+    assert list(cube_days) == list(row_days)
+    for day, matrix in cube_days.items():
+        np.testing.assert_allclose(matrix.to_numpy(), row_days[day].to_numpy(), atol=1e-10)
+
+
+def test_analyzer_falls_back_to_rows_when_measure_is_missing(frame):
+    """값 컬럼에 결측이 있으면 큐브가 있어도 행 단위 상관관계(쌍별 결측 제외)를 반환해야 함"""
+    frame.loc[3, 'word_count'] = np.nan
+    columns = ['word_count', 'question_depth', 'hour']
+    analyzer = _analyzer(frame, AggregationCube.build(frame))
+    pd.testing.assert_frame_equal(analyzer._cube_correlations(columns), frame[columns].corr())
+    by_hour = analyzer._cube_correlations(columns, by='hour')
+    assert by_hour and all(not matrix.isna().all().all() for matrix in by_hour.values())
+
+
+def test_question_level_cube_path_matches_row_path(frame):
+    """질문 수준 집계값이 큐브 롤업과 행 단위 계산에서 같아야 함"""
+    from question_level_analyzer_en import QuestionLevelAnalyzer
+    frame['timestamp'] = pd.to_datetime(frame['date']) + pd.to_timedelta(frame['hour'], unit='h')
+    frame['content'] = "how does python work?"
+    frame['conversation_title'] = "python study"
+
+    def compute(cube):
+        analyzer = QuestionLevelAnalyzer(None)
+        analyzer.df = frame
+        analyzer.cube = cube
+        return analyzer.compute_question_level_data()
+
+    cube_data, row_data = compute(AggregationCube.build(frame)), compute(None)
+    assert cube_data['learning_count'] == row_data['learning_count']
+    for name in ['daily_depth', 'weekly_depth', 'monthly_depth']:
+        assert list(cube_data[name].index) == list(pd.to_datetime(row_data[name].index)), name
+        np.testing.assert_allclose(cube_data[name].to_numpy(dtype=float), row_data[name].to_numpy(dtype=float),
+                                   atol=1e-12, err_msg=name)
+    row_trends = row_data['category_trends']
+    np.testing.assert_array_equal(cube_data['category_trends'].to_numpy(dtype=float),
+                                  row_trends.reindex(columns=list(cube_data['category_trends'].columns))
+                                  .to_numpy(dtype=float))
@@ -0,0 +1,131 @@
+# test_analytics_service.py
+# 로컬 분석 서비스 회귀 테스트 (python -m pytest -q)
+
+import json
+import threading
+import urllib.error
+import urllib.request
+
+import pandas as pd
+import pytest
+
+import analytics_service
+from analytics_service import AnalyticsService, make_server
+
+
+def _failing_render(data, chart_path):
+    """렌더러 내부 오류 흉내 (빈 섹션의 KeyError, chart_dir 쓰기 OSError 등)"""
+    raise data['error']
+
+
+def _reloading_render(data, chart_path):
+    """렌더링 도중 백그라운드 재로드가 끝난 상황 흉내 - 서비스를 다음 세대로 바꾼 뒤 이전 세대 차트를 저장"""
+    service = data['service']
+    service.generation += 1
+    service._current = (service.generation, {'stats': {'total_messages': 4}})
+    with open(chart_path, 'wb') as f:
+        f.write(b"chart from generation 1")
+
+
+@pytest.fixture
+def service(monkeypatch):
+    """데이터를 로드하지 않고 집계값만 채운 서비스 (차트는 실패하는 렌더러로 연결)"""
+    monkeypatch.setitem(analytics_service.SERVICE_CHARTS, 'broken_key',
+                        ('test_analytics_service', '_failing_render', 'broken_key'))
+    monkeypatch.setitem(analytics_service.SERVICE_CHARTS, 'broken_io',
+                        ('test_analytics_service', '_failing_render', 'broken_io'))
+    monkeypatch.setitem(analytics_service.SERVICE_CHARTS, 'reloading',
+                        ('test_analytics_service', '_reloading_render', 'reloading'))
+    service = AnalyticsService('unused.jsonl', reload_interval=None)
+    service.generation = 1
+    service._current = (1, {
+        'stats': {'total_messages': 3},
+        'dashboard': {'hourly_eff': pd.Series([0.5, 0.7], index=[9, 10])},
+        'correlation': None,
+        'broken_key': {'error': KeyError('hourly_values')},
+        'broken_io': {'error': OSError("chart dir is gone")},
+        'reloading': {'service': service},
+    })
+    return service
+
+
+def test_lookup_failures_are_404(service):
+    for path in ['/nope', '/dashboard/missing', '/stats/total_messages/0', '/charts/unknown.png',
+                 '/charts/correlation.png']:
+        status, content_type, body, _, _ = service.query(path)
+        assert status == 404, path
+        assert 'Unknown path' in json.loads(body)['error']
+
+
+@pytest.mark.parametrize('path', ['/charts/broken_key.png', '/charts/broken_io.png'])
+def test_render_errors_are_500_not_404(service, path):
+    status, content_type, body, hit, _ = service.query(path)
+    assert status == 500
+    assert content_type == 'application/json'
+    assert json.loads(body)['error'].startswith(f"Failed to answer {path}")
+    assert not hit
+
+
+def test_values_are_served_and_cached(service):
+    status, _, body, hit, _ = service.query('/dashboard/hourly_eff')
+    assert status == 200 and not hit
+    assert json.loads(body) == {'9': 0.5, '10': 0.7}
+    assert service.query('/dashboard/hourly_eff')[3]
+
+
+def test_http_client_receives_500_response(service):
+    """렌더링 오류에도 연결이 끊기지 않고 500 JSON 응답을 받아야 함"""
+    server = make_server(service, port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        url = f"http://127.0.0.1:{server.server_address[1]}/charts/broken_io.png"
+        with pytest.raises(urllib.error.HTTPError) as error:
+            urllib.request.urlopen(url, timeout=5)
+        assert error.value.code == 500
+        assert 'chart dir is gone' in json.loads(error.value.read())['error']
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_generation_header_matches_served_body(service, tmp_path):
+    """요청 처리 중에 재로드되어도 X-Data-Generation은 본문을 만든 세대여야 함"""
+    service.chart_dir = str(tmp_path)
+    server = make_server(service, port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        base = f"http://127.0.0.1:{server.server_address[1]}"
+        with urllib.request.urlopen(f"{base}/charts/reloading.png", timeout=5) as response:
+            assert response.read() == b"chart from generation 1"
+            assert response.headers['X-Data-Generation'] == '1'
+        with urllib.request.urlopen(f"{base}/health", timeout=5) as response:
+            assert response.headers['X-Data-Generation'] == '2'
+            health = json.loads(response.read())
+        assert health['generation'] == 2 and health['total_messages'] == 4
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_integer_and_date_keys_can_be_queried(service):
+    """응답에 나온 키(정수 시간대, 날짜)를 그대로 경로로 써도 조회되어야 함"""
+    generation, aggregates = service._current
+    aggregates['dashboard']['daily_growth'] = pd.Series([1.5], index=pd.to_datetime(['2025-05-01']))
+    assert json.loads(service.query('/dashboard/hourly_eff/9')[2]) == 0.5
+    daily = json.loads(service.query('/dashboard/daily_growth')[2])
+    assert list(daily) == ['2025-05-01']
+    assert json.loads(service.query('/dashboard/daily_growth/2025-05-01')[2]) == 1.5
+    assert service.query('/dashboard/hourly_eff/11')[0] == 404
+
+
+def test_failed_first_load_exits_non_zero(monkeypatch, capsys):
+    def fail(self):
+        raise RuntimeError("Failed to load data: missing.jsonl")
+
+    monkeypatch.setattr(AnalyticsService, 'load', fail)
+    with pytest.raises(SystemExit) as exit_info:
+        analytics_service.main(['missing.jsonl', '--reload-interval', '0'])
+    assert exit_info.value.code == 1
+    assert "❌ Failed to load data: missing.jsonl" in capsys.readouterr().out
@@ -0,0 +1,43 @@
+# test_chart_renderer.py
+# 차트 렌더링/렌더 캐시 회귀 테스트 (python -m pytest -q)
+
+import importlib
+
+import pytest
+
+from chart_renderer import chart_key, render_charts
+
+matplotlib = pytest.importorskip('matplotlib')
+
+
+def _write_backend(data, chart_path):
+    """렌더링 시점의 matplotlib 백엔드 이름을 파일로 남기는 렌더 함수"""
+    with open(chart_path, 'w', encoding='utf-8') as f:
+        f.write(matplotlib.get_backend())
+    return chart_path
+
+
+def test_serial_path_renders_with_agg(tmp_path):
+    """현재 프로세스에서 순서대로 렌더링해도 풀 워커와 같이 Agg 백엔드를 써야 함"""
+    matplotlib.use('pdf')
+    paths = render_charts([(_write_backend, {}, str(tmp_path / "a.png"))], workers=1)
+    with open(paths[0], encoding='utf-8') as f:
+        assert f.read().lower() == 'agg'
+
+
+def test_chart_key_tracks_module_level_styling(tmp_path, monkeypatch):
+    """렌더 함수 본문이 같아도 같은 모듈의 스타일 상수가 바뀌면 차트 키가 바뀌어야 함"""
+    module_path = tmp_path / "styled_chart.py"
+    template = "LINE_COLOR = {color!r}\n\n\ndef render(data, chart_path):\n    return LINE_COLOR\n"
+    module_path.write_text(template.format(color='red'), encoding='utf-8')
+    monkeypatch.syspath_prepend(str(tmp_path))
+    module = importlib.import_module('styled_chart')
+    data = {'counts': [1, 2, 3]}
+
+    first = chart_key(module.render, data)
+    assert chart_key(module.render, data) == first
+    assert chart_key(module.render, {'counts': [1, 2, 4]}) != first
+
+    module_path.write_text(template.format(color='navy'), encoding='utf-8')
+    module = importlib.reload(module)
+    assert chart_key(module.render, data) != first
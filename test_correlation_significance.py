@@ -0,0 +1,63 @@
+# test_correlation_significance.py
+# 상관관계 유의성 회귀 테스트 (python -m pytest -q)
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import correlation_significance
+from correlation_significance import correlation_significance as significance, permutation_pvalues
+
+
+def _values(n, seed=0):
+    """0-1 열은 강한 상관, 2열은 독립"""
+    rng = np.random.default_rng(seed)
+    x = rng.normal(size=n)
+    return np.column_stack([x, x + 0.3 * rng.normal(size=n), rng.normal(size=n)])
+
+
+@pytest.mark.parametrize('exact_rows', [10_000, 100])
+def test_permutation_pvalues_separate_related_and_independent_pairs(monkeypatch, exact_rows):
+    """argsort 순열(작은 그룹)과 FFT 순환 이동(큰 그룹) 모두 상관 쌍은 최소 p값, 독립 쌍은 큰 p값"""
+    monkeypatch.setattr(correlation_significance, 'SIGNIFICANCE_EXACT_ROWS', exact_rows)
+    pvalues = permutation_pvalues(_values(1000), n_perm=199, rng=1)
+    assert pvalues[0, 1] == pvalues[1, 0] == pytest.approx(1 / 200)
+    assert pvalues[0, 2] > 0.05 and pvalues[1, 2] > 0.05
+    assert np.isnan(np.diag(pvalues)).all()
+
+
+def test_fft_cyclic_shifts_equal_direct_cross_products():
+    """FFT 교차상관 값 = 한 변수를 순환 이동한 뒤 직접 구한 교차 곱"""
+    z = correlation_significance._standardize(_values(257))
+    n = len(z)
+    spectra = np.fft.rfft(z, axis=0)
+    cross = np.fft.irfft(np.conj(spectra[:, 0]) * spectra[:, 2], n) / n
+    direct = np.array([z[:, 0] @ np.roll(z[:, 2], -shift) / n for shift in range(n)])
+    np.testing.assert_allclose(cross, direct, atol=1e-12)
+
+
+def test_fft_pvalues_are_uniform_under_null(monkeypatch):
+    """귀무가설(독립)에서 FFT 경로 p값이 한쪽으로 치우치지 않아야 함"""
+    monkeypatch.setattr(correlation_significance, 'SIGNIFICANCE_EXACT_ROWS', 100)
+    rng = np.random.default_rng(5)
+    pvalues = [permutation_pvalues(rng.normal(size=(400, 2)), n_perm=99, rng=rng)[0, 1] for _ in range(200)]
+    assert 0.35 < np.mean(pvalues) < 0.65
+    assert 0.02 < np.mean(np.array(pvalues) <= 0.1) < 0.2
+
+
+def test_grouped_results_are_reproducible_and_bracket_estimate():
+    rng = np.random.default_rng(3)
+    df = pd.DataFrame(_values(300, seed=3), columns=['a', 'b', 'c'])
+    df['group'] = rng.choice(['x', 'y', 'tiny'], size=len(df), p=[0.5, 0.48, 0.02])
+    df.loc[df.index[:3], 'a'] = np.nan
+
+    first = significance(df, ['a', 'b', 'c'], by='group', n_boot=200, n_perm=99, seed=7)
+    again = significance(df, ['a', 'b', 'c'], by='group', n_boot=200, n_perm=99, seed=7)
+    assert list(first) == ['x', 'y']  # min_rows 미만 그룹 제외
+    for key, result in first.items():
+        group = df[df['group'] == key].dropna(subset=['a', 'b', 'c'])
+        assert result['rows'] == len(group)
+        np.testing.assert_allclose(result['estimate'].to_numpy(), group[['a', 'b', 'c']].corr().to_numpy(), atol=1e-12)
+        assert (result['ci_low'].loc['a', 'b'] <= result['estimate'].loc['a', 'b'] <= result['ci_high'].loc['a', 'b'])
+        for table in ['estimate', 'ci_low', 'ci_high', 'p_value']:
+            pd.testing.assert_frame_equal(result[table], again[key][table])
@@ -0,0 +1,31 @@
+# test_dashboard_creator.py
+# 대시보드 집계 회귀 테스트 (python -m pytest -q)
+
+import pandas as pd
+
+from dashboard_creator_en import DashboardCreator
+from data_loader_en import AnalysisWindow
+
+
+def _write_export(path):
+    times = pd.date_range('2025-02-01', '2025-11-30', freq='7D')
+    pd.DataFrame({
+        'timestamp': times,
+        'content': [f"why is sql join {i} slow?" for i in range(len(times))],
+        'conversation_title': "sql study",
+    }).to_csv(path, index=False)
+    return times
+
+
+def test_standalone_creator_defaults_to_unbounded_window(tmp_path):
+    """조건 없이 직접 만들면 기간 제한 없이 CSV 전체를 읽고, 조건을 주면 그 조건으로만 거름"""
+    path = tmp_path / "export.csv"
+    times = _write_export(path)
+
+    creator = DashboardCreator(str(path))
+    assert len(creator.load_data()) == len(times)
+    assert creator.window.label() == "All Dates"
+
+    window = AnalysisWindow()
+    bounded = DashboardCreator(str(path), window=window).load_data()
+    assert bounded['timestamp'].tolist() == [t for t in times if window.start_date <= t <= window.end_date]
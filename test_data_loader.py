@@ -0,0 +1,319 @@
+# test_data_loader.py
+# 데이터 로더 회귀 테스트 (python -m pytest -q)
+
+import json
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from data_loader_en import (
+    CSV_SCHEMA, LEARNING_KEYWORDS, TECH_TERMS, TEXT_FEATURE_COLUMNS, AnalysisWindow, DataLoader, add_text_features,
+    compact_frame, read_csv_projected
+)
+
+
+def _write_jsonl(path, times):
+    with open(path, 'w', encoding='utf-8') as f:
+        for i, created in enumerate(times):
+            record = {'id': f"j{i}", 'create_time': created, 'content': f"how does python list {i} work?",
+                      'conversation_title': "python study"}
+            f.write(json.dumps(record) + "\n")
+
+
+def _write_csv(path, timestamps):
+    pd.DataFrame({
+        'id': [f"c{i}" for i in range(len(timestamps))],
+        'timestamp': timestamps,
+        'content': [f"why is sql join {i} slow?" for i in range(len(timestamps))],
+        'conversation_title': "sql study",
+    }).to_csv(path, index=False)
+
+
+def test_mixed_csv_and_jsonl_directory_keeps_csv_rows(tmp_path):
+    """create_time만 있는 JSONL과 timestamp만 있는 CSV를 한 디렉터리로 읽어도 CSV 행이 남아야 함"""
+    start = pd.Timestamp('2025-05-01 09:00')
+    _write_jsonl(tmp_path / "a.jsonl", [(start + pd.Timedelta(hours=i)).timestamp() for i in range(5)])
+    csv_times = [start + pd.Timedelta(days=1, hours=i) for i in range(5)]
+    _write_csv(tmp_path / "b.csv", [t.isoformat() for t in csv_times])
+
+    loader = DataLoader(str(tmp_path), workers=1)
+    assert loader.load_data()
+
+    data = loader.data
+    assert len(data) == 10
+    assert data['timestamp'].notna().all()
+    csv_rows = data[data['id'].astype(str).str.startswith('c')]
+    assert sorted(csv_rows['timestamp']) == csv_times
+
+
+def test_single_csv_with_timestamp_only(tmp_path):
+    """timestamp만 있는 CSV 하나는 기존처럼 그대로 로드"""
+    times = [pd.Timestamp('2025-06-01 10:00') + pd.Timedelta(hours=i) for i in range(5)]
+    _write_csv(tmp_path / "b.csv", [t.isoformat() for t in times])
+
+    loader = DataLoader(str(tmp_path / "b.csv"))
+    assert loader.load_data()
+    assert list(loader.data['timestamp']) == times
+
+
+def test_cache_entries_for_different_options_coexist(tmp_path):
+    """같은 원본을 다른 분석 조건/compact로 번갈아 읽어도 서로의 캐시를 지우지 않고, 원본이 바뀌면 모두 정리"""
+    source = tmp_path / "a.jsonl"
+    start = pd.Timestamp('2025-05-01 09:00')
+    _write_jsonl(source, [(start + pd.Timedelta(hours=i)).timestamp() for i in range(30)])
+    cache_dir = tmp_path / "cache"
+    morning = AnalysisWindow(hours=range(0, 12))
+
+    def load(**options):
+        loader = DataLoader(str(source), cache_dir=str(cache_dir), **options)
+        assert loader.load_data()
+        return loader
+
+    first_paths = {load()._cache_path(), load(window=morning)._cache_path(), load(compact=True)._cache_path()}
+    assert len(first_paths) == 3
+    assert {str(p) for p in cache_dir.glob("*.feather")} == first_paths
+
+    # 두 번째 실행은 모두 캐시에서 읽음 (다른 옵션의 캐시 쓰기로 지워지지 않음)
+    for options in [{}, {'window': morning}, {'compact': True}]:
+        loader = DataLoader(str(source), cache_dir=str(cache_dir), **options)
+        assert loader._read_cache() is not None
+
+    # 원본이 바뀌면 새 캐시를 쓸 때 이전 지문의 캐시는 옵션과 관계없이 삭제
+    _write_jsonl(source, [(start + pd.Timedelta(hours=i)).timestamp() for i in range(31)])
+    current = load()._cache_path()
+    assert [str(p) for p in cache_dir.glob("*.feather")] == [current]
+
+
+def test_topic_window_cache_depends_on_title_topic_rules(tmp_path, monkeypatch):
+    """토픽 조건이 있는 캐시는 제목 토픽 분류 규칙이 바뀌면 다른 캐시 파일을 써야 함"""
+    import data_loader_en
+    source = tmp_path / "a.jsonl"
+    _write_jsonl(source, [pd.Timestamp('2025-05-01 09:00').timestamp()])
+    topics = AnalysisWindow(topics=['Programming'])
+
+    before = DataLoader(str(source), cache_dir=str(tmp_path), window=topics)._cache_path()
+    unfiltered = DataLoader(str(source), cache_dir=str(tmp_path))._cache_path()
+    monkeypatch.setattr(data_loader_en, 'TITLE_TOPIC_RULES_KEY', 'changed-rules')
+    assert DataLoader(str(source), cache_dir=str(tmp_path), window=topics)._cache_path() != before
+    assert DataLoader(str(source), cache_dir=str(tmp_path))._cache_path() == unfiltered
+
+
+def test_second_load_is_served_from_cache(tmp_path, monkeypatch):
+    """두 번째 로드는 원본을 파싱하지 않고 Feather 캐시에서 같은 데이터를 읽어야 함"""
+    pytest.importorskip('pyarrow')
+    source = tmp_path / "a.jsonl"
+    start = pd.Timestamp('2025-05-01 09:00')
+    _write_jsonl(source, [(start + pd.Timedelta(hours=i)).timestamp() for i in range(20)])
+    first = DataLoader(str(source), cache_dir=str(tmp_path / "cache"))
+    assert first.load_data()
+
+    def fail(self, *args, **kwargs):
+        raise AssertionError("source parsed again")
+
+    monkeypatch.setattr(DataLoader, '_load_jsonl', fail)
+    second = DataLoader(str(source), cache_dir=str(tmp_path / "cache"))
+    assert second.load_data()
+    pd.testing.assert_frame_equal(second.data, first.data.reset_index(drop=True), check_dtype=False)
+
+
+def test_touched_source_evicts_stale_cache_and_reloads(tmp_path):
+    """원본이 바뀌면 이전 지문의 캐시를 지우고 바뀐 원본을 다시 읽어야 함"""
+    pytest.importorskip('pyarrow')
+    source = tmp_path / "a.jsonl"
+    cache_dir = tmp_path / "cache"
+    start = pd.Timestamp('2025-05-01 09:00')
+    _write_jsonl(source, [(start + pd.Timedelta(hours=i)).timestamp() for i in range(20)])
+    first = DataLoader(str(source), cache_dir=str(cache_dir))
+    assert first.load_data()
+    stale_path = first._cache_path()
+
+    _write_jsonl(source, [(start + pd.Timedelta(hours=i)).timestamp() for i in range(25)])
+    os.utime(source, ns=(os.stat(source).st_atime_ns, os.stat(source).st_mtime_ns + 10 ** 9))
+    second = DataLoader(str(source), cache_dir=str(cache_dir))
+    assert second._cache_path() != stale_path
+    assert second.load_data()
+    assert len(second.data) == 25
+    assert not os.path.exists(stale_path)
+    assert [str(p) for p in cache_dir.glob("*.feather")] == [second._cache_path()]
+
+
+def _baseline_text_features(content):
+    """이전 행 단위 계산 (DataLoader / QuestionLevelAnalyzer의 문자열 검사와 apply)"""
+    learning_keywords = LEARNING_KEYWORDS
+    tech_terms = TECH_TERMS
+    lowered = content.str.lower()
+    has_question = content.str.contains(r'\?|what|how|why|when|where', case=False, na=False)
+    tech_term_density = lowered.apply(
+        lambda x: sum(1 for term in tech_terms if term in str(x)) / len(tech_terms) if x else 0)
+    learning_mask = lowered.apply(lambda x: any(keyword in str(x) for keyword in learning_keywords))
+    return pd.DataFrame({
+        'word_count': content.str.len(),
+        'question_depth': has_question.astype(int),
+        'has_question': has_question,
+        'tech_term_density': tech_term_density,
+        'is_learning_related': learning_mask | has_question | (tech_term_density > 0.1),
+    })
+
+
+def test_text_features_match_baseline_row_logic():
+    """한 번에 계산한 텍스트 파생 컬럼이 이전 행 단위 계산과 같아야 함 (대소문자, 문장부호, 여러 단어 키워드)"""
+    content = pd.Series([
+        "How does Python work?", "WHERE is my Data", "plain chat", "", "Machine Learning and AI training!",
+        "deep-learning vs deep learning", "neural network model algorithm data python", "¿Qué? 学习 python",
+        "explain linear algebra", "WhenEver", "ok.",
+    ])
+    expected = _baseline_text_features(content)
+    result = add_text_features(pd.DataFrame({'content': content}))
+    for col in TEXT_FEATURE_COLUMNS:
+        pd.testing.assert_series_equal(result[col], expected[col], check_dtype=False, check_names=False)
+
+
+@pytest.mark.parametrize('window', [
+    AnalysisWindow(),
+    AnalysisWindow('2025-05-01', '2025-05-03', hours=[8, 9, 22]),
+    AnalysisWindow('2025-03-01', '2025-12-31'),
+])
+def test_jsonl_window_pushdown_matches_load_then_filter(tmp_path, window):
+    """파싱 중 기간/시간대 밖 레코드를 버린 결과가 전체를 읽은 뒤 거른 결과와 같아야 함 (청크 경계 포함)"""
+    source = tmp_path / "a.jsonl"
+    rng = np.random.default_rng(0)
+    start = pd.Timestamp('2025-03-25')
+    created = (start + pd.to_timedelta(rng.integers(0, 3600 * 24 * 200, 300), unit='s')).map(pd.Timestamp.timestamp)
+    _write_jsonl(source, list(created) + [pd.Timestamp('2025-08-31').timestamp(), pd.Timestamp('2025-04-01').timestamp()])
+
+    full = pd.read_json(source, lines=True)
+    full['timestamp'] = pd.to_datetime(full['create_time'], unit='s')
+    expected = window.apply(full)['id'].tolist()
+
+    loader = DataLoader(str(source), window=window)
+    assert sorted(loader._load_jsonl(chunk_size=7)['id']) == sorted(expected)
+    assert loader.load_data()
+    assert loader.data['id'].tolist() == expected
+
+
+@pytest.mark.parametrize('window', [
+    AnalysisWindow(),
+    AnalysisWindow('2025-06-01', '2025-06-02', hours=[0, 23]),
+    AnalysisWindow('2025-04-15', '2025-07-01', hours=range(9, 18), topics=['Programming']),
+])
+def test_window_mask_matches_hard_coded_filter_and_epoch_check(window):
+    """기간/시간대 마스크가 이전의 하드코딩 필터와 같고, 파싱 중 조기 판단(accepts_epoch)과도 같아야 함 (경계 포함)"""
+    rng = np.random.default_rng(1)
+    base = pd.Timestamp('2025-03-20')
+    times = base + pd.to_timedelta(rng.integers(0, 3600 * 24 * 180, 500), unit='s')
+    times = times.append(pd.DatetimeIndex([window.start_date, window.end_date,
+                                           window.end_date + pd.Timedelta(seconds=1),
+                                           window.start_date - pd.Timedelta(seconds=1)]))
+    df = pd.DataFrame({'timestamp': times,
+                       'primary_topic': rng.choice(['Programming', 'General'], len(times))})
+
+    expected = (df['timestamp'] >= window.start_date) & (df['timestamp'] <= window.end_date)
+    if window.hours is not None:
+        expected &= df['timestamp'].dt.hour.isin(list(window.hours))
+    pd.testing.assert_series_equal(window.mask(df.drop(columns='primary_topic')), expected, check_names=False)
+    if window.topics is not None:
+        expected &= df['primary_topic'].isin(list(window.topics))
+    pd.testing.assert_series_equal(window.mask(df), expected, check_names=False)
+
+    accepted = [window.accepts_epoch(t.timestamp()) for t in times]
+    assert accepted == window.mask(df[['timestamp']]).tolist()
+
+
+def test_compact_frame_keeps_aggregates():
+    """compact 변환 전후 시간대/요일/날짜/토픽별 집계가 같아야 함 (빈 category 그룹 제외)"""
+    rng = np.random.default_rng(2)
+    n = 400
+    timestamp = pd.Timestamp('2025-05-01') + pd.to_timedelta(rng.integers(0, 3600 * 24 * 20, n), unit='s')
+    data = pd.DataFrame({
+        'timestamp': timestamp,
+        'date': timestamp.date,
+        'hour': timestamp.hour.astype('int64'),
+        'day_of_week': timestamp.day_name(),
+        'conversation_title': rng.choice(["python study", "sql study", "chat"], n),
+        'primary_topic': rng.choice(['Programming', 'Data Science', 'General'], n),
+        'word_count': rng.integers(1, 300, n),
+        'question_depth': rng.integers(0, 4, n),
+    })
+    compact = compact_frame(data)
+    assert compact['hour'].dtype == 'int8' and isinstance(compact['day_of_week'].dtype, pd.CategoricalDtype)
+    assert compact_frame(compact) is compact
+
+    def aggregate(frame, by, col):
+        keys = [by] if isinstance(by, str) else by
+        flat = frame.groupby(by, observed=True)[col].agg(['mean', 'sum', 'count']).reset_index()
+        for key in keys:
+            flat[key] = flat[key].astype(data[key].dtype)
+        return flat.set_index(keys).sort_index().astype(float)
+
+    for by in ['hour', 'day_of_week', 'primary_topic', 'conversation_title', ['day_of_week', 'hour']]:
+        for col in ['word_count', 'question_depth']:
+            pd.testing.assert_frame_equal(aggregate(compact, by, col), aggregate(data, by, col))
+
+    daily = compact.groupby('date')['word_count'].sum()
+    expected = data.groupby('date')['word_count'].sum()
+    assert daily.index.tolist() == pd.to_datetime(expected.index).tolist()
+    assert daily.tolist() == expected.tolist()
+
+
+@pytest.fixture(params=['pyarrow', 'c'])
+def csv_engine(request, monkeypatch):
+    """CSV 파서 경로 - pyarrow 멀티스레드 파서와 pyarrow가 없을 때의 기본 C 파서"""
+    if request.param == 'pyarrow':
+        pytest.importorskip('pyarrow')
+    else:
+        monkeypatch.setitem(sys.modules, 'pyarrow', None)
+    return request.param
+
+
+def _export_frame(n=50):
+    times = pd.Timestamp('2025-06-01 08:30') + pd.to_timedelta(np.arange(n) * 5437, unit='s')
+    return pd.DataFrame({
+        'id': [f"c{i}" for i in range(n)],
+        'timestamp': times,
+        'content': [f'why is "join", {i} slow?' for i in range(n)],
+        'conversation_title': "sql study",
+        'word_count': np.arange(n) * 1.5,
+        'hour': times.hour,
+        'unused_blob': ["x" * 50] * n,
+    })
+
+
+def test_projected_csv_matches_full_read(tmp_path, csv_engine):
+    """스키마 컬럼만 읽은 결과가 전체를 읽고 같은 컬럼을 고른 결과와 같아야 함 (timestamp는 바로 datetime)"""
+    path = tmp_path / "export.csv"
+    _export_frame().to_csv(path, index=False)
+
+    result = read_csv_projected(path)
+    expected = pd.read_csv(path, parse_dates=['timestamp'])
+    expected = expected[[col for col in expected.columns if col in CSV_SCHEMA]]
+    assert sorted(result.columns) == sorted(expected.columns)
+    assert pd.api.types.is_datetime64_any_dtype(result['timestamp'])
+    pd.testing.assert_frame_equal(result[expected.columns], expected, check_dtype=False)
+
+
+def test_projected_csv_falls_back_to_inferred_dtypes(tmp_path, csv_engine):
+    """선언 dtype으로 읽을 수 없는 값이 있어도 스키마 컬럼은 모두 읽혀야 함"""
+    path = tmp_path / "export.csv"
+    frame = _export_frame()
+    frame['hour'] = frame['hour'].astype(object)
+    frame.loc[3, 'hour'] = "morning"
+    frame.to_csv(path, index=False)
+
+    result = read_csv_projected(path)
+    assert 'unused_blob' not in result.columns
+    assert result['hour'].astype(str).tolist() == frame['hour'].astype(str).tolist()
+    assert result['content'].tolist() == frame['content'].tolist()
+
+
+def test_window_labels_for_open_periods():
+    """기간 제한이 없거나 한쪽만 있는 조건도 보고서/차트 제목에 읽을 수 있는 기간 문자열을 내야 함"""
+    assert AnalysisWindow().period_text() == "2025-04-01 ~ 2025-08-31"
+    assert AnalysisWindow().label() == "April-August 2025"
+    assert AnalysisWindow.unbounded().period_text() == "all dates"
+    assert AnalysisWindow.unbounded().label() == "All Dates"
+    assert AnalysisWindow('2025-06-01', pd.Timestamp.max).label() == "Since June 2025"
+    assert AnalysisWindow(pd.Timestamp.min, '2025-06-30').period_text() == "~ 2025-06-30"
+    assert AnalysisWindow.unbounded().mask(pd.DataFrame({'timestamp': pd.to_datetime(['1990-01-01', '2100-01-01'])})).all()
@@ -0,0 +1,116 @@
+# test_incremental_stats.py
+# 증분 집계 회귀 테스트 (python -m pytest -q)
+
+import json
+
+import numpy as np
+import pandas as pd
+
+from incremental_stats import IncrementalLearningStats
+from main_executor_en import MainExecutor
+
+
+def _write_batch(path, start, rows, seed=0):
+    """start부터 한 시간 간격 메시지 rows개짜리 JSONL 배치"""
+    rng = np.random.default_rng(seed)
+    words = ["python", "list", "how", "why", "sql", "join", "react", "state", "data", "model"]
+    with open(path, 'w', encoding='utf-8') as f:
+        for i in range(rows):
+            content = " ".join(rng.choice(words, size=rng.integers(3, 30))) + ("?" * int(rng.integers(0, 3)))
+            record = {'id': f"{path.stem}-{i}", 'create_time': (start + pd.Timedelta(hours=i)).timestamp(),
+                      'content': content, 'conversation_title': "python study"}
+            f.write(json.dumps(record) + "\n")
+    return path
+
+
+def test_batch_after_default_window_is_applied(tmp_path):
+    """기본 분석 기간(2025-08-31까지) 이후 날짜의 배치도 증분 상태에 반영되어야 함"""
+    batch = _write_batch(tmp_path / "batch.jsonl", pd.Timestamp('2026-03-02 08:00'), 30)
+    state_path = str(tmp_path / "state.json")
+
+    results = MainExecutor(str(batch), cache_dir=None).run_incremental_update(str(batch), state_path)
+    assert results['total_messages'] == 30
+
+
+def test_same_batch_twice_is_applied_once(tmp_path):
+    """같은 배치를 두 번 실행해도 충분통계량이 두 번 더해지지 않아야 함"""
+    batch = _write_batch(tmp_path / "batch.jsonl", pd.Timestamp('2026-03-02 08:00'), 30)
+    state_path = str(tmp_path / "state.json")
+    executor = MainExecutor(str(batch), cache_dir=None)
+
+    first = executor.run_incremental_update(str(batch), state_path)
+    second = executor.run_incremental_update(str(batch), state_path)
+    assert first['total_messages'] == second['total_messages'] == 30
+    pd.testing.assert_frame_equal(first['correlations']['overall'], second['correlations']['overall'])
+
+    # 새 배치는 그대로 반영
+    other = _write_batch(tmp_path / "next.jsonl", pd.Timestamp('2026-03-05 08:00'), 20, seed=1)
+    assert executor.run_incremental_update(str(other), state_path)['total_messages'] == 50
+    assert len(IncrementalLearningStats.load(state_path).applied_batches) == 2
+
+
+def test_merged_batches_match_full_correlations(tmp_path):
+    """배치 두 개를 차례로 반영한 상관관계 = 전체를 한 번에 계산한 상관관계"""
+    first = _write_batch(tmp_path / "a.jsonl", pd.Timestamp('2025-05-01 00:00'), 60, seed=2)
+    second = _write_batch(tmp_path / "b.jsonl", pd.Timestamp('2025-05-04 00:00'), 80, seed=3)
+    state_path = str(tmp_path / "state.json")
+    executor = MainExecutor(str(first), cache_dir=None)
+    executor.run_incremental_update(str(first), state_path)
+    merged = executor.run_incremental_update(str(second), state_path)
+
+    from data_loader_en import DataLoader
+    loader = DataLoader(str(tmp_path / "*.jsonl"), workers=1)
+    assert loader.load_data()
+    full = IncrementalLearningStats().update(loader.data).correlations()
+    np.testing.assert_allclose(merged['correlations']['overall'].to_numpy(), full['overall'].to_numpy(), atol=1e-12)
+
+
+def test_first_update_is_seeded_from_full_history(tmp_path):
+    """저장된 상태가 없으면 기본 원본 전체로 상태를 만든 뒤 배치를 더해야 함"""
+    base = _write_batch(tmp_path / "base.jsonl", pd.Timestamp('2025-05-01 00:00'), 60, seed=4)
+    batch = _write_batch(tmp_path / "batch.jsonl", pd.Timestamp('2026-03-02 08:00'), 30, seed=5)
+    results = MainExecutor(str(base), cache_dir=None).run_incremental_update(str(batch), str(tmp_path / "state.json"))
+    assert results['total_messages'] == 90
+
+
+def test_default_state_depends_on_window(tmp_path):
+    """분석 조건이 다른 실행은 서로 다른 기본 상태 파일을 써야 함"""
+    from data_loader_en import AnalysisWindow
+    base = _write_batch(tmp_path / "base.jsonl", pd.Timestamp('2025-05-01 00:00'), 48, seed=6)
+    batch = _write_batch(tmp_path / "batch.jsonl", pd.Timestamp('2026-03-02 00:00'), 24, seed=7)
+    cache_dir = str(tmp_path / "cache")
+
+    all_hours = MainExecutor(str(base), cache_dir=cache_dir).run_incremental_update(str(batch))
+    mornings = MainExecutor(str(base), cache_dir=cache_dir, window=AnalysisWindow(hours=range(6, 12)))
+    assert all_hours['total_messages'] == 72
+    assert mornings.run_incremental_update(str(batch))['total_messages'] == 18
+    assert len(list((tmp_path / "cache").glob("incremental_stats-*.json"))) == 2
+
+
+def test_overlapping_batch_adds_only_new_messages(tmp_path):
+    """이전 배치와 겹치는 메시지는 다시 더하지 않고, 늦게 들어온 과거 시각의 메시지는 반영해야 함"""
+    lines = _write_batch(tmp_path / "all.jsonl", pd.Timestamp('2026-03-02 00:00'), 50, seed=8).read_text().splitlines()
+    late = json.dumps({'id': "late-0", 'create_time': pd.Timestamp('2026-03-01 12:00').timestamp(),
+                       'content': "why python list?", 'conversation_title': "python study"})
+    first, overlap = tmp_path / "a.jsonl", tmp_path / "b.jsonl"
+    first.write_text("\n".join(lines[:30]) + "\n")
+    overlap.write_text("\n".join(lines[24:] + [late]) + "\n")  # 앞 6개 메시지가 겹침
+    state_path = str(tmp_path / "state.json")
+    executor = MainExecutor(str(first), cache_dir=None)
+    executor.run_incremental_update(str(first), state_path)
+    assert executor.run_incremental_update(str(overlap), state_path)['total_messages'] == 51
+    assert IncrementalLearningStats.load(state_path).skipped_rows == 6
+
+
+def test_compact_batches_match_default_batches(tmp_path):
+    """compact 모드(category date/day_of_week)로 반영한 결과가 기본 모드와 같고 빈 그룹이 생기지 않아야 함"""
+    batch = _write_batch(tmp_path / "batch.jsonl", pd.Timestamp('2026-03-02 08:00'), 30, seed=10)
+    default = MainExecutor(str(batch), cache_dir=None).run_incremental_update(str(batch), str(tmp_path / "a.json"))
+    compact = MainExecutor(str(batch), cache_dir=None, compact=True).run_incremental_update(
+        str(batch), str(tmp_path / "b.json"))
+
+    for name in ['hourly_efficiency', 'daily_growth']:
+        assert not compact[name].isna().any(), name
+        pd.testing.assert_series_equal(compact[name], default[name], check_dtype=False, check_index_type=False)
+    pd.testing.assert_frame_equal(compact['weekday_stats'], default['weekday_stats'])
+    assert compact['topic_counts'].to_dict() == default['topic_counts'].to_dict()
@@ -0,0 +1,85 @@
+# test_json_backend.py
+# JSON 백엔드 회귀 테스트 (python -m pytest -q)
+
+import io
+import json
+
+import pytest
+
+import json_backend
+from json_backend import get_json_backend, iter_json_records, iter_jsonl_records
+
+
+def _nested_records(count):
+    """ChatGPT export처럼 mapping 안에 중첩 객체가 있고, 문자열에 괄호/쉼표/이스케이프가 섞인 레코드"""
+    tricky = ['plain', 'brace } in text', 'bracket ] and [', 'comma, "quoted"', 'back\\slash\\', 'tail \\"x\\"', '한글 ✓']
+    return [{
+        'id': f"conv-{i}",
+        'title': tricky[i % len(tricky)],
+        'mapping': {
+            f"node-{j}": {'message': {'content': {'parts': [tricky[(i + j) % len(tricky)], {'k': [j, {}]}]}},
+                          'children': [f"node-{j + 1}"]}
+            for j in range(3)
+        },
+        'create_time': 1746000000.5 + i,
+    } for i in range(count)]
+
+
+def _stream(text, block_bytes, backend='json'):
+    f = io.BytesIO(text.encode('utf-8'))
+    return list(iter_json_records(f, get_json_backend(backend), block_bytes=block_bytes))
+
+
+@pytest.mark.parametrize('block_bytes', [2, 7, 64, 4096])
+@pytest.mark.parametrize('indent', [None, 2])
+def test_nested_array_streams_every_record(block_bytes, indent):
+    records = _nested_records(40)
+    batches = _stream(json.dumps(records, ensure_ascii=False, indent=indent), block_bytes)
+    assert [record for batch in batches for record in batch] == records
+
+
+def test_nested_array_is_decoded_block_by_block(monkeypatch):
+    """중첩 객체 배열도 블록마다 완성된 원소만 디코딩해야 함 (버퍼가 파일 전체로 커지면 안 됨)"""
+    monkeypatch.setattr(json_backend, 'JSON_SCAN_BYTES', 512)
+    records = _nested_records(300)
+    text = json.dumps(records)
+    block_bytes = 4096
+    batches = _stream(text, block_bytes)
+    assert [record for batch in batches for record in batch] == records
+    assert len(batches) >= len(text) // block_bytes - 1
+    assert max(len(json.dumps(batch)) for batch in batches) < 3 * block_bytes
+
+
+def test_backslash_run_split_across_blocks():
+    records = [{'text': 'a' * i + '\\' * 3 + '"', 'n': i} for i in range(20)]
+    batches = _stream(json.dumps(records), 5)
+    assert [record for batch in batches for record in batch] == records
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('[]', []),
+    ('  ﻿[ ]  ', []),
+    ('[1, [2, 3], "x,]", {"a": null}]', [1, [2, 3], "x,]", {"a": None}]),
+    ('{"single": true}', [{"single": True}]),
+])
+def test_small_documents(text, expected):
+    batches = _stream(text, 1)
+    assert [record for batch in batches for record in batch] == expected
+
+
+@pytest.mark.parametrize('text', ['[{"a": 1}, {"b": 2}', '[{"a": 1}] trailing'])
+def test_malformed_array_raises(text):
+    with pytest.raises(ValueError):
+        _stream(text, 4)
+
+
+def test_accelerated_backend_falls_back_for_nan():
+    """가속 파서가 거부하는 NaN 리터럴도 표준 json으로 다시 디코딩"""
+    batches = _stream('[{"x": NaN}, {"x": 1}]', 8, backend=None)
+    records = [record for batch in batches for record in batch]
+    assert records[1] == {'x': 1} and records[0]['x'] != records[0]['x']
+
+
+def test_jsonl_records_skip_blank_lines():
+    f = io.BytesIO(b'{"a": 1}\n\n{"a": 2}\n')
+    assert [r for batch in iter_jsonl_records(f, get_json_backend('json')) for r in batch] == [{'a': 1}, {'a': 2}]
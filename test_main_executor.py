@@ -0,0 +1,17 @@
+# test_main_executor.py
+# 통합 실행 회귀 테스트 (python -m pytest -q)
+
+from main_executor_en import MainExecutor
+
+
+def test_failed_load_writes_short_report_instead_of_raising(tmp_path, monkeypatch):
+    """원본을 불러오지 못하면 분석 단계를 건너뛰고 로드 실패 보고서만 남겨야 함"""
+    monkeypatch.chdir(tmp_path)
+    executor = MainExecutor(str(tmp_path / "missing.jsonl"), cache_dir=None)
+
+    report = executor.generate_final_report()
+
+    assert "LOAD FAILED" in report
+    assert str(tmp_path / "missing.jsonl") in report
+    assert (tmp_path / "portfolio_analysis_report_en.md").read_text(encoding='utf-8') == report
+    assert set(executor.pipeline.results) == set()
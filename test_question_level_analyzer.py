@@ -0,0 +1,48 @@
+# test_question_level_analyzer.py
+# 질문 수준 분석 회귀 테스트 (python -m pytest -q)
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from question_level_analyzer_en import TOPIC_KEYWORDS, classify_topics_by_content
+
+
+def _baseline_topics(content):
+    """이전 행 단위 재분류 - 토픽 순서대로 키워드 매칭 수를 세고 더 많을 때만 바꿈 (매칭이 없으면 None)"""
+    topics = []
+    for text in content:
+        text = str(text).lower()
+        best_topic, max_matches = None, 0
+        for topic, keywords in TOPIC_KEYWORDS.items():
+            matches = sum(1 for keyword in keywords if keyword in text)
+            if matches > max_matches:
+                max_matches, best_topic = matches, topic
+        topics.append(best_topic if best_topic and max_matches >= 1 else None)
+    return pd.Series(topics, index=content.index, dtype=object)
+
+
+@pytest.mark.parametrize('text, expected', [
+    ("parse this json", 'Data Science'),          # Data Science / Web Development 동점 -> 먼저 나온 토픽
+    ("statistics homework", 'Data Science'),      # Data Science / Mathematics 동점
+    ("debug my build", 'Development Tools'),      # Programming 1 (debug) < Development Tools 2 (debug, build)
+    ("how to debug", 'Programming'),              # Programming / Development Tools 동점
+    ("", None),                                   # 빈 본문 -> General 유지
+    (None, None),                                 # 결측 본문 -> General 유지
+    ("let's talk about the weather", None),       # 매칭 없음 -> General 유지
+    ("Machine Learning with PyTorch", 'AI/ML'),   # 대소문자, 여러 단어 키워드
+])
+def test_classification_matches_baseline_loop(text, expected):
+    content = pd.Series([text], index=[7])
+    result = classify_topics_by_content(content)
+    pd.testing.assert_series_equal(result, _baseline_topics(content))
+    assert result.loc[7] == expected
+
+
+def test_random_content_matches_baseline_loop():
+    """키워드를 섞은 임의 본문 전체가 이전 루프와 같은 토픽(동점, 매칭 없음 포함)이어야 함"""
+    rng = np.random.default_rng(0)
+    words = list(dict.fromkeys(k for keywords in TOPIC_KEYWORDS.values() for k in keywords)) + ["hello", "thanks"]
+    content = pd.Series([" ".join(rng.choice(words, size=rng.integers(0, 5))).upper() for _ in range(300)],
+                        index=np.arange(300) * 3)
+    pd.testing.assert_series_equal(classify_topics_by_content(content), _baseline_topics(content))
@@ -0,0 +1,55 @@
+# test_rolling_correlation.py
+# 시간 창 상관관계 회귀 테스트 (python -m pytest -q)
+
+import numpy as np
+import pandas as pd
+
+from advanced_correlation_analyzer import rolling_correlations
+
+
+def test_window_end_is_exclusive_right_edge():
+    """window_end 라벨은 창의 실제 오른쪽 끝이고, 창은 [window_end - window, window_end) 구간이어야 함"""
+    rng = np.random.default_rng(0)
+    times = pd.Timestamp('2025-05-01 06:00') + pd.to_timedelta(np.arange(0, 24 * 20, 2), unit='h')
+    df = pd.DataFrame({'timestamp': times, 'a': rng.normal(size=len(times)), 'b': rng.normal(size=len(times))})
+
+    ends, rows, corr = rolling_correlations(df, ['a', 'b'], window='3D', step='1D', min_rows=5)
+    assert ends.name == 'window_end'
+    assert ends[0] == pd.Timestamp('2025-05-02') and ends[-1] == pd.Timestamp('2025-05-22')
+    for end, n, matrix in zip(ends, rows, corr):
+        inside = df[(df['timestamp'] >= end - pd.Timedelta('3D')) & (df['timestamp'] < end)]
+        assert len(inside) == n
+        assert inside['timestamp'].max() < end
+        if n >= 5:
+            np.testing.assert_allclose(matrix, inside[['a', 'b']].corr().to_numpy(), atol=1e-12)
+
+
+def test_spearman_windows_match_pandas_rank_correlation():
+    """spearman 창별 값은 창 안 행만으로 pandas corr(method='spearman')과 같아야 함 (동점 포함)"""
+    rng = np.random.default_rng(1)
+    times = pd.Timestamp('2025-05-01 06:00') + pd.to_timedelta(np.arange(0, 24 * 12, 3), unit='h')
+    a = rng.integers(0, 5, size=len(times)).astype(float)  # 동점이 많은 값
+    df = pd.DataFrame({'timestamp': times, 'a': a, 'b': a ** 3 + rng.normal(scale=20, size=len(times))})
+
+    ends, rows, corr = rolling_correlations(df, ['a', 'b'], window='2D', step='1D', min_rows=5, method='spearman')
+    assert (rows >= 5).any()
+    for end, n, matrix in zip(ends, rows, corr):
+        inside = df[(df['timestamp'] >= end - pd.Timedelta('2D')) & (df['timestamp'] < end)]
+        if n >= 5:
+            np.testing.assert_allclose(matrix, inside[['a', 'b']].corr(method='spearman').to_numpy(), atol=1e-12)
+        else:
+            assert np.isnan(matrix).all()
+
+
+def test_pearson_windows_stay_accurate_for_large_drifting_values():
+    """값이 크고 계열을 따라 평균이 움직여도 창별 값이 창 안 행만으로 계산한 pandas corr()과 같아야 함"""
+    rng = np.random.default_rng(2)
+    n = 20000
+    times = pd.Timestamp('2025-01-01') + pd.to_timedelta(np.sort(rng.integers(0, 24 * 3600 * 200, n)), unit='s')
+    a = 1e7 + np.linspace(0, 1e6, n) + rng.normal(size=n)
+    df = pd.DataFrame({'timestamp': times, 'a': a, 'b': a + rng.normal(size=n)})
+
+    ends, rows, corr = rolling_correlations(df, ['a', 'b'], window='7D', step='1D', min_rows=11)
+    for end, n_rows, matrix in list(zip(ends, rows, corr))[::20]:
+        inside = df[(df['timestamp'] >= end - pd.Timedelta('7D')) & (df['timestamp'] < end)]
+        np.testing.assert_allclose(matrix, inside[['a', 'b']].corr().to_numpy(), atol=1e-9)
@@ -0,0 +1,95 @@
+# test_run_instrumentation.py
+# 실행 계측 회귀 테스트 (python -m pytest -q)
+
+import sys
+import threading
+import tracemalloc
+
+import numpy as np
+
+import run_instrumentation
+from run_instrumentation import RunProfiler
+
+
+def test_stage_rss_is_growth_not_process_peak():
+    """큰 단계 뒤의 작은 단계는 프로세스 최대 RSS를 다시 보고하지 않고 증가량 0으로 기록되어야 함"""
+    profiler = RunProfiler()
+    with profiler.stage('big'):
+        np.ones(200 * 1024 * 1024 // 8).sum()
+    with profiler.stage('small'):
+        np.ones(1024).sum()
+
+    big, small = profiler.to_dict()['stages']
+    assert big['rss_peak_growth_mb'] > 100
+    assert small['rss_peak_growth_mb'] < 1
+    assert small['process_peak_rss_mb'] >= big['process_peak_rss_mb']
+    assert 'max_rss_mb' not in small
+
+
+def test_nested_stage_keeps_outer_tracemalloc_peak():
+    """바깥 단계가 안쪽 단계 전에 할당/해제한 메모리도 바깥 단계 최대치에 남아야 함"""
+    profiler = RunProfiler(trace_memory=True)
+    try:
+        with profiler.stage('outer'):
+            buffer = bytearray(50 * 1024 * 1024)
+            del buffer
+            with profiler.stage('inner'):
+                small = bytearray(8 * 1024)
+            with profiler.stage('inner_big'):
+                big = bytearray(20 * 1024 * 1024)
+                del big
+            del small
+    finally:
+        tracemalloc.stop()
+
+    records = {record['stage']: record for record in profiler.records}
+    assert records['outer']['tracemalloc_peak_mb'] >= 50
+    assert records['inner']['tracemalloc_peak_mb'] < 1
+    assert 20 <= records['inner_big']['tracemalloc_peak_mb'] < 21
+    assert not profiler._open_peaks
+
+
+def test_concurrent_stage_does_not_reset_other_thread_peak():
+    """다른 스레드의 단계가 열리고 닫혀도 먼저 열린 단계의 최대치가 지워지지 않아야 함"""
+    profiler = RunProfiler(trace_memory=True)
+    allocated, other_done = threading.Event(), threading.Event()
+
+    def first():
+        with profiler.stage('first'):
+            buffer = bytearray(30 * 1024 * 1024)
+            del buffer
+            allocated.set()
+            other_done.wait(5)
+
+    def second():
+        allocated.wait(5)
+        with profiler.stage('second'):
+            pass
+        other_done.set()
+
+    threads = [threading.Thread(target=first), threading.Thread(target=second)]
+    try:
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        tracemalloc.stop()
+
+    records = {record['stage']: record for record in profiler.records}
+    assert records['first']['tracemalloc_peak_mb'] >= 30
+    assert records['second']['tracemalloc_peak_mb'] < 1
+
+
+def test_platform_without_resource_reports_null_rss(monkeypatch):
+    """resource 모듈과 psutil이 없는 플랫폼(Windows)에서도 계측이 실패하지 않고 RSS 값을 None으로 기록"""
+    monkeypatch.setattr(run_instrumentation, 'resource', None)
+    monkeypatch.setitem(sys.modules, 'psutil', None)
+    profiler = RunProfiler()
+    with profiler.stage('load'):
+        pass
+
+    report = profiler.to_dict()
+    assert report['process_peak_rss_mb'] is None
+    assert report['stages'][0]['rss_peak_growth_mb'] is None
+    assert report['stages'][0]['process_peak_rss_mb'] is None
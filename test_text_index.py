@@ -0,0 +1,73 @@
+# test_text_index.py
+# 본문 토큰 역색인 회귀 테스트 (python -m pytest -q)
+
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from data_loader_en import add_text_features
+from question_level_analyzer_en import classify_topics_by_content
+from text_index import TokenIndex
+
+
+def test_saved_vocabulary_is_not_padded_to_longest_token(tmp_path):
+    """공백 없는 긴 토큰이 있어도 저장된 어휘 크기는 토큰 길이 합에 비례하고, 불러온 색인의 질의 결과가 같아야 함"""
+    long_token = "x" * 20000
+    content = pd.Series([f"how does python list {i} work?" for i in range(500)] + [f"paste {long_token}"])
+    index = TokenIndex.build(content)
+    path = index.save(str(tmp_path / "index.npz"))
+
+    with np.load(path, allow_pickle=False) as saved:
+        assert saved['vocabulary'].nbytes < 2 * sum(len(token.encode('utf-8')) for token in index.vocabulary)
+
+    loaded = TokenIndex.load(path, content=content)
+    assert loaded.vocabulary.tolist() == index.vocabulary.tolist()
+    for term in ["python", long_token, "paste x", "work?"]:
+        np.testing.assert_array_equal(loaded.docs(term), index.docs(term))
+
+
+CONTENT = pd.Series([
+    "How does Python's list.sort() work?!",
+    "MACHINE   LEARNING vs deep-learning: which one?",
+    "I want to learn pandas DataFrame merges",
+    "Explain neural networks, please.",
+    "fine-tune a GPT model (training data)",
+    "",
+    None,
+    "just chatting about the weather",
+    "User Experience and UI/UX design tips",
+    "What is machine\tlearning",
+    "ai-driven Algorithm, numpy&matplotlib",
+])
+
+
+@pytest.fixture(params=['pyarrow', 'python'])
+def tokenizer(request, monkeypatch):
+    """색인 토큰화 경로 - pyarrow 벡터 분리와 pyarrow가 없을 때의 str.split 경로"""
+    if request.param == 'pyarrow':
+        pytest.importorskip('pyarrow')
+    else:
+        monkeypatch.setitem(sys.modules, 'pyarrow', None)
+    return request.param
+
+
+@pytest.mark.parametrize('column', ['question_depth', 'has_question', 'tech_term_density', 'is_learning_related'])
+def test_text_features_match_scan(tokenizer, column):
+    """색인 질의로 만든 텍스트 파생 컬럼이 본문 스캔 결과와 같아야 함 (문장부호, 대소문자, 여러 단어 키워드 포함)"""
+    scanned = add_text_features(pd.DataFrame({'content': CONTENT}))
+    indexed = add_text_features(pd.DataFrame({'content': CONTENT}), text_index=TokenIndex.build(CONTENT))
+    pd.testing.assert_series_equal(indexed[column], scanned[column], check_dtype=False)
+
+
+def test_topic_classification_matches_scan(tokenizer):
+    """색인 위치로 분류한 토픽이 본문 스캔 분류와 같아야 함 (일부 행만 분류하는 경우 포함)"""
+    index = TokenIndex.build(CONTENT)
+    subset = CONTENT.iloc[[1, 3, 4, 7, 8, 9, 10]]
+    pd.testing.assert_series_equal(
+        classify_topics_by_content(subset, text_index=index, positions=np.array([1, 3, 4, 7, 8, 9, 10])),
+        classify_topics_by_content(subset))
+    pd.testing.assert_series_equal(classify_topics_by_content(CONTENT, text_index=index,
+                                                              positions=np.arange(len(CONTENT))),
+                                   classify_topics_by_content(CONTENT))
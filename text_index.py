@@ -0,0 +1,189 @@
+# text_index.py
+# 본문 토큰 역색인 - 키워드 포함 여부(any/all/count) 질의를 전체 본문 재스캔 없이 처리
+
+import numpy as np
+import pandas as pd
+
+
+# 어휘 문자 서명에 쓰는 문자 (토큰마다 포함 여부를 비트로 저장, 64개 이하)
+SIGNATURE_CHARS = 'abcdefghijklmnopqrstuvwxyz0123456789?-'
+
+
+def _signature(text):
+    """text에 들어 있는 SIGNATURE_CHARS 문자의 비트 합"""
+    bits = 0
+    for i, char in enumerate(SIGNATURE_CHARS):
+        if char in text:
+            bits |= 1 << i
+    return np.uint64(bits)
+
+
+def _tokenize(lowered):
+    """소문자 본문 Series -> (토큰 코드, 어휘, 토큰별 메시지 위치) - pyarrow가 있으면 벡터 연산으로 분리"""
+    try:
+        import pyarrow as pa
+        import pyarrow.compute as pc
+    except ImportError:
+        split = [text.split() for text in lowered.tolist()]
+        doc_positions = np.repeat(np.arange(len(split)), [len(tokens) for tokens in split])
+        tokens = np.fromiter((token for tokens in split for token in tokens), dtype=object, count=len(doc_positions))
+        token_codes, vocabulary = pd.factorize(tokens)
+        return token_codes, list(vocabulary), doc_positions
+
+    texts = pa.array(lowered, type=pa.large_string())
+    if isinstance(texts, pa.ChunkedArray):
+        texts = texts.combine_chunks()
+    split = pc.utf8_split_whitespace(texts)
+    encoded = pc.dictionary_encode(pc.list_flatten(split))
+    doc_positions = pc.list_parent_indices(split).to_numpy()
+    return encoded.indices.to_numpy(zero_copy_only=False), encoded.dictionary.to_pylist(), doc_positions
+
+
+class TokenIndex:
+    """소문자 본문의 공백 단위 토큰 -> 메시지 위치 배열(정렬됨) 역색인
+
+    키워드 질의는 기존 str.contains(keyword, regex=False)와 같은 부분 문자열 의미를 유지한다.
+    - 공백 없는 키워드: 키워드를 포함하는 어휘(토큰)들의 위치 배열 합집합 (본문이 아니라 어휘만 스캔)
+    - 공백 있는 구문: 각 단어를 포함하는 메시지의 교집합을 후보로 잡고, 후보 본문만 직접 확인
+    어휘 스캔은 토큰별 문자 서명(SIGNATURE_CHARS 포함 여부 비트)을 처음 질의할 때 한 번 만들어 두고,
+    키워드의 문자를 모두 가진 토큰만 부분 문자열 검사를 하므로 키워드마다 어휘 전체를 문자열로 훑지 않는다.
+    질의 결과는 키워드별로 메모이즈된다. 위치는 색인을 만든 Series의 행 순서 기준이다.
+    """
+
+    def __init__(self, vocabulary, indptr, doc_ids, n_docs, content=None):
+        self.vocabulary = pd.Series(vocabulary, dtype=object)  # 고유 토큰 (처음 나온 순서)
+        self.indptr = indptr      # 토큰 i의 위치 배열 = doc_ids[indptr[i]:indptr[i + 1]]
+        self.doc_ids = doc_ids
+        self.n_docs = n_docs
+        self.content = content    # 구문 확인용 원문 (load 후 attach로 연결)
+        self._term_cache = {}
+        self._signatures = None   # 토큰별 문자 서명 (첫 질의 때 생성)
+
+    def __repr__(self):
+        return f"TokenIndex({self.n_docs} docs, {len(self.vocabulary)} tokens)"
+
+    @classmethod
+    def build(cls, content):
+        """본문 Series로 색인 생성 (한 번만 소문자화/토큰화)"""
+        lowered = content.fillna('').astype(str).str.lower()
+        token_codes, vocabulary, doc_positions = _tokenize(lowered)
+
+        # (토큰, 메시지) 쌍 중복 제거 후 토큰 순으로 정렬 -> CSR 형태
+        n_docs = max(len(lowered), 1)
+        pairs = np.sort(token_codes.astype(np.int64) * n_docs + doc_positions)
+        if len(pairs):
+            pairs = pairs[np.concatenate(([True], pairs[1:] != pairs[:-1]))]
+        pair_tokens = pairs // n_docs
+        doc_ids = (pairs % n_docs).astype(np.int32)
+        indptr = np.zeros(len(vocabulary) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(pair_tokens, minlength=len(vocabulary)), out=indptr[1:])
+        return cls(np.asarray(vocabulary, dtype=object), indptr, doc_ids, len(lowered), content=content)
+
+    def attach(self, content):
+        """구문 질의 확인용 원문 연결 (저장된 색인을 불러온 뒤 호출)"""
+        if len(content) != self.n_docs:
+            raise ValueError(f"Content has {len(content)} rows but index covers {self.n_docs}")
+        self.content = content
+        return self
+
+    def _vocabulary_signatures(self):
+        """토큰별 문자 서명 배열 (문자마다 어휘를 한 번씩 벡터 검사해서 만들고 재사용)"""
+        if self._signatures is None:
+            signatures = np.zeros(len(self.vocabulary), dtype=np.uint64)
+            for i, char in enumerate(SIGNATURE_CHARS):
+                has_char = self.vocabulary.str.contains(char, regex=False).to_numpy(dtype=bool)
+                signatures[has_char] |= np.uint64(1 << i)
+            self._signatures = signatures
+        return self._signatures
+
+    def _token_docs(self, part):
+        """part를 포함하는 토큰들의 메시지 위치 합집합"""
+        required = _signature(part)
+        candidates = np.flatnonzero((self._vocabulary_signatures() & required) == required)
+        hits = self.vocabulary.iloc[candidates].str.contains(part, regex=False).to_numpy(dtype=bool)
+        matches = candidates[hits]
+        if len(matches) == 1:
+            return self.doc_ids[self.indptr[matches[0]]:self.indptr[matches[0] + 1]]
+        # 여러 토큰이면 정렬 대신 메시지 수 길이의 마스크로 합집합
+        mask = np.zeros(self.n_docs, dtype=bool)
+        for i in matches:
+            mask[self.doc_ids[self.indptr[i]:self.indptr[i + 1]]] = True
+        return np.flatnonzero(mask).astype(np.int32)
+
+    def docs(self, term):
+        """term(부분 문자열)을 포함하는 메시지 위치 배열 (정렬됨)"""
+        term = term.lower()
+        cached = self._term_cache.get(term)
+        if cached is not None:
+            return cached
+
+        parts = term.split()
+        if not term:
+            result = np.arange(self.n_docs, dtype=np.int32)
+        elif parts == [term]:
+            result = self._token_docs(term)
+        else:
+            # 구문: 단어별 후보 교집합 -> 후보 본문에서 실제 포함 여부 확인
+            if self.content is None:
+                raise ValueError("Phrase queries need the original content (call attach())")
+            candidates = self._token_docs(parts[0])
+            for part in parts[1:]:
+                candidates = np.intersect1d(candidates, self._token_docs(part), assume_unique=True)
+            if len(candidates):
+                texts = self.content.iloc[candidates].fillna('').astype(str).str.lower()
+                candidates = candidates[texts.str.contains(term, regex=False).to_numpy(dtype=bool)]
+            result = candidates.astype(np.int32)
+
+        self._term_cache[term] = result
+        return result
+
+    def contains(self, term):
+        """term을 포함하는지 여부 (메시지 수 길이의 bool 배열)"""
+        mask = np.zeros(self.n_docs, dtype=bool)
+        mask[self.docs(term)] = True
+        return mask
+
+    def count(self, terms):
+        """메시지별로 포함된 서로 다른 키워드 수"""
+        counts = np.zeros(self.n_docs, dtype=np.int64)
+        for term in dict.fromkeys(terms):
+            counts[self.docs(term)] += 1
+        return counts
+
+    def any(self, terms):
+        """키워드 중 하나라도 포함하는지 여부"""
+        mask = np.zeros(self.n_docs, dtype=bool)
+        for term in terms:
+            mask[self.docs(term)] = True
+        return mask
+
+    def all(self, terms):
+        """키워드를 모두 포함하는지 여부"""
+        terms = list(dict.fromkeys(terms))
+        return self.count(terms) == len(terms)
+
+    def save(self, path):
+        """색인을 npz로 저장 (원문은 저장하지 않음)
+
+        어휘는 고정 폭 문자열 배열 대신 UTF-8 바이트 버퍼 하나와 토큰별 시작 위치(int64)로 저장한다.
+        (고정 폭이면 공백 없는 긴 토큰 하나 때문에 모든 토큰이 그 길이만큼 자리를 차지함)
+        """
+        encoded = [token.encode('utf-8') for token in self.vocabulary]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(token) for token in encoded], out=offsets[1:])
+        with open(path, 'wb') as f:
+            np.savez(f, vocabulary=np.frombuffer(b''.join(encoded), dtype=np.uint8), vocabulary_offsets=offsets,
+                     indptr=self.indptr, doc_ids=self.doc_ids, n_docs=np.int64(self.n_docs))
+        return path
+
+    @classmethod
+    def load(cls, path, content=None):
+        """저장된 색인 불러오기 (content를 주면 구문 질의용으로 연결)"""
+        with np.load(path, allow_pickle=False) as saved:
+            buffer = saved['vocabulary'].tobytes()
+            offsets = saved['vocabulary_offsets'].tolist()
+            vocabulary = [buffer[start:end].decode('utf-8') for start, end in zip(offsets[:-1], offsets[1:])]
+            index = cls(np.asarray(vocabulary, dtype=object), saved['indptr'], saved['doc_ids'], int(saved['n_docs']))
+        if content is not None:
+            index.attach(content)
+        return index